@@ -7,6 +7,8 @@ Usage examples:
     python backtest.py                          # Run V8 with default params
     python backtest.py --strategy v7            # Run V7 strategy
     python backtest.py --strategy v8 --tune     # Run parameter tuning for V8
+    python backtest.py --strategy v9 --sweep    # Vectorized V9 grid sweep (no cerebro)
+    python backtest.py --strategy v9 --parity   # Check the V9 simulator against cerebro
     python backtest.py --strategy v8_fast -o    # Run automated optimization
     python backtest.py -s v8_fast -o --trials 100  # Optimize with 100 trials
     python backtest.py --strategy v3 --data daily  # Run V3 with daily data
@@ -14,17 +16,21 @@ Usage examples:
     python backtest.py --compare v8             # Compare all V8 runs
     python backtest.py -s v8_fast --walk-forward  # Walk-forward validation
     python backtest.py --compare-all            # Compare all strategies head-to-head
+    python backtest.py --compare-all --presampled  # Build the 1h/4h feeds once for all runs
+    python backtest.py --check-presampled       # Check those feeds against cerebro's resampling
 """
 
 import argparse
+import itertools
+import math
 import sys
 from datetime import datetime
 
 import backtrader as bt
-import pandas as pd
 
 import config
-from config import BROKER, DATA, get_strategy, get_params, V8_TUNE_VARIATIONS, V8_FAST_TUNE_VARIATIONS
+from config import BROKER, DATA, get_strategy, get_params, V8_TUNE_VARIATIONS, V8_FAST_TUNE_VARIATIONS, V9_SWEEP_GRID
+from data_bundle import filter_dates, load_resampled, read_price_csv
 from regime import MarketRegime
 from results import (
     create_result,
@@ -37,9 +43,33 @@ from results import (
     print_walk_forward_report,
     save_comparison,
     load_all_results,
+    find_result,
+    SortedResults,
     TradeTracker,
 )
 
+# vector_sim simulator per strategy family (imported on use: it pulls in numba)
+VECTOR_SIMS = {
+    "v9": "simulate_v9",
+    "v11": "simulate_v11",
+    "v14": "simulate_v14",
+}
+
+
+def data_path(source: str = "binance", timeframe: str = "15m"):
+    """
+    Resolve the CSV for a data source.
+
+    Returns:
+        tuple: (filepath, timestamp_col)
+    """
+    if timeframe == "daily":
+        return DATA.daily, DATA.daily_timestamp_col
+    elif source == "binance":
+        return DATA.binance_15m, DATA.binance_timestamp_col
+    else:
+        return DATA.yfinance_15m, DATA.yfinance_timestamp_col
+
 
 def load_data(source: str = "binance", timeframe: str = "15m"):
     """
@@ -50,29 +80,22 @@ def load_data(source: str = "binance", timeframe: str = "15m"):
         timeframe: "15m" or "daily"
 
     Returns:
-        tuple: (DataFrame, timestamp_col)
+        DataFrame indexed by timestamp
     """
-    if timeframe == "daily":
-        filepath = DATA.daily
-        timestamp_col = DATA.daily_timestamp_col
-    elif source == "binance":
-        filepath = DATA.binance_15m
-        timestamp_col = DATA.binance_timestamp_col
-    else:
-        filepath = DATA.yfinance_15m
-        timestamp_col = DATA.yfinance_timestamp_col
-
-    df = pd.read_csv(filepath, parse_dates=True, index_col=timestamp_col)
+    filepath, timestamp_col = data_path(source, timeframe)
+    df = read_price_csv(filepath, timestamp_col)
     return df
 
 
-def setup_cerebro_multi_tf(df, strategy_class, params, cash=None, commission=None, btc_df=None):
+def setup_cerebro_multi_tf(df, strategy_class, params, cash=None, commission=None, btc_df=None, bundle=None):
     """
     Set up cerebro with multi-timeframe data (for V6, V7, V8, etc.).
 
     Args:
         btc_df: Optional BTC 15m DataFrame. Added as raw feed at datas[5] for
                 cross-asset pattern detection (used by V20).
+        bundle: Optional data_bundle.load_resampled() result. Its 1h and 4h
+                frames are added directly instead of resampled by cerebro.
 
     Returns:
         cerebro instance ready to run
@@ -82,18 +105,19 @@ def setup_cerebro_multi_tf(df, strategy_class, params, cash=None, commission=Non
     data15 = bt.feeds.PandasData(dataname=df)
     cerebro.adddata(data15, name='15m')
 
-    # Resample to higher timeframes
-    cerebro.resampledata(data15, name='1h',
-                         timeframe=bt.TimeFrame.Minutes,
-                         compression=60,
-                         bar2edge=True,
-                         rightedge=True)
-
-    cerebro.resampledata(data15, name='4h',
-                         timeframe=bt.TimeFrame.Minutes,
-                         compression=240,
-                         bar2edge=True,
-                         rightedge=True)
+    # Resample to higher timeframes (intraday ones may come pre-resampled)
+    for name, minutes in (('1h', 60), ('4h', 240)):
+        if bundle is not None:
+            cerebro.adddata(bt.feeds.PandasData(dataname=bundle[name],
+                                                timeframe=bt.TimeFrame.Minutes,
+                                                compression=minutes),
+                            name=name)
+        else:
+            cerebro.resampledata(data15, name=name,
+                                 timeframe=bt.TimeFrame.Minutes,
+                                 compression=minutes,
+                                 bar2edge=True,
+                                 rightedge=True)
 
     cerebro.resampledata(data15, name='weekly',
                          timeframe=bt.TimeFrame.Weeks,
@@ -165,6 +189,7 @@ def run_backtest(
     notes: str = "",
     start_date: str = None,
     end_date: str = None,
+    presampled: bool = False,
 ):
     """
     Run a backtest with the specified strategy.
@@ -178,6 +203,7 @@ def run_backtest(
         notes: Optional notes to save with result
         start_date: Start date filter (YYYY-MM-DD)
         end_date: End date filter (YYYY-MM-DD)
+        presampled: Feed cerebro cached 1h/4h bars built like its own (see data_bundle)
 
     Returns:
         BacktestResult object
@@ -190,6 +216,10 @@ def run_backtest(
     if params_override:
         params.update(params_override)
 
+    # Strategies with a 'verbose' param only log trades on verbose runs
+    if 'verbose' in strategy_class.params._getkeys():
+        params.setdefault('verbose', verbose)
+
     # Determine data loading
     is_single_tf = strategy_name == "v3"
     timeframe = "daily" if is_single_tf or data_source == "daily" else "15m"
@@ -198,18 +228,17 @@ def run_backtest(
     # Load data
     if verbose:
         print(f"Loading data from {data_source}...")
-    df = load_data(source=source, timeframe=timeframe)
-
-    # Filter by date range if specified
-    if start_date:
-        df = df[df.index >= start_date]
-        if verbose:
+    # Filter by date range if specified ("2024-12-31" includes the full day)
+    bundle = None
+    if presampled and not is_single_tf:
+        bundle = load_resampled(*data_path(source, timeframe), start_date, end_date)
+        df = bundle['15m']
+    else:
+        df = filter_dates(load_data(source=source, timeframe=timeframe), start_date, end_date)
+    if verbose:
+        if start_date:
             print(f"Filtering from {start_date}")
-    if end_date:
-        # Add time component so "2024-12-31" includes the full day
-        end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-        df = df[df.index <= end_ts]
-        if verbose:
+        if end_date:
             print(f"Filtering to {end_date}")
 
     # Get date range
@@ -304,7 +333,7 @@ def run_backtest(
                     from risk_manager import RiskManager
                     rm = RiskManager()
                     r_multiple = rm.calculate_r_multiple(
-                        entry_price, exit_price, stop_dist, direction)
+                        entry_price, exit_price, stop_dist, trade.long)
                     r_multiple = round(r_multiple, 2)
 
                 record = {
@@ -328,12 +357,7 @@ def run_backtest(
     # Load BTC data for V20 (cross-asset pattern detection)
     btc_df = None
     if strategy_name == "v20":
-        btc_df = pd.read_csv(DATA.btc_15m, parse_dates=True, index_col=DATA.binance_timestamp_col)
-        if start_date:
-            btc_df = btc_df[btc_df.index >= start_date]
-        if end_date:
-            btc_end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
-            btc_df = btc_df[btc_df.index <= btc_end_ts]
+        btc_df = filter_dates(read_price_csv(DATA.btc_15m, DATA.binance_timestamp_col), start_date, end_date)
         if verbose:
             print(f"BTC 15m data: {len(btc_df)} bars loaded for pattern detection")
 
@@ -341,7 +365,7 @@ def run_backtest(
     if is_single_tf:
         cerebro = setup_cerebro_single_tf(df, StrategyWrapper, params)
     else:
-        cerebro = setup_cerebro_multi_tf(df, StrategyWrapper, params, btc_df=btc_df)
+        cerebro = setup_cerebro_multi_tf(df, StrategyWrapper, params, btc_df=btc_df, bundle=bundle)
 
     starting_value = cerebro.broker.getvalue()
 
@@ -493,6 +517,177 @@ def run_tune(strategy_name: str = "v8", verbose: bool = True):
     return results
 
 
+def run_sweep(strategy_name: str = "v9", start_date: str = None, end_date: str = None, top: int = 10):
+    """
+    Sweep V9_SWEEP_GRID with the vectorized simulator instead of cerebro.
+
+    Args:
+        strategy_name: V9 variant whose params the grid is applied on top of
+        start_date: Start date filter (YYYY-MM-DD)
+        end_date: End date filter (YYYY-MM-DD)
+        top: Number of best parameter sets to print
+
+    Returns:
+        List of result dicts sorted by return, best first
+    """
+    if not strategy_name.startswith("v9"):
+        print(f"Sweep currently only supported for v9 variants, not {strategy_name}")
+        return []
+
+    from vector_sim import prepare_bars, sweep_v9
+
+    df = filter_dates(load_data(), start_date, end_date)
+
+    base = get_params(strategy_name)
+    keys = list(V9_SWEEP_GRID)
+    param_sets = [{**base, **dict(zip(keys, combo))}
+                  for combo in itertools.product(*V9_SWEEP_GRID.values())]
+
+    print(f"Sweeping {len(param_sets)} parameter sets for {strategy_name} "
+          f"({len(df)} bars, vectorized)...")
+    rows = sweep_v9(prepare_bars(df), param_sets)
+    rows.sort(key=lambda r: r["total_return_pct"], reverse=True)
+
+    print(f"\n{'#':>3} {'Lookback':>8} {'Approach':>8} {'Buffer':>7} {'R:R':>5} {'MinRng':>7} {'Cool':>5} "
+          f"{'Final Value':>12} {'Return':>10} {'Trades':>7} {'Win%':>6}")
+    print("-" * 92)
+    for rank, r in enumerate(rows[:top], 1):
+        win_rate = f"{r['win_rate_pct']:.0f}%" if r["win_rate_pct"] is not None else "N/A"
+        print(f"{rank:>3} {r['trend_lookback']:>8} {r['approach_pct']:>8.2f} {r['target_buffer_pct']:>7.1f} "
+              f"{r['rr_ratio']:>5.1f} {r['min_range_pct']:>7.1f} {r['cooldown_bars']:>5} "
+              f"${r['final_value']:>11,.2f} {r['total_return_pct']:>+9.1f}% {r['total_trades']:>7} {win_rate:>6}")
+    print("-" * 92)
+    print("Simulated fills; confirm the best sets with a regular backtest before using them.")
+
+    return rows
+
+
+def run_parity_check(strategy_name: str = "v9", start_date: str = None, end_date: str = None):
+    """
+    Run a strategy through cerebro and through its vector_sim simulator on
+    the same bars and compare them trade by trade.
+
+    The vectorized sweeps only stand in for run_backtest() while the two
+    agree, so rerun this after changing a strategy, its simulator or the
+    cerebro feeds.
+
+    Args:
+        strategy_name: Strategy with a simulator in VECTOR_SIMS (any variant)
+        start_date: Start date filter (YYYY-MM-DD)
+        end_date: End date filter (YYYY-MM-DD)
+
+    Returns:
+        True if both took the same entries with the same net PnL per trade
+    """
+    sim_name = VECTOR_SIMS.get(strategy_name.split("_")[0])
+    if sim_name is None:
+        print(f"No vectorized simulator for {strategy_name} (have: {', '.join(VECTOR_SIMS)})")
+        return False
+
+    df = filter_dates(load_data(), start_date, end_date)
+    if df.empty:
+        print("No data in the selected date range")
+        return False
+
+    print(f"Checking vector_sim against cerebro for {strategy_name}...")
+    result = run_backtest(strategy_name, save=False, verbose=False,
+                          start_date=start_date, end_date=end_date)
+    import vector_sim
+    simulate = getattr(vector_sim, sim_name)
+    sim = simulate(vector_sim.prepare_bars(df), **get_params(strategy_name))
+
+    # Both sides stamp an entry with the open time of its fill bar. Only
+    # closed trades are compared: cerebro's final value also marks a
+    # position still open at the end to market, the simulator drops it.
+    trades = result.trades or []
+    cerebro_entries = [t["entry_dt"] for t in trades]
+    sim_entries = [ts.strftime("%Y-%m-%d %H:%M") for ts in df.index[sim["trades"]["entry_bar"]]]
+    cerebro_pnl = [t["pnl_net"] for t in trades]
+    sim_pnl = sim["trades"]["pnl"].tolist()
+    only_cerebro = sorted(set(cerebro_entries) - set(sim_entries))
+    only_sim = sorted(set(sim_entries) - set(cerebro_entries))
+
+    print(f"\n{'':<8} {'Trades':>7} {'Net PnL':>12}")
+    print(f"{'cerebro':<8} {len(trades):>7} ${sum(cerebro_pnl):>11,.2f}")
+    print(f"{'vector':<8} {sim['total_trades']:>7} ${sum(sim_pnl):>11,.2f}")
+    if only_cerebro:
+        print(f"Entries only in cerebro ({len(only_cerebro)}): {', '.join(only_cerebro[:5])}")
+    if only_sim:
+        print(f"Entries only in vector_sim ({len(only_sim)}): {', '.join(only_sim[:5])}")
+
+    # pnl_net is rounded to cents in the trade log
+    ok = (cerebro_entries == sim_entries
+          and all(abs(c - v) <= 0.01 for c, v in zip(cerebro_pnl, sim_pnl)))
+    print("Parity OK" if ok else "Parity FAILED: fix vector_sim before trusting vectorized results")
+    return ok
+
+
+def run_presampled_check(start_date: str = None, end_date: str = None):
+    """
+    Check that --presampled hands strategies the same 1h/4h bars as
+    cerebro.resampledata().
+
+    Runs both setups with a strategy that records the 1h and 4h feeds
+    (length and OHLCV) on every 15m bar and compares the records. Bar
+    datetimes are left out: they only differ around midnight (see
+    data_bundle.resample_ohlcv). Rerun this after changing data_bundle or
+    setup_cerebro_multi_tf.
+
+    Args:
+        start_date: Start date filter (YYYY-MM-DD)
+        end_date: End date filter (YYYY-MM-DD)
+
+    Returns:
+        True if both setups produced the same feeds on every bar
+    """
+    bundle = load_resampled(*data_path(), start_date, end_date)
+    df = bundle['15m']
+    if df.empty:
+        print("No data in the selected date range")
+        return False
+
+    print(f"Checking presampled 1h/4h feeds against cerebro.resampledata ({len(df)} bars)...")
+    records = []
+    for feeds in (None, bundle):
+        rows = []
+
+        class FeedRecorder(bt.Strategy):
+            def prenext(self):
+                self.next()
+
+            def next(self):
+                row = [len(self.datas[0])]
+                for data in self.datas[1:3]:
+                    row.append(len(data))
+                    if len(data):
+                        row.extend((data.open[0], data.high[0], data.low[0],
+                                    data.close[0], data.volume[0]))
+                rows.append(row)
+
+        cerebro = setup_cerebro_multi_tf(df, FeedRecorder, {}, bundle=feeds)
+        try:
+            cerebro.run()
+        except ValueError as e:
+            # Known backtrader issue with resampled feeds at end of data
+            if 'min()' not in str(e) and 'empty' not in str(e):
+                raise
+        records.append(rows)
+
+    resampled, presampled = records
+    mismatch = next((i for i, (a, b) in enumerate(zip(resampled, presampled))
+                     if len(a) != len(b) or not all(math.isclose(x, y, rel_tol=1e-9)
+                                                    for x, y in zip(a, b))), None)
+    if mismatch is None and len(resampled) != len(presampled):
+        mismatch = min(len(resampled), len(presampled))
+
+    print(f"Steps: {len(resampled)} resampledata, {len(presampled)} presampled")
+    if mismatch is None:
+        print("Presampled feeds OK")
+        return True
+    print(f"Presampled feeds FAILED: first difference at {df.index[min(mismatch, len(df) - 1)]}")
+    return False
+
+
 def run_walk_forward(
     strategy_name: str = "v8",
     data_source: str = "binance",
@@ -605,6 +800,7 @@ def run_compare_all(
     start_date: str = None,
     end_date: str = None,
     verbose: bool = True,
+    presampled: bool = False,
 ):
     """
     Run all registered strategies on the same data and compare results.
@@ -615,6 +811,7 @@ def run_compare_all(
         start_date: Start date filter
         end_date: End date filter
         verbose: Whether to print progress
+        presampled: Build the 1h/4h feeds once and share them across runs
 
     Returns:
         List of BacktestResult objects
@@ -645,6 +842,7 @@ def run_compare_all(
                 notes="compare-all",
                 start_date=start_date,
                 end_date=end_date,
+                presampled=presampled,
             )
             results.append(result)
             if verbose:
@@ -655,6 +853,7 @@ def run_compare_all(
                 print(f"  {name}: FAILED - {e}")
 
     if results:
+        results = SortedResults(results)  # Ranking is sorted once for the table and the saved file
         print_ranked_table(results)
 
         # Save comparison
@@ -674,6 +873,8 @@ Examples:
   python backtest.py                          # Run V8 with default params
   python backtest.py --strategy v7            # Run V7 strategy
   python backtest.py -s v8_fast tune          # Run parameter tuning
+  python backtest.py -s v9 --sweep            # Vectorized V9 grid sweep
+  python backtest.py -s v9 --parity           # Check the V9 simulator against cerebro
   python backtest.py -s v8_fast optimize      # Run automated optimization
   python backtest.py -s v8_fast --asset SUI   # Run on SUI/USD data
   python backtest.py -s v8_fast --asset VET   # Run on VET/USD data
@@ -682,6 +883,8 @@ Examples:
   python backtest.py -s v8_fast --walk-forward  # Walk-forward validation
   python backtest.py --compare-all            # Compare all strategies
   python backtest.py --compare-all --strategies v8_fast,v9,v13  # Compare subset
+  python backtest.py --compare-all --presampled  # Build the 1h/4h feeds once for all runs
+  python backtest.py --check-presampled       # Check them against cerebro's resampling
         """,
     )
 
@@ -715,6 +918,18 @@ Examples:
         help="Run parameter tuning instead of single backtest"
     )
 
+    # Vectorized sweep mode
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Sweep V9_SWEEP_GRID with the vectorized simulator (v9 variants only)"
+    )
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="Compare the vectorized simulator with a cerebro run (v9, v11, v14 variants)"
+    )
+
     # Optimization mode
     parser.add_argument(
         "--optimize", "-o",
@@ -791,6 +1006,18 @@ Examples:
         help="End date for backtest (YYYY-MM-DD)"
     )
 
+    # Data preparation
+    parser.add_argument(
+        "--presampled",
+        action="store_true",
+        help="Feed 1h/4h bars built once (data_bundle) instead of cerebro.resampledata"
+    )
+    parser.add_argument(
+        "--check-presampled",
+        action="store_true",
+        help="Check that the --presampled 1h/4h feeds match cerebro.resampledata bar for bar"
+    )
+
     # Walk-forward validation
     parser.add_argument(
         "--walk-forward", "-wf",
@@ -844,29 +1071,26 @@ Examples:
 
     # Set active asset if specified
     if args.asset:
-        import config
         config.ACTIVE_ASSET = args.asset.upper()
         print(f"Using asset: {config.ACTIVE_ASSET}/USD")
 
     # Handle result viewing commands
     if args.list_results:
-        results = load_all_results()
+        results = load_all_results(limit=10)
         print_comparison_table(results)
         return 0
 
     if args.compare:
-        results = load_all_results()
-        filtered = [r for r in results if args.compare.lower() in r.strategy.lower()]
-        print_comparison_table(filtered)
+        results = load_all_results(limit=10, strategy_filter=args.compare)
+        print_comparison_table(results)
         return 0
 
     if args.detail:
-        results = load_all_results()
-        found = [r for r in results if r.run_id == args.detail]
+        found = find_result(args.detail)
         if found:
-            print_result(found[0])
+            print_result(found)
             if args.trades:
-                print_trade_journal(found[0])
+                print_trade_journal(found)
         else:
             print(f"No result found with run ID: {args.detail}")
             return 1
@@ -908,6 +1132,7 @@ Examples:
             start_date=args.start_date,
             end_date=args.end_date,
             verbose=not args.quiet,
+            presampled=args.presampled,
         )
         return 0
 
@@ -932,6 +1157,20 @@ Examples:
         run_tune(args.strategy, verbose=not args.quiet)
         return 0
 
+    # Handle vectorized sweep mode
+    if args.sweep:
+        run_sweep(args.strategy, start_date=args.start_date, end_date=args.end_date)
+        return 0
+
+    # Handle presampled feed check
+    if args.check_presampled:
+        return 0 if run_presampled_check(start_date=args.start_date, end_date=args.end_date) else 1
+
+    # Handle simulator parity check
+    if args.parity:
+        ok = run_parity_check(args.strategy, start_date=args.start_date, end_date=args.end_date)
+        return 0 if ok else 1
+
     # Handle optimization mode
     if args.optimize or args.command == "optimize":
         from optimizer import optimize, print_results
@@ -962,6 +1201,7 @@ Examples:
         notes=args.notes,
         start_date=args.start_date,
         end_date=args.end_date,
+        presampled=args.presampled,
     )
 
     if not args.quiet:
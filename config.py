@@ -867,3 +867,14 @@ V8_FAST_TUNE_VARIATIONS = [
         "atr_fixed_mult": 1.5,
     }),
 ]
+
+# Parameter grid for the vectorized V9 sweep (backtest.py -s v9 --sweep).
+# Every combination is simulated on top of the selected V9 variant's params.
+V9_SWEEP_GRID = {
+    "trend_lookback": [2, 3, 4],
+    "approach_pct": [0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5, 3.0],
+    "target_buffer_pct": [0.5, 1.0, 2.0, 3.0, 4.5],
+    "rr_ratio": [1.5, 2.0, 3.0, 4.0],
+    "min_range_pct": [0.5, 1.0, 2.0, 4.0],
+    "cooldown_bars": [1, 4, 8],
+}
@@ -0,0 +1,178 @@
+# data_bundle.py
+"""
+Price data loading and pre-resampled feeds shared across backtest runs.
+
+read_price_csv() parses a data CSV once per process (see its docstring).
+
+Backtrader's resampledata() walks every 15m bar once per derived timeframe,
+and repeats that work for every cerebro built in the same process (compare-all,
+tuning loops). load_resampled() builds the intraday feeds once with NumPy and
+memoizes them per data file and date range, so cerebro can adddata() the
+prepared frames directly.
+
+Only the 1h and 4h feeds are prepared here, bar for bar as resampledata()
+delivers them (see cerebro_buckets); `python backtest.py --check-presampled`
+compares the two. Daily and weekly bars stay on cerebro.resampledata().
+"""
+
+import importlib.util
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional: it enables the Arrow CSV engine and the Parquet cache;
+# without it CSVs are parsed with pandas' C engine
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Bundle key -> pandas offset alias for the intraday feeds
+INTRADAY_RULES = {
+    '1h': '1h',
+    '4h': '4h',
+}
+
+# Parsed price frames by (path, timestamp column) -> (CSV mtime, DataFrame)
+_PRICE_FRAMES = {}
+
+
+def read_price_csv(filepath: str, timestamp_col: str) -> pd.DataFrame:
+    """
+    Read an OHLCV CSV into a DataFrame indexed by its timestamp column.
+
+    With pyarrow installed, the CSV is parsed with the Arrow engine and cached
+    as Parquet next to it (data/foo.csv -> data/foo.parquet). Later loads read
+    the cache for as long as it is newer than the CSV.
+
+    Parsed frames are also kept in memory, keyed by path and the CSV's mtime,
+    so repeated loads in one process (optimizer trials, compare-all) skip the
+    read entirely. The frame is shared between callers; treat it as read-only.
+    """
+    key = (str(filepath), timestamp_col)
+    mtime = Path(filepath).stat().st_mtime_ns
+    cached = _PRICE_FRAMES.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    df = _read_price_file(filepath, timestamp_col)
+    _PRICE_FRAMES[key] = (mtime, df)
+    return df
+
+
+def _read_price_file(filepath: str, timestamp_col: str) -> pd.DataFrame:
+    """Parse the CSV, or its Parquet cache when that is up to date."""
+    if not HAS_PYARROW:
+        return pd.read_csv(filepath, parse_dates=True, index_col=timestamp_col)
+
+    csv_path = Path(filepath)
+    cache_path = csv_path.with_suffix(".parquet")
+    try:
+        if cache_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns:
+            return pd.read_parquet(cache_path)
+    except FileNotFoundError:
+        pass
+
+    df = pd.read_csv(filepath, engine="pyarrow", parse_dates=[timestamp_col]).set_index(timestamp_col)
+    try:
+        df.to_parquet(cache_path)
+    except OSError:
+        pass  # Read-only data dir: just skip caching
+    return df
+
+
+def filter_dates(df: pd.DataFrame, start_date: Optional[str] = None,
+                 end_date: Optional[str] = None) -> pd.DataFrame:
+    """Restrict df to [start_date, end_date]; end_date includes its whole day."""
+    if start_date:
+        df = df[df.index >= start_date]
+    if end_date:
+        end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+        df = df[df.index <= end_ts]
+    return df
+
+
+def cerebro_buckets(index: pd.DatetimeIndex, rule: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group 15m bars into `rule` (1h/4h) bars the way setup_cerebro_multi_tf's
+    resampledata() feed does, and find the 15m bar each one is delivered on.
+
+    The 15m PandasData is added without a timeframe, so backtrader resamples
+    it as daily data: bars are grouped by index.floor(rule), except that the
+    first bar of a date sitting on a `rule` edge (midnight, or the first bar
+    after a gap) is a bar of its own. Only one resampled bar is delivered per
+    15m bar, so each one reaches the strategy on the first 15m bar of the
+    next one; a leading edge bar, with nothing ahead of it, is delivered at
+    once.
+
+    Returns:
+        (starts, shown): first 15m bar of each resampled bar, and the 15m bar
+        it is delivered on (len(index) for the last one, still open when the
+        data ends)
+    """
+    n = len(index)
+    keys = index.floor(rule).asi8
+    days = index.normalize().asi8
+    alone = index.asi8 == keys
+    alone[1:] &= days[1:] != days[:-1]
+
+    new_bar = np.ones(n, dtype=bool)
+    new_bar[1:] = (keys[1:] != keys[:-1]) | alone[:-1]
+    starts = np.flatnonzero(new_bar)
+
+    shown = np.append(starts[1:], n)
+    if n and alone[0]:
+        shown[0] = 0
+    return starts, shown
+
+
+def resample_ohlcv(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """
+    Resample 15m OHLCV bars to `rule` as resampledata() delivers them.
+
+    Each bar is stamped with the 15m bar it is delivered on, so cerebro
+    releases it at the same point. That is also the datetime resampledata()
+    gives it, except around midnight: there it stamps the bar closed by the
+    new date with the previous session's end (23:59:59.99) and the midnight
+    bar with 00:00. Stamping them that way here would make cerebro's clock
+    take extra steps. The last bar, never delivered before the data ends, is
+    dropped.
+    """
+    if df.empty:
+        return df[['open', 'high', 'low', 'close', 'volume']]
+    starts, shown = cerebro_buckets(df.index, rule)
+    ends = np.append(starts[1:], len(df)) - 1
+    out = pd.DataFrame({
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts),
+    }, index=df.index[np.minimum(shown, len(df) - 1)])
+    return out[shown < len(df)]
+
+
+def load_resampled(data_path: str, timestamp_col: str, start_date: Optional[str] = None,
+                   end_date: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Load a 15m CSV, filter it by date and resample it to the intraday feeds.
+
+    Returns:
+        Dict with the filtered '15m' frame plus one frame per INTRADAY_RULES key.
+        The result is cached (until the CSV changes) and shared between
+        callers, so treat it as read-only.
+    """
+    return _load_resampled(data_path, timestamp_col, start_date, end_date,
+                           os.stat(data_path).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_resampled(data_path: str, timestamp_col: str, start_date: Optional[str],
+                    end_date: Optional[str], mtime_ns: int) -> Dict[str, pd.DataFrame]:
+    """load_resampled() body; mtime_ns only keys the cache."""
+    df = filter_dates(read_price_csv(data_path, timestamp_col), start_date, end_date)
+    bundle = {'15m': df}
+    for name, rule in INTRADAY_RULES.items():
+        bundle[name] = resample_ohlcv(df, rule)
+    return bundle
@@ -8,18 +8,22 @@ Usage:
     python optimizer.py --trials 100         # Run 100 trials
     python optimizer.py --strategy v8        # Optimize v8 instead
     python optimizer.py --resume             # Resume previous study
+    python optimizer.py -s v11 --jobs 4      # Run trials in 4 worker processes
 """
 
 import argparse
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import optuna
 from optuna.samplers import TPESampler
 
-from backtest import run_backtest
+from backtest import load_data, run_backtest
 from config import V8_FAST_OPTIMIZED_PARAMS, V8_PARAMS
+from data_bundle import filter_dates
 
 RESULTS_DIR = Path("results")
 
@@ -254,33 +258,45 @@ def create_v8_objective(metric: str = "final_value", start_date: str = None, end
 
 
 
-def create_v9_objective(metric: str = "final_value", start_date: str = None, end_date: str = None):
-    """
-    Create objective function for v9 (range trading) optimization.
-    """
-    def objective(trial: optuna.Trial) -> float:
-        params = {
-            # Range detection
-            "trend_lookback": trial.suggest_int("trend_lookback", 2, 6),
+def _v9_params(trial: optuna.Trial) -> dict:
+    """Sample v9 parameters (shared by the cerebro and vectorized objectives)."""
+    return {
+        # Range detection
+        "trend_lookback": trial.suggest_int("trend_lookback", 2, 6),
 
-            # Entry threshold - how close to prev day high/low
-            "approach_pct": trial.suggest_float("approach_pct", 0.25, 3.0, step=0.25),
+        # Entry threshold - how close to prev day high/low
+        "approach_pct": trial.suggest_float("approach_pct", 0.25, 3.0, step=0.25),
 
-            # Target buffer - % short of exact high/low
-            "target_buffer_pct": trial.suggest_float("target_buffer_pct", 0.5, 5.0, step=0.5),
+        # Target buffer - % short of exact high/low
+        "target_buffer_pct": trial.suggest_float("target_buffer_pct", 0.5, 5.0, step=0.5),
 
-            # Risk/Reward ratio
-            "rr_ratio": trial.suggest_float("rr_ratio", 1.5, 5.0, step=0.5),
+        # Risk/Reward ratio
+        "rr_ratio": trial.suggest_float("rr_ratio", 1.5, 5.0, step=0.5),
 
-            # Minimum range filter - skip small range days
-            "min_range_pct": trial.suggest_float("min_range_pct", 0.5, 5.0, step=0.5),
+        # Minimum range filter - skip small range days
+        "min_range_pct": trial.suggest_float("min_range_pct", 0.5, 5.0, step=0.5),
 
-            # Trade cooldown - prevent overtrading
-            "cooldown_bars": trial.suggest_int("cooldown_bars", 1, 12),
+        # Trade cooldown - prevent overtrading
+        "cooldown_bars": trial.suggest_int("cooldown_bars", 1, 12),
 
-            # Position sizing
-            "position_pct": trial.suggest_float("position_pct", 0.5, 0.98, step=0.04),
-        }
+        # Position sizing
+        "position_pct": trial.suggest_float("position_pct", 0.5, 0.98, step=0.04),
+    }
+
+
+def create_v9_objective(metric: str = "final_value", start_date: str = None, end_date: str = None,
+                        vectorized: bool = False):
+    """
+    Create objective function for v9 (range trading) optimization.
+
+    With vectorized=True, trials run through vector_sim.simulate_v9 on data
+    loaded once up front instead of a full cerebro run per trial.
+    """
+    if vectorized:
+        return _create_v9_vectorized_objective(metric, start_date, end_date)
+
+    def objective(trial: optuna.Trial) -> float:
+        params = _v9_params(trial)
 
         try:
             result = run_backtest(
@@ -314,6 +330,29 @@ def create_v9_objective(metric: str = "final_value", start_date: str = None, end
     return objective
 
 
+def _create_v9_vectorized_objective(metric: str, start_date: str = None, end_date: str = None):
+    """v9 objective backed by vector_sim (no cerebro, data loaded once)."""
+    from vector_sim import prepare_bars, simulate_v9
+
+    bars = prepare_bars(filter_dates(load_data(), start_date, end_date))
+
+    def objective(trial: optuna.Trial) -> float:
+        result = simulate_v9(bars, **_v9_params(trial))
+
+        trial.set_user_attr("total_return_pct", result["total_return_pct"])
+        trial.set_user_attr("total_trades", result["total_trades"])
+        trial.set_user_attr("win_rate_pct", result["win_rate_pct"] or 0)
+
+        if metric == "return":
+            return result["total_return_pct"]
+        elif metric == "win_rate":
+            return result["win_rate_pct"] or 0
+        else:
+            return result["final_value"]
+
+    return objective
+
+
 def create_v11_objective(metric: str = "final_value"):
     """
     Create objective function for v11 (combined range + trend on 4H) optimization.
@@ -1274,6 +1313,50 @@ def create_v22_objective(metric: str = "r_expectancy", start_date: str = None, e
     return objective
 
 
+def _select_objective(strategy: str, metric: str, start_date: str = None, end_date: str = None,
+                      walk_forward_opt: bool = False, vectorized: bool = False):
+    """Build the objective function for a strategy/mode combination."""
+    if strategy == "v8_fast" and walk_forward_opt:
+        return create_v8_fast_walkforward_objective(
+            metric, start_date=start_date, end_date=end_date)
+    if strategy == "v8_fast":
+        return create_v8_fast_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v8":
+        return create_v8_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v9":
+        return create_v9_objective(metric, start_date=start_date, end_date=end_date,
+                                   vectorized=vectorized)
+    if strategy == "v11":
+        return create_v11_objective(metric)
+    if strategy == "v13":
+        return create_v13_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v14":
+        return create_v14_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v15":
+        return create_v15_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v16":
+        return create_v16_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v17":
+        return create_v17_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v18":
+        return create_v18_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v21":
+        return create_v21_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v22":
+        return create_v22_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v19" and walk_forward_opt:
+        return create_v19_walkforward_objective(
+            metric, start_date=start_date, end_date=end_date)
+    if strategy == "v19":
+        return create_v19_objective(metric, start_date=start_date, end_date=end_date)
+    if strategy == "v20" and walk_forward_opt:
+        return create_v20_walkforward_objective(
+            metric, start_date=start_date, end_date=end_date)
+    if strategy == "v20":
+        return create_v20_objective(metric, start_date=start_date, end_date=end_date)
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
 def optimize(
     strategy: str = "v8_fast",
     n_trials: int = 50,
@@ -1283,6 +1366,8 @@ def optimize(
     start_date: str = None,
     end_date: str = None,
     walk_forward_opt: bool = False,
+    vectorized: bool = False,
+    jobs: int = 1,
 ):
     """
     Run optimization study.
@@ -1293,10 +1378,18 @@ def optimize(
         metric: Metric to optimize ("final_value", "sharpe", "return")
         resume: Whether to resume a previous study
         study_name: Name for the study (auto-generated if None)
+        vectorized: Score trials with vector_sim instead of cerebro (v9 only)
+        jobs: Worker processes to run trials in (0 = one per CPU core). The
+            workers share the study through its sqlite storage.
 
     Returns:
         optuna.Study object with results
     """
+    if vectorized and strategy != "v9":
+        raise ValueError(f"Vectorized optimization only supports v9, not {strategy}")
+    if jobs < 0:
+        raise ValueError(f"jobs must be 0 (one per CPU core) or a positive count, not {jobs}")
+
     RESULTS_DIR.mkdir(exist_ok=True)
 
     if study_name is None:
@@ -1329,85 +1422,91 @@ def optimize(
             load_if_exists=True,
         )
 
-    # Select objective function
-    if strategy == "v8_fast" and walk_forward_opt:
-        objective = create_v8_fast_walkforward_objective(
-            metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v8_fast":
-        objective = create_v8_fast_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v8":
-        objective = create_v8_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v9":
-        objective = create_v9_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v11":
-        objective = create_v11_objective(metric)
-    elif strategy == "v13":
-        objective = create_v13_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v14":
-        objective = create_v14_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v15":
-        objective = create_v15_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v16":
-        objective = create_v16_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v17":
-        objective = create_v17_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v18":
-        objective = create_v18_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v21":
-        objective = create_v21_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v22":
-        objective = create_v22_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v19" and walk_forward_opt:
-        objective = create_v19_walkforward_objective(
-            metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v19":
-        objective = create_v19_objective(metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v20" and walk_forward_opt:
-        objective = create_v20_walkforward_objective(
-            metric, start_date=start_date, end_date=end_date)
-    elif strategy == "v20":
-        objective = create_v20_objective(metric, start_date=start_date, end_date=end_date)
-    else:
-        raise ValueError(f"Unknown strategy: {strategy}")
-
     print(f"\nStarting optimization for {strategy}")
     print(f"Metric: {metric}")
     if walk_forward_opt:
         print(f"Mode: NESTED WALK-FORWARD (scoring on inner OOS)")
+    if vectorized:
+        print("Mode: VECTORIZED (vector_sim, no cerebro)")
     print(f"Trials: {n_trials}")
     print(f"Study: {study_name}")
+    if jobs != 1:
+        jobs = jobs or os.cpu_count() or 1
+        print(f"Workers: {jobs}")
     print("-" * 60)
 
-    # Run optimization with progress callback
-    def callback(study, trial):
-        trades = trial.user_attrs.get('total_trades', 0)
-        ret = trial.user_attrs.get('total_return_pct', 0)
-        tpd = trial.user_attrs.get('trades_per_day', 0)
-
-        # Show IS/OOS breakdown for walk-forward-opt mode
-        is_ret = trial.user_attrs.get('is_return_pct', None)
-        oos_ret = trial.user_attrs.get('oos_return_pct', None)
-        if is_ret is not None and oos_ret is not None and trial.value is not None:
-            print(f"Trial {trial.number}: Score={trial.value:,.2f} "
-                  f"(IS: {is_ret:+.1f}%, OOS: {oos_ret:+.1f}%, "
-                  f"Trades: {trades})")
-        elif tpd and tpd > 0:
-            print(f"Trial {trial.number}: Score={trial.value:,.2f} "
-                  f"(Return: {ret:+.1f}%, "
-                  f"Trades: {trades}, "
-                  f"T/Day: {tpd:.2f}, "
-                  f"Sharpe: {trial.user_attrs.get('sharpe_ratio', 0):.2f})")
-        elif trial.value is not None:
-            print(f"Trial {trial.number}: Score={trial.value:,.2f} "
-                  f"(Return: {ret:+.1f}%, "
-                  f"Trades: {trades}, "
-                  f"Sharpe: {trial.user_attrs.get('sharpe_ratio', 0):.2f})")
-
-    study.optimize(objective, n_trials=n_trials, callbacks=[callback])
+    if jobs > 1:
+        # Each process loads the study from storage and runs its share of the
+        # trials; optuna coordinates them through the sqlite database.
+        # Backtests are CPU-bound, so threads (optuna's n_jobs) would just
+        # contend for the GIL.
+        import config
+        objective_args = (strategy, metric, start_date, end_date, walk_forward_opt, vectorized)
+        shares = [n_trials // jobs + (1 if i < n_trials % jobs else 0) for i in range(jobs)]
+        # Parse the price data before the pool starts: forked workers inherit
+        # read_price_csv's in-memory copy instead of each reading the file
+        load_data()
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            futures = [
+                ex.submit(_optimize_worker, study_name, storage, worker, share,
+                          objective_args, config.ACTIVE_ASSET)
+                for worker, share in enumerate(shares) if share
+            ]
+            for future in futures:
+                future.result()
+        return optuna.load_study(study_name=study_name, storage=storage)
+
+    # Workers build their own objective, so only the serial path needs one here
+    objective = _select_objective(strategy, metric, start_date, end_date,
+                                  walk_forward_opt, vectorized)
+    study.optimize(objective, n_trials=n_trials, callbacks=[_print_trial])
 
     return study
 
 
+def _optimize_worker(study_name: str, storage: str, worker: int, n_trials: int,
+                     objective_args: tuple, asset: str) -> None:
+    """Run n_trials of a stored study in a worker process."""
+    # Spawned workers re-import config, so carry over an --asset override
+    import config
+    config.ACTIVE_ASSET = asset
+
+    # Offset the seed so the workers' samplers don't propose identical trials
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=storage,
+        sampler=TPESampler(seed=42 + worker),
+    )
+    study.optimize(_select_objective(*objective_args), n_trials=n_trials,
+                   callbacks=[_print_trial])
+
+
+def _print_trial(study, trial):
+    """Progress callback: one line per finished trial."""
+    trades = trial.user_attrs.get('total_trades', 0)
+    ret = trial.user_attrs.get('total_return_pct', 0)
+    tpd = trial.user_attrs.get('trades_per_day', 0)
+
+    # Show IS/OOS breakdown for walk-forward-opt mode
+    is_ret = trial.user_attrs.get('is_return_pct', None)
+    oos_ret = trial.user_attrs.get('oos_return_pct', None)
+    if is_ret is not None and oos_ret is not None and trial.value is not None:
+        print(f"Trial {trial.number}: Score={trial.value:,.2f} "
+              f"(IS: {is_ret:+.1f}%, OOS: {oos_ret:+.1f}%, "
+              f"Trades: {trades})")
+    elif tpd and tpd > 0:
+        print(f"Trial {trial.number}: Score={trial.value:,.2f} "
+              f"(Return: {ret:+.1f}%, "
+              f"Trades: {trades}, "
+              f"T/Day: {tpd:.2f}, "
+              f"Sharpe: {trial.user_attrs.get('sharpe_ratio', 0):.2f})")
+    elif trial.value is not None:
+        print(f"Trial {trial.number}: Score={trial.value:,.2f} "
+              f"(Return: {ret:+.1f}%, "
+              f"Trades: {trades}, "
+              f"Sharpe: {trial.user_attrs.get('sharpe_ratio', 0):.2f})")
+
+
 def print_results(study: optuna.Study, strategy: str):
     """Print optimization results."""
     print("\n" + "=" * 60)
@@ -1593,6 +1692,8 @@ Examples:
   python optimizer.py --resume --study my_study  # Resume previous study
   python optimizer.py -s v8_fast --importance  # Analyze parameter importance
   python optimizer.py -s v8_fast -w            # Nested walk-forward optimization
+  python optimizer.py -s v9 --vectorized       # Fast v9 sweep without cerebro
+  python optimizer.py -s v11 -n 200 --jobs 0   # Parallel trials, one worker per core
         """,
     )
 
@@ -1653,6 +1754,19 @@ Examples:
         help="Use nested walk-forward optimization (score each trial on inner OOS portion)"
     )
 
+    parser.add_argument(
+        "--vectorized",
+        action="store_true",
+        help="Score trials with the vectorized simulator instead of cerebro (v9 only)"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Worker processes to run trials in (default: 1, 0 = one per CPU core)"
+    )
+
     parser.add_argument(
         "--importance", "-i",
         action="store_true",
@@ -1660,6 +1774,10 @@ Examples:
     )
 
     args = parser.parse_args()
+    if args.vectorized and args.strategy != "v9":
+        parser.error(f"--vectorized only supports v9, not {args.strategy}")
+    if args.jobs < 0:
+        parser.error(f"--jobs must be 0 (one per CPU core) or a positive count, not {args.jobs}")
 
     # Set active asset if specified
     if args.asset:
@@ -1681,6 +1799,8 @@ Examples:
         start_date=args.start_date,
         end_date=args.end_date,
         walk_forward_opt=args.walk_forward_opt,
+        vectorized=args.vectorized,
+        jobs=args.jobs,
     )
 
     print_results(study, args.strategy)
@@ -6,16 +6,57 @@ Saves backtest results to JSON files and provides analysis tools.
 
 import json
 import os
-from dataclasses import dataclass, asdict
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from functools import cached_property, lru_cache
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:  # numba is optional; TradeTracker falls back to NumPy reductions
+    HAS_NUMBA = False
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder/decoder
+    orjson = None
 
 
 RESULTS_DIR = Path("results")
 
+# Results are stored compact; use `python results.py --pretty FILE` to read one
+_JSON_SEPARATORS = (",", ":")
+
+
+def _json_dumps(obj) -> bytes:
+    """Compact JSON encoding (orjson when available; unknown types via str())."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=_JSON_SEPARATORS, default=str).encode()
+
+
+def _json_loads(data: bytes):
+    """Decode JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
-@dataclass
+# JSON-Lines index of saved results' metadata (no trade journals), read in one
+# pass by load_all_results
+RESULTS_INDEX_NAME = "results.jsonl"
+
+
+@dataclass(slots=True)
 class BacktestResult:
     """Container for backtest run results."""
     # Run metadata
@@ -62,19 +103,138 @@ class BacktestResult:
     trades: Optional[List[Dict[str, Any]]] = None
 
 
+_VALID_FIELDS = frozenset(BacktestResult.__dataclass_fields__)
+
+
+class SortedResults(list):
+    """
+    List of results that computes and caches its common orderings on first use.
+    Treat it as read-only once an ordering has been accessed.
+    """
+
+    @cached_property
+    def by_return(self) -> List[BacktestResult]:
+        return sorted(self, key=lambda r: r.total_return_pct, reverse=True)
+
+    @cached_property
+    def by_timestamp(self) -> List[BacktestResult]:
+        return sorted(self, key=lambda r: r.timestamp, reverse=True)
+
+    @cached_property
+    def by_sharpe(self) -> List[BacktestResult]:
+        """Highest Sharpe first; results without a Sharpe ratio are omitted."""
+        return sorted((r for r in self if r.sharpe_ratio is not None),
+                      key=lambda r: r.sharpe_ratio, reverse=True)
+
+
+def _by_return(results: List[BacktestResult]) -> List[BacktestResult]:
+    """Results ordered by total return, reusing a SortedResults cache if given one."""
+    if isinstance(results, SortedResults):
+        return results.by_return
+    return sorted(results, key=lambda r: r.total_return_pct, reverse=True)
+
+
 def ensure_results_dir():
     """Create results directory if it doesn't exist."""
     RESULTS_DIR.mkdir(exist_ok=True)
 
 
-def generate_run_id() -> str:
-    """Generate a unique run ID based on timestamp."""
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+_run_id_lock = threading.Lock()
+_last_run_stamp = ""
+_run_id_seq = 0
+
+
+def generate_run_id(now: Optional[datetime] = None) -> str:
+    """
+    Generate a unique run ID based on timestamp.
+
+    IDs are YYYYMMDD_HHMMSS; further runs within the same second in this
+    process get a _1, _2, ... suffix so their result files don't collide.
+    """
+    global _last_run_stamp, _run_id_seq
+    stamp = now.strftime("%Y%m%d_%H%M%S") if now else time.strftime("%Y%m%d_%H%M%S")
+    with _run_id_lock:
+        if stamp != _last_run_stamp:
+            _last_run_stamp = stamp
+            _run_id_seq = 0
+            return stamp
+        _run_id_seq += 1
+        return f"{stamp}_{_run_id_seq}"
+
+
+# Result filenames: {YYYYMMDD_HHMMSS}[_{seq}]_{strategy}.json (see generate_run_id)
+_RUN_FILE_RE = re.compile(r"(\d{8}_\d{6})(?:_(\d+))?_")
+
+
+def _run_file_order(filename: str):
+    """
+    Sort key putting result files in run order: run ID stamp, then its _seq.
+
+    Raw filenames sort "<id>_1_v9.json" before "<id>_v9.json" would (and
+    "<id>_10" before "<id>_2"), so the stamp and suffix are compared parsed.
+    Files without a run ID sort before every run.
+    """
+    m = _RUN_FILE_RE.match(filename)
+    if m is None:
+        return ("", -1)
+    return (m.group(1), int(m.group(2) or 0))
+
+
+def _result_to_dict(result: BacktestResult) -> Dict[str, Any]:
+    """Shallow field dict for serialization (avoids asdict's recursive deepcopy)."""
+    return {name: getattr(result, name) for name in result.__slots__}
+
+
+def _index_path() -> Path:
+    """JSON-Lines index holding one metadata record per saved result."""
+    return RESULTS_DIR / RESULTS_INDEX_NAME
+
+
+def _iter_result_json(result: BacktestResult) -> Iterator[bytes]:
+    """Encode a result as JSON chunks: scalar fields first, then one chunk per trade."""
+    fields = _result_to_dict(result)
+    trades = fields.pop("trades")  # Last dataclass field, so key order is unchanged
+    head = _json_dumps(fields)
+    if trades is None:
+        yield head[:-1] + b',"trades":null}'
+        return
+
+    yield head[:-1] + b',"trades":['
+    for i, t in enumerate(trades):
+        if i:
+            yield b","
+        yield _json_dumps(t)
+    yield b"]}"
+
+
+def _index_entry(filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index record for a saved result: its fields minus the trade journal, plus
+    the file's mtime and size so a stale record can be told from the file.
+    """
+    st = os.stat(RESULTS_DIR / filename)
+    return {
+        "file": filename,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "result": {k: v for k, v in data.items() if k != "trades"},
+    }
+
+
+def _write_index(entries: Iterable[Dict[str, Any]]):
+    """Replace the results index with `entries` (written to a temp file, then renamed)."""
+    index_path = _index_path()
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for entry in entries:
+            f.write(_json_dumps(entry) + b"\n")
+    os.replace(tmp_path, index_path)
 
 
 def save_result(result: BacktestResult) -> str:
     """
-    Save a backtest result to JSON file.
+    Save a backtest result to JSON file and record its metadata in the results
+    index. Index entries whose file no longer exists are dropped at the same time.
     Returns the path to the saved file.
     """
     ensure_results_dir()
@@ -82,34 +242,144 @@ def save_result(result: BacktestResult) -> str:
     filename = f"{result.run_id}_{result.strategy}.json"
     filepath = RESULTS_DIR / filename
 
-    with open(filepath, "w") as f:
-        json.dump(asdict(result), f, indent=2, default=str)
+    # Stream chunks so a large trade journal is never encoded in one piece
+    with open(filepath, "wb") as f:
+        for chunk in _iter_result_json(result):
+            f.write(chunk)
+
+    index = {name: entry for name, entry in _load_index().items()
+             if name != filename and (RESULTS_DIR / name).is_file()}
+    index[filename] = _index_entry(filename, _result_to_dict(result))
+    _write_index(index.values())
 
     return str(filepath)
 
 
-def load_result(filepath: str) -> BacktestResult:
-    """Load a backtest result from JSON file."""
-    with open(filepath, "r") as f:
-        data = json.load(f)
+def _result_from_dict(data: Dict[str, Any]) -> BacktestResult:
+    """Build a BacktestResult, ignoring keys from newer/older schema versions."""
     # Handle old JSONs that don't have newer fields
-    valid_fields = {f.name for f in BacktestResult.__dataclass_fields__.values()}
-    filtered = {k: v for k, v in data.items() if k in valid_fields}
-    return BacktestResult(**filtered)
+    return BacktestResult(**{k: data[k] for k in data.keys() & _VALID_FIELDS})
+
+
+def load_result(filepath: str) -> BacktestResult:
+    """Load a backtest result from JSON file (memoized until the file changes)."""
+    st = os.stat(filepath)
+    return _load_result_cached(str(filepath), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=512)
+def _load_result_cached(filepath: str, mtime_ns: int, size: int) -> BacktestResult:
+    """Parse a result file; keyed on (path, mtime, size) so edited files are re-read."""
+    with open(filepath, "rb") as f:
+        data = _json_loads(f.read())
+    return _result_from_dict(data)
+
+
+def find_result(run_id: str) -> Optional[BacktestResult]:
+    """Load the result with the given run ID by filename, without scanning every run."""
+    for filepath in sorted(RESULTS_DIR.glob(f"{run_id}_*.json")):
+        try:
+            result = load_result(str(filepath))
+        except (json.JSONDecodeError, TypeError):
+            continue  # e.g. a comparison file saved in the same second
+        if result.run_id == run_id:
+            return result
+    return None
+
+
+def _load_index() -> Dict[str, Dict[str, Any]]:
+    """Read the results index into {filename: index entry} (later lines win)."""
+    index_path = _index_path()
+    try:
+        st = os.stat(index_path)
+    except FileNotFoundError:
+        return {}
+    return _load_index_cached(str(index_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1)
+def _load_index_cached(index_path: str, mtime_ns: int, size: int) -> Dict[str, Dict[str, Any]]:
+    """Parse the index file; memoized until its mtime or size changes."""
+    index = {}
+    for line in Path(index_path).read_bytes().splitlines():
+        try:
+            entry = _json_loads(line)
+            if "mtime_ns" in entry:  # Older entries held whole results; skip them
+                index[entry["file"]] = entry
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue  # Truncated or foreign line; the per-run JSON is authoritative
+    return index
 
 
-def load_all_results() -> List[BacktestResult]:
-    """Load all results from the results directory."""
+def rebuild_index() -> int:
+    """Rewrite the results index from the per-run JSON files. Returns entry count."""
     ensure_results_dir()
 
+    entries = []
+    with os.scandir(RESULTS_DIR) as it:
+        for e in sorted(it, key=lambda e: e.name):
+            if not (e.name.endswith(".json") and e.is_file()):
+                continue
+            try:
+                with open(e.path, "rb") as f:
+                    data = _json_loads(f.read())
+                _result_from_dict(data)
+            except (json.JSONDecodeError, TypeError):
+                continue  # Not a BacktestResult (e.g. best_params, comparisons)
+            entries.append(_index_entry(e.name, data))
+
+    _write_index(entries)
+    return len(entries)
+
+
+def load_all_results(limit: Optional[int] = None, strategy_filter: Optional[str] = None,
+                     with_trades: bool = False) -> List[BacktestResult]:
+    """
+    Load all results from the results directory (newest first).
+
+    Filenames are ``{run_id}_{strategy}.json`` with a YYYYMMDD_HHMMSS[_seq]
+    run ID, so they are ordered by run ID and filtered by strategy substring
+    before parsing; with ``limit`` only the newest ``limit`` matching results
+    are parsed.
+
+    Results whose index entry still matches their file's mtime and size are
+    built from the index without opening the file. The index holds no trade
+    journals, so those results have ``trades=None`` unless ``with_trades`` is
+    set, which reads every result from its own file instead.
+    """
+    ensure_results_dir()
+
+    needle = strategy_filter.lower() if strategy_filter else None
+    with os.scandir(RESULTS_DIR) as it:
+        entries = [
+            e for e in it
+            if e.name.endswith(".json") and (needle is None or needle in e.name.lower()) and e.is_file()
+        ]
+    entries.sort(key=lambda e: _run_file_order(e.name), reverse=True)
+
+    # Up-to-date indexed results come from one file; the rest are opened individually
+    index = {} if with_trades else _load_index()
+
     results = []
-    for filepath in RESULTS_DIR.glob("*.json"):
+    for e in entries:
+        if limit is not None and len(results) >= limit:
+            break
+        filepath = e.path
         try:
-            results.append(load_result(str(filepath)))
+            st = e.stat()
+            entry = index.get(e.name)
+            if entry is not None and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                result = _result_from_dict(entry["result"])
+            else:
+                result = _load_result_cached(filepath, st.st_mtime_ns, st.st_size)
         except (json.JSONDecodeError, TypeError) as e:
             print(f"Warning: Could not load {filepath}: {e}")
+            continue
+        # The filename match may hit the run ID; confirm against the strategy name
+        if needle is None or needle in result.strategy.lower():
+            results.append(result)
 
-    # Sort by timestamp (newest first)
+    # Sort by timestamp (newest first) to order runs sharing a run ID second
     results.sort(key=lambda r: r.timestamp, reverse=True)
     return results
 
@@ -135,8 +405,9 @@ def create_result(
     """
     Create a BacktestResult with calculated metrics.
     """
-    run_id = generate_run_id()
-    timestamp = datetime.now().isoformat()
+    now = datetime.now()
+    run_id = generate_run_id(now)
+    timestamp = now.isoformat()
     total_return_pct = (final_value - starting_value) / starting_value * 100
 
     win_rate_pct = None
@@ -157,11 +428,12 @@ def create_result(
     best_r = None
     worst_r = None
     if trades:
-        r_values = [t.get("r_multiple") for t in trades if t.get("r_multiple") is not None]
-        if r_values:
-            avg_r_multiple = round(sum(r_values) / len(r_values), 2)
-            best_r = round(max(r_values), 2)
-            worst_r = round(min(r_values), 2)
+        r_values = _r_multiples(trades)
+        r_values = r_values[~np.isnan(r_values)]
+        if r_values.size:
+            avg_r_multiple = round(float(r_values.mean()), 2)
+            best_r = round(float(r_values.max()), 2)
+            worst_r = round(float(r_values.min()), 2)
 
     return BacktestResult(
         run_id=run_id,
@@ -192,58 +464,76 @@ def create_result(
     )
 
 
+def _write_lines(lines: List[str]):
+    """Emit a report as a single stdout write instead of one print() per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
 def print_result(result: BacktestResult):
     """Print a formatted summary of a backtest result."""
-    print(f"\n{'='*60}")
-    print(f"Run ID: {result.run_id}")
-    print(f"Strategy: {result.strategy}")
-    print(f"Timestamp: {result.timestamp}")
-    print(f"Data Source: {result.data_source}")
+    out = [
+        f"\n{'='*60}",
+        f"Run ID: {result.run_id}",
+        f"Strategy: {result.strategy}",
+        f"Timestamp: {result.timestamp}",
+        f"Data Source: {result.data_source}",
+    ]
     if result.start_date and result.end_date:
-        print(f"Date Range: {result.start_date} to {result.end_date}")
-    print(f"{'='*60}")
+        out.append(f"Date Range: {result.start_date} to {result.end_date}")
+    out.append(f"{'='*60}")
 
-    print(f"\nPortfolio Performance:")
-    print(f"  Starting Value: ${result.starting_value:,.2f}")
-    print(f"  Final Value:    ${result.final_value:,.2f}")
-    print(f"  Total Return:   {result.total_return_pct:+.2f}%")
+    out.append(f"\nPortfolio Performance:")
+    out.append(f"  Starting Value: ${result.starting_value:,.2f}")
+    out.append(f"  Final Value:    ${result.final_value:,.2f}")
+    out.append(f"  Total Return:   {result.total_return_pct:+.2f}%")
     if result.max_drawdown_pct is not None:
-        print(f"  Max Drawdown:   {result.max_drawdown_pct:.2f}%")
+        out.append(f"  Max Drawdown:   {result.max_drawdown_pct:.2f}%")
     if result.sharpe_ratio is not None:
-        print(f"  Sharpe Ratio:   {result.sharpe_ratio:.2f}")
+        out.append(f"  Sharpe Ratio:   {result.sharpe_ratio:.2f}")
 
     if result.buy_hold_value is not None:
-        print(f"\nBuy & Hold Benchmark:")
-        print(f"  Buy & Hold Value:  ${result.buy_hold_value:,.2f}")
-        print(f"  Buy & Hold Return: {result.buy_hold_return_pct:+.2f}%")
+        out.append(f"\nBuy & Hold Benchmark:")
+        out.append(f"  Buy & Hold Value:  ${result.buy_hold_value:,.2f}")
+        out.append(f"  Buy & Hold Return: {result.buy_hold_return_pct:+.2f}%")
         if result.alpha_pct is not None:
             alpha_label = "Alpha (outperformance)" if result.alpha_pct >= 0 else "Alpha (underperformance)"
-            print(f"  {alpha_label}: {result.alpha_pct:+.2f}%")
+            out.append(f"  {alpha_label}: {result.alpha_pct:+.2f}%")
 
     if result.total_trades > 0:
-        print(f"\nTrade Statistics:")
-        print(f"  Total Trades:   {result.total_trades}")
-        print(f"  Winning:        {result.winning_trades}")
-        print(f"  Losing:         {result.losing_trades}")
+        out.append(f"\nTrade Statistics:")
+        out.append(f"  Total Trades:   {result.total_trades}")
+        out.append(f"  Winning:        {result.winning_trades}")
+        out.append(f"  Losing:         {result.losing_trades}")
         if result.win_rate_pct is not None:
-            print(f"  Win Rate:       {result.win_rate_pct:.1f}%")
+            out.append(f"  Win Rate:       {result.win_rate_pct:.1f}%")
         if result.avg_trade_pct is not None:
-            print(f"  Avg Trade:      {result.avg_trade_pct:+.2f}%")
+            out.append(f"  Avg Trade:      {result.avg_trade_pct:+.2f}%")
         if result.avg_r_multiple is not None:
-            print(f"  R-Expectancy:   {result.avg_r_multiple:+.2f}R per trade")
+            out.append(f"  R-Expectancy:   {result.avg_r_multiple:+.2f}R per trade")
         if result.best_r is not None:
-            print(f"  Best Trade:     {result.best_r:+.1f}R")
+            out.append(f"  Best Trade:     {result.best_r:+.1f}R")
         if result.worst_r is not None:
-            print(f"  Worst Trade:    {result.worst_r:+.1f}R")
+            out.append(f"  Worst Trade:    {result.worst_r:+.1f}R")
 
-    print(f"\nParameters:")
+    out.append(f"\nParameters:")
     for key, value in result.params.items():
-        print(f"  {key}: {value}")
+        out.append(f"  {key}: {value}")
 
     if result.notes:
-        print(f"\nNotes: {result.notes}")
+        out.append(f"\nNotes: {result.notes}")
+
+    out.append(f"{'='*60}\n")
+    _write_lines(out)
+
 
-    print(f"{'='*60}\n")
+# Row templates parsed once at import; the bound .format is called per row
+_format_comparison_row = "{:<18} {:<10} ${:>10,.2f} {:>+9.1f}% {:>7} {:>7} {:>8} {:>8}".format
+_format_ranked_row = "  {:<4} {:<12} {:>+9.1f}% {:>8} {:>8} {:>7} {:>7} {:>10}".format
+
+
+def _fmt_opt(value, fmt: str) -> str:
+    """Format an optional metric, or 'N/A' when missing."""
+    return fmt.format(value) if value is not None else "N/A"
 
 
 def print_comparison_table(results: List[BacktestResult], limit: int = 10):
@@ -254,16 +544,18 @@ def print_comparison_table(results: List[BacktestResult], limit: int = 10):
 
     results = results[:limit]
 
-    print(f"\n{'Run ID':<18} {'Strategy':<10} {'Final Value':>12} {'Return':>10} {'Trades':>7} {'Win%':>7} {'MaxDD':>8} {'Sharpe':>8}")
-    print("-" * 95)
-
-    for r in results:
-        win_rate = f"{r.win_rate_pct:.0f}%" if r.win_rate_pct is not None else "N/A"
-        max_dd = f"{r.max_drawdown_pct:.1f}%" if r.max_drawdown_pct is not None else "N/A"
-        sharpe = f"{r.sharpe_ratio:.2f}" if r.sharpe_ratio is not None else "N/A"
-        print(f"{r.run_id:<18} {r.strategy:<10} ${r.final_value:>10,.2f} {r.total_return_pct:>+9.1f}% {r.total_trades:>7} {win_rate:>7} {max_dd:>8} {sharpe:>8}")
-
-    print("-" * 95)
+    out = [
+        f"\n{'Run ID':<18} {'Strategy':<10} {'Final Value':>12} {'Return':>10} {'Trades':>7} {'Win%':>7} {'MaxDD':>8} {'Sharpe':>8}",
+        "-" * 95,
+    ]
+    out.extend(
+        _format_comparison_row(
+            r.run_id, r.strategy, r.final_value, r.total_return_pct, r.total_trades,
+            _fmt_opt(r.win_rate_pct, "{:.0f}%"), _fmt_opt(r.max_drawdown_pct, "{:.1f}%"),
+            _fmt_opt(r.sharpe_ratio, "{:.2f}"))
+        for r in results
+    )
+    out.append("-" * 95)
 
     # Summary stats
     if len(results) > 1:
@@ -271,9 +563,11 @@ def print_comparison_table(results: List[BacktestResult], limit: int = 10):
         worst = min(results, key=lambda r: r.total_return_pct)
         avg_return = sum(r.total_return_pct for r in results) / len(results)
 
-        print(f"\nBest:  {best.run_id} ({best.strategy}) with {best.total_return_pct:+.1f}%")
-        print(f"Worst: {worst.run_id} ({worst.strategy}) with {worst.total_return_pct:+.1f}%")
-        print(f"Average Return: {avg_return:+.1f}%")
+        out.append(f"\nBest:  {best.run_id} ({best.strategy}) with {best.total_return_pct:+.1f}%")
+        out.append(f"Worst: {worst.run_id} ({worst.strategy}) with {worst.total_return_pct:+.1f}%")
+        out.append(f"Average Return: {avg_return:+.1f}%")
+
+    _write_lines(out)
 
 
 def print_ranked_table(results: List[BacktestResult]):
@@ -283,65 +577,69 @@ def print_ranked_table(results: List[BacktestResult]):
         return
 
     # Sort by return for ranking
-    ranked = sorted(results, key=lambda r: r.total_return_pct, reverse=True)
+    ranked = _by_return(results)
 
-    print(f"\n{'Rank':<6} {'Strategy':<12} {'Return':>10} {'Sharpe':>8} {'MaxDD':>8} {'Win%':>7} {'Trades':>7} {'Alpha':>10}")
-    print("=" * 78)
+    out = [
+        f"\n{'Rank':<6} {'Strategy':<12} {'Return':>10} {'Sharpe':>8} {'MaxDD':>8} {'Win%':>7} {'Trades':>7} {'Alpha':>10}",
+        "=" * 78,
+    ]
 
+    # Track the best result for each metric while emitting rows (ties keep the first seen)
+    best_sharpe = best_dd = best_wr = best_alpha = None
     for i, r in enumerate(ranked, 1):
-        win_rate = f"{r.win_rate_pct:.0f}%" if r.win_rate_pct is not None else "N/A"
-        max_dd = f"{r.max_drawdown_pct:.1f}%" if r.max_drawdown_pct is not None else "N/A"
-        sharpe = f"{r.sharpe_ratio:.2f}" if r.sharpe_ratio is not None else "N/A"
-        alpha = f"{r.alpha_pct:+.1f}%" if r.alpha_pct is not None else "N/A"
-        print(f"  {i:<4} {r.strategy:<12} {r.total_return_pct:>+9.1f}% {sharpe:>8} {max_dd:>8} {win_rate:>7} {r.total_trades:>7} {alpha:>10}")
-
-    print("=" * 78)
+        out.append(_format_ranked_row(
+            i, r.strategy, r.total_return_pct, _fmt_opt(r.sharpe_ratio, "{:.2f}"),
+            _fmt_opt(r.max_drawdown_pct, "{:.1f}%"), _fmt_opt(r.win_rate_pct, "{:.0f}%"),
+            r.total_trades, _fmt_opt(r.alpha_pct, "{:+.1f}%")))
+
+        if r.sharpe_ratio is not None and (best_sharpe is None or r.sharpe_ratio > best_sharpe.sharpe_ratio):
+            best_sharpe = r
+        if r.max_drawdown_pct is not None and (best_dd is None or r.max_drawdown_pct < best_dd.max_drawdown_pct):
+            best_dd = r
+        if (r.win_rate_pct is not None and r.total_trades > 0
+                and (best_wr is None or r.win_rate_pct > best_wr.win_rate_pct)):
+            best_wr = r
+        if r.alpha_pct is not None and (best_alpha is None or r.alpha_pct > best_alpha.alpha_pct):
+            best_alpha = r
+
+    out.append("=" * 78)
 
     # Highlight best by each metric
-    print("\nBest by metric:")
-    best_return = max(ranked, key=lambda r: r.total_return_pct)
-    print(f"  Return:   {best_return.strategy} ({best_return.total_return_pct:+.1f}%)")
-
-    sharpe_candidates = [r for r in ranked if r.sharpe_ratio is not None]
-    if sharpe_candidates:
-        best_sharpe = max(sharpe_candidates, key=lambda r: r.sharpe_ratio)
-        print(f"  Sharpe:   {best_sharpe.strategy} ({best_sharpe.sharpe_ratio:.2f})")
-
-    dd_candidates = [r for r in ranked if r.max_drawdown_pct is not None]
-    if dd_candidates:
-        best_dd = min(dd_candidates, key=lambda r: r.max_drawdown_pct)
-        print(f"  Max DD:   {best_dd.strategy} ({best_dd.max_drawdown_pct:.1f}%)")
+    out.append("\nBest by metric:")
+    best_return = ranked[0]
+    out.append(f"  Return:   {best_return.strategy} ({best_return.total_return_pct:+.1f}%)")
+    if best_sharpe is not None:
+        out.append(f"  Sharpe:   {best_sharpe.strategy} ({best_sharpe.sharpe_ratio:.2f})")
+    if best_dd is not None:
+        out.append(f"  Max DD:   {best_dd.strategy} ({best_dd.max_drawdown_pct:.1f}%)")
+    if best_wr is not None:
+        out.append(f"  Win Rate: {best_wr.strategy} ({best_wr.win_rate_pct:.0f}%)")
+    if best_alpha is not None:
+        out.append(f"  Alpha:    {best_alpha.strategy} ({best_alpha.alpha_pct:+.1f}%)")
 
-    wr_candidates = [r for r in ranked if r.win_rate_pct is not None and r.total_trades > 0]
-    if wr_candidates:
-        best_wr = max(wr_candidates, key=lambda r: r.win_rate_pct)
-        print(f"  Win Rate: {best_wr.strategy} ({best_wr.win_rate_pct:.0f}%)")
-
-    alpha_candidates = [r for r in ranked if r.alpha_pct is not None]
-    if alpha_candidates:
-        best_alpha = max(alpha_candidates, key=lambda r: r.alpha_pct)
-        print(f"  Alpha:    {best_alpha.strategy} ({best_alpha.alpha_pct:+.1f}%)")
+    _write_lines(out)
 
 
 def save_comparison(results: List[BacktestResult], label: str = "compare_all") -> str:
     """Save a strategy comparison to a single JSON file."""
     ensure_results_dir()
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{label}.json"
+    now = datetime.now()
+    filename = f"{generate_run_id(now)}_{label}.json"
     filepath = RESULTS_DIR / filename
 
-    comparison = {
-        "timestamp": datetime.now().isoformat(),
-        "label": label,
-        "strategies": [asdict(r) for r in results],
-        "rankings": {
-            "by_return": [r.strategy for r in sorted(results, key=lambda r: r.total_return_pct, reverse=True)],
-        },
-    }
+    header = _json_dumps({"timestamp": now.isoformat(), "label": label})
+    rankings = _json_dumps({"by_return": [r.strategy for r in _by_return(results)]})
 
-    with open(filepath, "w") as f:
-        json.dump(comparison, f, indent=2, default=str)
+    # Stream each result (and its trades) straight to the file; no intermediate copies
+    with open(filepath, "wb") as f:
+        f.write(header[:-1] + b',"strategies":[')
+        for i, r in enumerate(results):
+            if i:
+                f.write(b",")
+            for chunk in _iter_result_json(r):
+                f.write(chunk)
+        f.write(b'],"rankings":' + rankings + b"}")
 
     return str(filepath)
 
@@ -424,19 +722,40 @@ def print_walk_forward_report(in_sample: BacktestResult, out_of_sample: Backtest
     print(f"{'='*70}\n")
 
 
-def compare_strategies(strategy_filter: Optional[str] = None) -> List[BacktestResult]:
+def compare_strategies(strategy_filter: Optional[str] = None, limit: Optional[int] = None) -> List[BacktestResult]:
     """
     Load and compare results, optionally filtering by strategy.
-    """
-    results = load_all_results()
 
-    if strategy_filter:
-        results = [r for r in results if strategy_filter.lower() in r.strategy.lower()]
+    With ``limit`` only the newest ``limit`` matching files are parsed and
+    returned; without it all matches are returned and the table shows 10.
+    """
+    results = SortedResults(load_all_results(limit=limit, strategy_filter=strategy_filter))
+    results.by_timestamp = list(results)  # load_all_results is already newest-first
 
-    print_comparison_table(results)
+    print_comparison_table(results, limit=limit or 10)
     return results
 
 
+def _trade_arrays(trades: List[Dict[str, Any]]):
+    """Per-field float64 arrays (pnl, pnl_pct, bars_held, r_multiple) from a trade journal.
+
+    Missing values become 0, except r_multiple which uses NaN for "no R data".
+    """
+    n = len(trades)
+    pnl = np.fromiter((t.get("pnl", 0) for t in trades), dtype=np.float64, count=n)
+    pnl_pct = np.fromiter((t.get("pnl_pct", 0) for t in trades), dtype=np.float64, count=n)
+    bars_held = np.fromiter((t.get("bars_held") or 0 for t in trades), dtype=np.float64, count=n)
+    return pnl, pnl_pct, bars_held, _r_multiples(trades)
+
+
+def _r_multiples(trades: List[Dict[str, Any]]) -> np.ndarray:
+    """R-multiple per trade as float64, NaN where the trade has no R data."""
+    return np.fromiter(
+        (np.nan if t.get("r_multiple") is None else t["r_multiple"] for t in trades),
+        dtype=np.float64, count=len(trades),
+    )
+
+
 def print_trade_journal(result: BacktestResult):
     """Print a formatted per-trade journal table."""
     if not result.trades:
@@ -444,20 +763,19 @@ def print_trade_journal(result: BacktestResult):
         return
 
     trades = result.trades
-    print(f"\nTRADE JOURNAL ({len(trades)} trades)")
-    print("=" * 120)
+    out = [f"\nTRADE JOURNAL ({len(trades)} trades)", "=" * 120]
 
     # Check if R-multiples are available
     has_r = any(t.get("r_multiple") is not None for t in trades)
 
     # Header
     if has_r:
-        print(f"{'#':<4} {'Entry Date':<20} {'Exit Date':<20} {'Dir':<6} {'Entry':>10} {'Exit':>10} "
-              f"{'PnL%':>8} {'R':>6} {'PnL$':>10} {'Bars':>6}  Context")
+        out.append(f"{'#':<4} {'Entry Date':<20} {'Exit Date':<20} {'Dir':<6} {'Entry':>10} {'Exit':>10} "
+                   f"{'PnL%':>8} {'R':>6} {'PnL$':>10} {'Bars':>6}  Context")
     else:
-        print(f"{'#':<4} {'Entry Date':<20} {'Exit Date':<20} {'Dir':<6} {'Entry':>10} {'Exit':>10} "
-              f"{'PnL%':>8} {'PnL$':>10} {'Bars':>6}  Context")
-    print("-" * 130)
+        out.append(f"{'#':<4} {'Entry Date':<20} {'Exit Date':<20} {'Dir':<6} {'Entry':>10} {'Exit':>10} "
+                   f"{'PnL%':>8} {'PnL$':>10} {'Bars':>6}  Context")
+    out.append("-" * 130)
 
     for i, t in enumerate(trades, 1):
         entry_dt = t.get("entry_dt", "?")[:16] if t.get("entry_dt") else "?"
@@ -485,88 +803,116 @@ def print_trade_journal(result: BacktestResult):
 
         if has_r:
             r_str = f"{r_mult:>+5.1f}R" if r_mult is not None else "   N/A"
-            print(f"{i:<4} {entry_dt:<20} {exit_dt:<20} {direction:<6} {entry_p:>10.2f} {exit_p:>10.2f} "
-                  f"{pnl_pct:>+7.1f}% {r_str} {pnl_net:>+10.2f} {str(bars):>6}  {ctx_str}")
+            out.append(f"{i:<4} {entry_dt:<20} {exit_dt:<20} {direction:<6} {entry_p:>10.2f} {exit_p:>10.2f} "
+                       f"{pnl_pct:>+7.1f}% {r_str} {pnl_net:>+10.2f} {str(bars):>6}  {ctx_str}")
         else:
-            print(f"{i:<4} {entry_dt:<20} {exit_dt:<20} {direction:<6} {entry_p:>10.2f} {exit_p:>10.2f} "
-                  f"{pnl_pct:>+7.1f}% {pnl_net:>+10.2f} {str(bars):>6}  {ctx_str}")
+            out.append(f"{i:<4} {entry_dt:<20} {exit_dt:<20} {direction:<6} {entry_p:>10.2f} {exit_p:>10.2f} "
+                       f"{pnl_pct:>+7.1f}% {pnl_net:>+10.2f} {str(bars):>6}  {ctx_str}")
 
-    print("-" * 130)
+    out.append("-" * 130)
 
-    # Summary stats from the trade journal
-    wins = [t for t in trades if t.get("pnl", 0) > 0]
-    losses = [t for t in trades if t.get("pnl", 0) <= 0]
-    avg_win = sum(t.get("pnl_pct", 0) for t in wins) / len(wins) if wins else 0
-    avg_loss = sum(t.get("pnl_pct", 0) for t in losses) / len(losses) if losses else 0
-    avg_bars = sum(t.get("bars_held", 0) for t in trades if t.get("bars_held")) / len(trades) if trades else 0
+    # Summary stats from the trade journal, vectorized over per-field arrays
+    pnl, pnl_pct, bars_held, r_multiple = _trade_arrays(trades)
+    win_mask = pnl > 0
+    n_trades = len(trades)
+    n_wins = int(win_mask.sum())
+    n_losses = n_trades - n_wins
+    avg_win = pnl_pct[win_mask].mean() if n_wins else 0
+    avg_loss = pnl_pct[~win_mask].mean() if n_losses else 0
+    avg_bars = bars_held.sum() / n_trades
 
-    print(f"\nJournal Summary:")
-    print(f"  Wins: {len(wins)}  |  Losses: {len(losses)}  |  Win Rate: {len(wins)/len(trades)*100:.1f}%")
-    print(f"  Avg Win: {avg_win:+.2f}%  |  Avg Loss: {avg_loss:+.2f}%  |  Avg Hold: {avg_bars:.0f} bars")
+    out.append(f"\nJournal Summary:")
+    out.append(f"  Wins: {n_wins}  |  Losses: {n_losses}  |  Win Rate: {n_wins/n_trades*100:.1f}%")
+    out.append(f"  Avg Win: {avg_win:+.2f}%  |  Avg Loss: {avg_loss:+.2f}%  |  Avg Hold: {avg_bars:.0f} bars")
 
-    if wins and losses:
-        expectancy = (len(wins)/len(trades) * avg_win) + (len(losses)/len(trades) * avg_loss)
-        print(f"  Expectancy: {expectancy:+.2f}% per trade")
+    if n_wins and n_losses:
+        expectancy = (n_wins/n_trades * avg_win) + (n_losses/n_trades * avg_loss)
+        out.append(f"  Expectancy: {expectancy:+.2f}% per trade")
 
     # R-based summary if available
-    r_values = [t.get("r_multiple") for t in trades if t.get("r_multiple") is not None]
-    if r_values:
-        avg_r = sum(r_values) / len(r_values)
-        best_r = max(r_values)
-        worst_r = min(r_values)
-        r_wins = [r for r in r_values if r > 0]
-        r_losses = [r for r in r_values if r <= 0]
-        avg_r_win = sum(r_wins) / len(r_wins) if r_wins else 0
-        avg_r_loss = sum(r_losses) / len(r_losses) if r_losses else 0
-        print(f"\n  R-Based Summary ({len(r_values)} trades with R data):")
-        print(f"  R-Expectancy: {avg_r:+.2f}R per trade")
-        print(f"  Avg Win: {avg_r_win:+.1f}R  |  Avg Loss: {avg_r_loss:+.1f}R")
-        print(f"  Best: {best_r:+.1f}R  |  Worst: {worst_r:+.1f}R")
+    r_values = r_multiple[~np.isnan(r_multiple)]
+    if r_values.size:
+        r_win_mask = r_values > 0
+        r_wins = r_values[r_win_mask]
+        r_losses = r_values[~r_win_mask]
+        avg_r_win = r_wins.mean() if r_wins.size else 0
+        avg_r_loss = r_losses.mean() if r_losses.size else 0
+        out.append(f"\n  R-Based Summary ({r_values.size} trades with R data):")
+        out.append(f"  R-Expectancy: {r_values.mean():+.2f}R per trade")
+        out.append(f"  Avg Win: {avg_r_win:+.1f}R  |  Avg Loss: {avg_r_loss:+.1f}R")
+        out.append(f"  Best: {r_values.max():+.1f}R  |  Worst: {r_values.min():+.1f}R")
+
+    # Context and regime aggregates need the per-trade dicts
+    n_ctx = 0
+    ctx_sums = defaultdict(lambda: [0.0, 0, 0.0, 0])    # {key: [sum_win, n_win, sum_loss, n_loss]}
+    regime_stats = defaultdict(lambda: [0, 0, 0.0])     # {regime: [trades, wins, total_pnl_pct]}
+    for t, is_win, trade_pnl_pct in zip(trades, win_mask.tolist(), pnl_pct.tolist()):
+        ctx = t.get("market_context")
+        if not ctx:
+            continue
+        n_ctx += 1
+        for key, v in ctx.items():
+            acc = ctx_sums[key]
+            if isinstance(v, (int, float)):
+                if is_win:
+                    acc[0] += v
+                    acc[1] += 1
+                else:
+                    acc[2] += v
+                    acc[3] += 1
+        regime = ctx.get("regime")
+        if regime:
+            row = regime_stats[regime]
+            row[0] += 1
+            row[1] += is_win
+            row[2] += trade_pnl_pct
 
     # Context analysis if available
-    ctx_trades = [t for t in trades if t.get("market_context")]
-    if ctx_trades:
-        print(f"\nMarket Context Analysis ({len(ctx_trades)} trades with context):")
-        # Find common context keys
-        all_keys = set()
-        for t in ctx_trades:
-            all_keys.update(t["market_context"].keys())
-
-        for key in sorted(all_keys):
-            vals_win = [t["market_context"][key] for t in ctx_trades
-                       if key in t["market_context"] and t.get("pnl", 0) > 0
-                       and isinstance(t["market_context"][key], (int, float))]
-            vals_loss = [t["market_context"][key] for t in ctx_trades
-                        if key in t["market_context"] and t.get("pnl", 0) <= 0
-                        and isinstance(t["market_context"][key], (int, float))]
-
-            if vals_win and vals_loss:
-                avg_w = sum(vals_win) / len(vals_win)
-                avg_l = sum(vals_loss) / len(vals_loss)
-                print(f"  {key}: avg(wins)={avg_w:.2f}, avg(losses)={avg_l:.2f}")
+    if n_ctx:
+        out.append(f"\nMarket Context Analysis ({n_ctx} trades with context):")
+        for key in sorted(ctx_sums):
+            sum_w, n_w, sum_l, n_l = ctx_sums[key]
+            if n_w and n_l:
+                out.append(f"  {key}: avg(wins)={sum_w / n_w:.2f}, avg(losses)={sum_l / n_l:.2f}")
 
     # Regime breakdown if regime data is present
-    regime_trades = [t for t in trades if t.get("market_context", {}).get("regime")]
-    if regime_trades:
-        print(f"\nRegime Breakdown ({len(regime_trades)} trades with regime data):")
-        # Group by regime
-        regime_groups = {}
-        for t in regime_trades:
-            regime = t["market_context"]["regime"]
-            if regime not in regime_groups:
-                regime_groups[regime] = []
-            regime_groups[regime].append(t)
-
+    if regime_stats:
+        out.append(f"\nRegime Breakdown ({sum(row[0] for row in regime_stats.values())} trades with regime data):")
         # Sort by number of trades descending
-        for regime, group in sorted(regime_groups.items(), key=lambda x: -len(x[1])):
-            n = len(group)
-            w = sum(1 for t in group if t.get("pnl", 0) > 0)
+        for regime, (n, w, total_pnl_pct) in sorted(regime_stats.items(), key=lambda x: -x[1][0]):
             l = n - w
-            wr = (w / n * 100) if n > 0 else 0
-            avg_pnl = sum(t.get("pnl_pct", 0) for t in group) / n if n > 0 else 0
-            print(f"  {regime:<25} {n:>3} trades, {w}W/{l}L ({wr:.0f}%), avg {avg_pnl:+.1f}%")
-
-    print()
+            wr = w / n * 100
+            avg_pnl = total_pnl_pct / n
+            out.append(f"  {regime:<25} {n:>3} trades, {w}W/{l}L ({wr:.0f}%), avg {avg_pnl:+.1f}%")
+
+    out.append("")
+    _write_lines(out)
+
+
+def _regime_agg(regime_id, pnl, pnl_pct, n_regimes):
+    """Per-regime (trades, wins, total_pnl_pct) for integer-encoded regimes."""
+    trades = np.zeros(n_regimes, dtype=np.int64)
+    wins = np.zeros(n_regimes, dtype=np.int64)
+    total = np.zeros(n_regimes, dtype=np.float64)
+    for i in range(regime_id.shape[0]):
+        r = regime_id[i]
+        trades[r] += 1
+        if pnl[i] > 0:
+            wins[r] += 1
+        total[r] += pnl_pct[i]
+    return trades, wins, total
+
+
+if HAS_NUMBA:
+    _regime_agg = njit(cache=True)(_regime_agg)
+else:
+    def _regime_agg(regime_id, pnl, pnl_pct, n_regimes):
+        """Per-regime (trades, wins, total_pnl_pct) for integer-encoded regimes."""
+        return (
+            np.bincount(regime_id, minlength=n_regimes),
+            np.bincount(regime_id, weights=pnl > 0, minlength=n_regimes).astype(np.int64),
+            np.bincount(regime_id, weights=pnl_pct, minlength=n_regimes),
+        )
 
 
 def print_regime_comparison(results: List[BacktestResult]):
@@ -577,7 +923,7 @@ def print_regime_comparison(results: List[BacktestResult]):
     """
     # Collect regime stats per strategy: {strategy: {regime: {trades, wins, total_pnl_pct}}}
     strategy_regime_stats = {}
-    all_regimes = set()
+    regime_ids = {}  # regime name -> integer ID shared across strategies
 
     for result in results:
         if not result.trades:
@@ -586,18 +932,20 @@ def print_regime_comparison(results: List[BacktestResult]):
         if not regime_trades:
             continue
 
-        stats = {}
-        for t in regime_trades:
-            regime = t["market_context"]["regime"]
-            all_regimes.add(regime)
-            if regime not in stats:
-                stats[regime] = {"trades": 0, "wins": 0, "total_pnl_pct": 0.0}
-            stats[regime]["trades"] += 1
-            if t.get("pnl", 0) > 0:
-                stats[regime]["wins"] += 1
-            stats[regime]["total_pnl_pct"] += t.get("pnl_pct", 0)
-
-        strategy_regime_stats[result.strategy] = stats
+        ids = np.fromiter(
+            (regime_ids.setdefault(t["market_context"]["regime"], len(regime_ids)) for t in regime_trades),
+            dtype=np.int64, count=len(regime_trades),
+        )
+        _, pnl_pct, _, _ = _trade_arrays(regime_trades)
+        pnl = np.fromiter((t.get("pnl", 0) for t in regime_trades), dtype=np.float64, count=len(regime_trades))
+        counts, wins, totals = _regime_agg(ids, pnl, pnl_pct, len(regime_ids))
+
+        strategy_regime_stats[result.strategy] = {
+            regime: {"trades": int(counts[i]), "wins": int(wins[i]), "total_pnl_pct": float(totals[i])}
+            for regime, i in regime_ids.items()
+            if counts[i] > 0
+        }
+    all_regimes = set(regime_ids)
 
     if not strategy_regime_stats:
         print("\nNo regime data available for comparison.")
@@ -669,58 +1017,169 @@ def print_regime_comparison(results: List[BacktestResult]):
     print()
 
 
+def _trade_agg(pnl, equity):
+    """Fused pass over pnl and equity: (wins, max_drawdown_pct, peak_value)."""
+    wins = 0
+    for i in range(pnl.shape[0]):
+        if pnl[i] > 0:
+            wins += 1
+
+    # 100/peak is recomputed only when the peak moves; while peak is 0 the scale is 0
+    peak = 0.0
+    dd_scale = 0.0
+    max_dd = 0.0
+    for i in range(equity.shape[0]):
+        v = equity[i]
+        if v > peak:
+            peak = v
+            dd_scale = 100.0 / peak
+        else:
+            dd = (peak - v) * dd_scale
+            if dd > max_dd:
+                max_dd = dd
+    return wins, max_dd, peak
+
+
+if HAS_NUMBA:
+    _trade_agg = njit(cache=True, fastmath=True)(_trade_agg)
+
+
 class TradeTracker:
     """
     Helper class to track trades during a backtest.
     Use this in strategies to count wins/losses.
+
+    Trades are stored as struct-of-arrays (one float64 buffer per numeric
+    field) so win/loss counts are a vectorized pass over ``pnl``; the count is
+    cached and only extended over trades recorded since the last query.
     """
 
+    _INITIAL_CAPACITY = 1024
+    _EQUITY_CAPACITY = 1 << 14
+
     def __init__(self):
-        self.trades: List[Dict[str, Any]] = []
+        cap = self._INITIAL_CAPACITY
+        self._entry_price = np.empty(cap, dtype=np.float64)
+        self._exit_price = np.empty(cap, dtype=np.float64)
+        self._size = np.empty(cap, dtype=np.float64)
+        self._pnl = np.empty(cap, dtype=np.float64)
+        self._pnl_pct = np.empty(cap, dtype=np.float64)
+        self._times: List[tuple] = []  # (entry_time, exit_time) — not used in aggregations
+        self._n = 0
+        self._wins = 0      # Win count over the first _wins_n trades
+        self._wins_n = 0
+        self._equity = np.empty(self._EQUITY_CAPACITY, dtype=np.float64)
+        self._ei = 0
+        self._dd_final = True
         self.peak_value: float = 0.0
         self.max_drawdown_pct: float = 0.0
 
+    def _grow(self):
+        """Double capacity of all numeric buffers."""
+        cap = len(self._pnl) * 2
+        self._entry_price = np.resize(self._entry_price, cap)
+        self._exit_price = np.resize(self._exit_price, cap)
+        self._size = np.resize(self._size, cap)
+        self._pnl = np.resize(self._pnl, cap)
+        self._pnl_pct = np.resize(self._pnl_pct, cap)
+
     def record_trade(self, entry_price: float, exit_price: float, size: float, entry_time=None, exit_time=None):
         """Record a completed trade."""
-        pnl = (exit_price - entry_price) * size
-        pnl_pct = (exit_price - entry_price) / entry_price * 100
-
-        self.trades.append({
-            "entry_price": entry_price,
-            "exit_price": exit_price,
-            "size": size,
-            "pnl": pnl,
-            "pnl_pct": pnl_pct,
-            "entry_time": str(entry_time) if entry_time else None,
-            "exit_time": str(exit_time) if exit_time else None,
-        })
+        if self._n == len(self._pnl):
+            self._grow()
+
+        i = self._n
+        self._entry_price[i] = entry_price
+        self._exit_price[i] = exit_price
+        self._size[i] = size
+        self._pnl[i] = (exit_price - entry_price) * size
+        self._pnl_pct[i] = (exit_price - entry_price) / entry_price * 100
+        self._times.append((
+            str(entry_time) if entry_time else None,
+            str(exit_time) if exit_time else None,
+        ))
+        self._n = i + 1
+
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """Per-trade records as a list of dicts (built on demand for export)."""
+        n = self._n
+        return [
+            {
+                "entry_price": float(ep),
+                "exit_price": float(xp),
+                "size": float(sz),
+                "pnl": float(pnl),
+                "pnl_pct": float(pct),
+                "entry_time": et,
+                "exit_time": xt,
+            }
+            for ep, xp, sz, pnl, pct, (et, xt) in zip(
+                self._entry_price[:n], self._exit_price[:n], self._size[:n],
+                self._pnl[:n], self._pnl_pct[:n], self._times,
+            )
+        ]
 
     def update_drawdown(self, current_value: float):
-        """Update max drawdown tracking."""
-        if current_value > self.peak_value:
-            self.peak_value = current_value
-        elif self.peak_value > 0:
-            drawdown = (self.peak_value - current_value) / self.peak_value * 100
-            self.max_drawdown_pct = max(self.max_drawdown_pct, drawdown)
+        """Buffer an equity sample; drawdown is computed in finalize_drawdown()."""
+        if self._ei == len(self._equity):
+            self._equity = np.resize(self._equity, self._ei * 2)
+        self._equity[self._ei] = current_value
+        self._ei += 1
+        self._dd_final = False
+
+    def finalize_drawdown(self):
+        """Compute peak value and max drawdown over all buffered equity samples."""
+        if self._dd_final:
+            return
+        self._dd_final = True
+        if self._ei == 0:
+            return
+
+        equity = self._equity[:self._ei]
+        peaks = np.maximum.accumulate(np.maximum(equity, 0.0))
+        valid = peaks > 0
+        if valid.any():
+            dd = (peaks[valid] - equity[valid]) * (100.0 / peaks[valid])
+            self.max_drawdown_pct = max(0.0, float(dd.max()))
+        self.peak_value = float(peaks[-1])
 
     @property
     def total_trades(self) -> int:
-        return len(self.trades)
+        return self._n
+
+    def _refresh_wins(self):
+        """Extend the cached win count over trades recorded since the last call."""
+        if self._wins_n < self._n:
+            self._wins += int((self._pnl[self._wins_n:self._n] > 0).sum())
+            self._wins_n = self._n
 
     @property
     def winning_trades(self) -> int:
-        return sum(1 for t in self.trades if t["pnl"] > 0)
+        self._refresh_wins()
+        return self._wins
 
     @property
     def losing_trades(self) -> int:
-        return sum(1 for t in self.trades if t["pnl"] <= 0)
+        return self._n - self.winning_trades
 
     def get_stats(self) -> Dict[str, Any]:
         """Get summary statistics."""
+        if HAS_NUMBA:
+            new_wins, max_dd, peak = _trade_agg(self._pnl[self._wins_n:self._n], self._equity[:self._ei])
+            self._wins += int(new_wins)
+            self._wins_n = self._n
+            if self._ei:
+                self.max_drawdown_pct = float(max_dd)
+                self.peak_value = float(peak)
+            self._dd_final = True
+        else:
+            self._refresh_wins()
+            self.finalize_drawdown()
         return {
-            "total_trades": self.total_trades,
-            "winning_trades": self.winning_trades,
-            "losing_trades": self.losing_trades,
+            "total_trades": self._n,
+            "winning_trades": self._wins,
+            "losing_trades": self._n - self._wins,
             "max_drawdown_pct": self.max_drawdown_pct,
         }
 
@@ -734,22 +1193,26 @@ if __name__ == "__main__":
     parser.add_argument("--limit", "-n", type=int, default=10, help="Number of results to show")
     parser.add_argument("--detail", "-d", help="Show detailed result for specific run ID")
     parser.add_argument("--trades", action="store_true", help="Show per-trade journal (use with --detail)")
+    parser.add_argument("--pretty", metavar="FILE", help="Pretty-print a stored result JSON file")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild results/results.jsonl from per-run JSON files")
 
     args = parser.parse_args()
 
-    if args.detail:
+    if args.reindex:
+        print(f"Indexed {rebuild_index()} results into {_index_path()}")
+    elif args.pretty:
+        with open(args.pretty, "r") as f:
+            print(json.dumps(json.load(f), indent=2))
+    elif args.detail:
         # Find and show detailed result
-        results = load_all_results()
-        found = [r for r in results if r.run_id == args.detail]
+        found = find_result(args.detail)
         if found:
-            print_result(found[0])
+            print_result(found)
             if args.trades:
-                print_trade_journal(found[0])
+                print_trade_journal(found)
         else:
             print(f"No result found with run ID: {args.detail}")
     else:
         # Show comparison table
-        results = load_all_results()
-        if args.strategy:
-            results = [r for r in results if args.strategy.lower() in r.strategy.lower()]
+        results = load_all_results(limit=args.limit, strategy_filter=args.strategy)
         print_comparison_table(results, limit=args.limit)
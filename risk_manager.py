@@ -12,21 +12,35 @@ Trading model:
 - Ratchet stop up at each R-level hit
 
 Where 1R = the distance from entry to initial stop loss.
+
+The module is fully typed plain Python so it can be compiled ahead of time
+with mypyc (`mypyc risk_manager.py`); the resulting extension module is
+imported in place of this file with no changes to callers.
 """
 
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 
 class RiskManager:
     """R-based position sizing and exit management."""
 
     # Default partial schedule: (R-multiple, fraction of ORIGINAL position to sell)
-    DEFAULT_SCHEDULE = [(1.0, 0.30), (2.0, 0.30), (3.0, 0.30)]
+    DEFAULT_SCHEDULE: List[Tuple[float, float]] = [(1.0, 0.30), (2.0, 0.30), (3.0, 0.30)]
     # Remaining 10% is the runner
 
-    def __init__(self, risk_pct=3.0, partial_schedule=None):
-        self.risk_pct = risk_pct / 100.0  # Convert to decimal
-        self.partial_schedule = partial_schedule or self.DEFAULT_SCHEDULE
+    # Stop offset in R indexed by partials taken: -1R, breakeven, +1R, +2R
+    STOP_R_BY_PARTIALS: Tuple[float, ...] = (-1.0, 0.0, 1.0, 2.0)
+
+    def __init__(self, risk_pct: float = 3.0,
+                 partial_schedule: Optional[List[Tuple[float, float]]] = None) -> None:
+        self.risk_pct: float = risk_pct / 100.0  # Convert to decimal
+        self.partial_schedule: List[Tuple[float, float]] = partial_schedule or self.DEFAULT_SCHEDULE
+        # R-multiples of the schedule levels, reused by trade_setup()
+        self._r_mults = np.array([r for r, _ in self.partial_schedule], dtype=np.float64)
 
-    def calculate_position_size(self, equity, stop_distance):
+    def calculate_position_size(self, equity: float, stop_distance: float) -> float:
         """
         Size position so that hitting the stop loss = risk_pct of equity.
 
@@ -38,35 +52,57 @@ class RiskManager:
             Position size in units (can exceed cash with leverage)
         """
         if stop_distance <= 0:
-            return 0
+            return 0.0
         risk_amount = equity * self.risk_pct
         return risk_amount / stop_distance
 
-    def calculate_r_targets(self, entry_price, stop_distance, direction='long'):
+    def calculate_r_targets(self, entry_price: float, stop_distance: float,
+                            is_long: bool = True) -> Dict[float, float]:
         """
         Calculate R-multiple price targets.
 
         Args:
             entry_price: Entry price
             stop_distance: Absolute distance to stop (positive)
-            direction: 'long' or 'short'
+            is_long: True for long, False for short
 
         Returns:
             dict with R-levels as keys and prices as values
             e.g. {-1: stop_price, 1: target_1R, 2: target_2R, 3: target_3R}
         """
-        targets = {}
-        if direction == 'long':
-            targets[-1] = entry_price - stop_distance  # Stop loss
-            for r_mult, _ in self.partial_schedule:
-                targets[r_mult] = entry_price + (stop_distance * r_mult)
-        else:  # short
-            targets[-1] = entry_price + stop_distance  # Stop loss
-            for r_mult, _ in self.partial_schedule:
-                targets[r_mult] = entry_price - (stop_distance * r_mult)
+        signed_distance = stop_distance if is_long else -stop_distance
+        targets: Dict[float, float] = {-1: entry_price - signed_distance}  # Stop loss
+        for r_mult, _ in self.partial_schedule:
+            targets[r_mult] = entry_price + (signed_distance * r_mult)
         return targets
 
-    def get_stop_for_level(self, entry_price, stop_distance, partials_taken, direction='long'):
+    def trade_setup(self, equity: float, entry_price: float, stop_distance: float,
+                    is_long: bool = True) -> np.ndarray:
+        """
+        Position size, stop and R-targets for a new trade in one call.
+
+        Fuses calculate_position_size() and calculate_r_targets() into a flat
+        array for callers that only need the numbers (sweeps, Monte Carlo).
+
+        Args:
+            equity: Current account value
+            entry_price: Entry price
+            stop_distance: Absolute distance to stop (positive)
+            is_long: True for long, False for short
+
+        Returns:
+            float64 array [size, stop_price, target_1R, target_2R, ...] with
+            one target per partial schedule level
+        """
+        out = np.empty(2 + len(self._r_mults))
+        out[0] = equity * self.risk_pct / stop_distance if stop_distance > 0 else 0.0
+        signed_distance = stop_distance if is_long else -stop_distance
+        out[1] = entry_price - signed_distance
+        out[2:] = entry_price + signed_distance * self._r_mults
+        return out
+
+    def get_stop_for_level(self, entry_price: float, stop_distance: float, partials_taken: int,
+                           is_long: bool = True) -> float:
         """
         Get the current stop price based on how many partials have been taken.
 
@@ -80,31 +116,17 @@ class RiskManager:
             entry_price: Entry price
             stop_distance: Absolute distance to stop (positive)
             partials_taken: Number of partial exits completed (0, 1, 2, 3)
-            direction: 'long' or 'short'
+            is_long: True for long, False for short
 
         Returns:
             Current stop price
         """
-        if direction == 'long':
-            if partials_taken >= 3:
-                return entry_price + (stop_distance * 2)  # +2R
-            elif partials_taken >= 2:
-                return entry_price + stop_distance          # +1R
-            elif partials_taken >= 1:
-                return entry_price                          # Breakeven
-            else:
-                return entry_price - stop_distance          # -1R
-        else:  # short
-            if partials_taken >= 3:
-                return entry_price - (stop_distance * 2)  # +2R
-            elif partials_taken >= 2:
-                return entry_price - stop_distance          # +1R
-            elif partials_taken >= 1:
-                return entry_price                          # Breakeven
-            else:
-                return entry_price + stop_distance          # -1R
-
-    def calculate_r_multiple(self, entry_price, exit_price, stop_distance, direction='long'):
+        r = self.STOP_R_BY_PARTIALS[min(max(partials_taken, 0), 3)]
+        signed_distance = stop_distance if is_long else -stop_distance
+        return entry_price + signed_distance * r
+
+    def calculate_r_multiple(self, entry_price: float, exit_price: float, stop_distance: float,
+                             is_long: bool = True) -> float:
         """
         Calculate the R-multiple of a completed trade.
 
@@ -112,14 +134,13 @@ class RiskManager:
             entry_price: Entry price
             exit_price: Exit price
             stop_distance: Original stop distance (defines 1R)
-            direction: 'long' or 'short'
+            is_long: True for long, False for short
 
         Returns:
             R-multiple (e.g., -1.0 for full stop, +2.5 for 2.5R winner)
         """
         if stop_distance <= 0:
             return 0.0
-        if direction == 'long':
+        if is_long:
             return (exit_price - entry_price) / stop_distance
-        else:
-            return (entry_price - exit_price) / stop_distance
+        return (entry_price - exit_price) / stop_distance
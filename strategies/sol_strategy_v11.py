@@ -25,6 +25,17 @@ Data feeds (expected index order):
 
 import backtrader as bt
 
+# Market states (same codes as vector_sim's V11 simulator)
+RANGING, UPTREND, DOWNTREND = 0, 1, 2
+MARKET_STATE_NAMES = ('ranging', 'uptrend', 'downtrend')
+
+# Position sides
+LONG, SHORT = 1, 2
+
+# Trade modes, also the index into SolStrategyV11._mode_params
+RANGE_MODE, TREND_MODE = 0, 1
+TRADE_MODE_NAMES = ('range', 'trend')
+
 
 class SolStrategyV11(bt.Strategy):
     params = (
@@ -49,6 +60,9 @@ class SolStrategyV11(bt.Strategy):
         # Risk-based position sizing
         ('risk_per_trade_pct', 2.0),     # Risk 2% of equity per trade
         ('max_position_pct', 30.0),      # Max 30% of equity in single position
+
+        # Logging
+        ('verbose', False),              # Print entries, exits and fills
     )
 
     def __init__(self):
@@ -61,18 +75,71 @@ class SolStrategyV11(bt.Strategy):
         self.prev_4h_low = None
 
         # Current market state
-        self.market_state = None       # 'uptrend', 'downtrend', or 'ranging'
+        self.market_state = None       # RANGING, UPTREND or DOWNTREND
+
+        # Plain-attribute copies of the params read on the per-bar path, with
+        # the approach percentages pre-divided into fractions
+        self._min_4h_bars = self.p.trend_lookback + 2
+        self._verbose = self.p.verbose
+        self._risk_frac = self.p.risk_per_trade_pct / 100
+        self._max_position_frac = self.p.max_position_pct / 100
+        self._mode_params = (
+            {  # RANGE_MODE
+                'approach': self.p.range_approach_pct / 100,
+                'min_range_pct': self.p.range_min_range_pct,
+                'cooldown_bars': self.p.range_cooldown_bars,
+                'buffer_pct': self.p.range_buffer_pct,
+                'rr_ratio': self.p.range_rr_ratio,
+            },
+            {  # TREND_MODE
+                'approach': self.p.trend_approach_pct / 100,
+                'min_range_pct': self.p.trend_min_range_pct,
+                'cooldown_bars': self.p.trend_cooldown_bars,
+                'buffer_pct': self.p.trend_buffer_pct,
+                'rr_ratio': self.p.trend_rr_ratio,
+            },
+        )
+
+        # Entry inputs that only change on a new 4H bar (see _update_entry_levels)
+        self._candle_range = None
+        self._entry_mode = None
+        self._min_range_pct = None
+        self._cooldown_bars = None
+        self._low_threshold = None     # long when price <= this (None: no longs)
+        self._high_threshold = None    # short when price >= this (None: no shorts)
+
+        # Trend pair counts on the 4H clock. A pair is a 4H candle with a
+        # higher high AND higher low (or lower high AND lower low) than the
+        # one before it. A trend needs the first min_trend pairs of the
+        # lookback window (oldest first) to agree, i.e. a min_trend-pair sum
+        # read (lookback - min_trend) candles back.
+        n = self.p.trend_lookback
+        min_trend = self.p.min_trend_candles
+        high, low = self.data4h.high, self.data4h.low
+        self._min_trend = min_trend
+        self._trend_ago = -(n - min_trend)
+        if 1 <= min_trend <= n:
+            self.up_pairs = bt.ind.SumN(bt.And(high > high(-1), low > low(-1)), period=min_trend)
+            self.down_pairs = bt.ind.SumN(bt.And(high < high(-1), low < low(-1)), period=min_trend)
+        else:
+            self.up_pairs = self.down_pairs = None
 
         # Position state
         self.entry_price = None
-        self.position_type = None      # 'long' or 'short'
-        self.trade_mode = None         # 'range' or 'trend'
+        self.position_type = None      # LONG or SHORT
+        self.trade_mode = None         # RANGE_MODE or TREND_MODE
         self.initial_size = None
 
         # TP/SL levels (simplified - no partials)
         self.stop_loss = None
         self.take_profit = None
 
+        # Exit levels pre-multiplied by the side's sign (+1 long, -1 short) so
+        # _check_exits() runs the same two comparisons for either side
+        self._side_sign = None
+        self._signed_stop = None
+        self._signed_target = None
+
         # Track bar counts for new bar detection
         self.last_4h_len = 0
         self.last_15m_len = 0
@@ -81,158 +148,120 @@ class SolStrategyV11(bt.Strategy):
         self.last_trade_bar = -999
 
     def next(self):
+        n4h = len(self.data4h)
+
         # Need enough 4H data for trend detection
-        if len(self.data4h) < self.p.trend_lookback + 2:
+        if n4h < self._min_4h_bars:
             return
 
         # Update previous 4H high/low and market state on new 4H bar
-        if len(self.data4h) != self.last_4h_len:
-            self.last_4h_len = len(self.data4h)
+        if n4h != self.last_4h_len:
+            self.last_4h_len = n4h
             # Previous 4H candle's high/low (index -1 is the prior completed bar)
             self.prev_4h_high = self.data4h.high[-1]
             self.prev_4h_low = self.data4h.low[-1]
             # Update market state classification
             self.market_state = self._classify_market()
+            self._update_entry_levels()
 
-        # If in position, check exits on every 15m bar
-        if self.position and self.position_type is not None:
+        # If in position, check exits on every 15m bar. position_type is set
+        # on entry and cleared on exit (or a failed entry order), so it
+        # stands in for the broker position lookup
+        if self.position_type is not None:
             self._check_exits()
             return
 
         # Entry logic: only check on new 15m bar
-        if len(self.data15) == self.last_15m_len:
+        n15 = len(self.data15)
+        if n15 == self.last_15m_len:
             return
-        self.last_15m_len = len(self.data15)
+        self.last_15m_len = n15
 
         # Check for entry signals based on market state
-        self._check_entry()
+        self._check_entry(n15)
 
     def _classify_market(self):
         """
         Classify market as uptrend, downtrend, or ranging based on 4H candles.
         """
-        n = self.p.trend_lookback
-        min_trend = self.p.min_trend_candles
-
-        # Get 4H highs and lows
-        highs = [self.data4h.high[-i] for i in range(n + 1)]
-        lows = [self.data4h.low[-i] for i in range(n + 1)]
-
-        # Reverse so index 0 is oldest
-        highs = highs[::-1]
-        lows = lows[::-1]
-
-        # Count consecutive higher highs AND higher lows (uptrend)
-        uptrend_count = 0
-        for i in range(1, len(highs)):
-            if highs[i] > highs[i-1] and lows[i] > lows[i-1]:
-                uptrend_count += 1
-            else:
-                break
-
-        if uptrend_count >= min_trend:
-            return 'uptrend'
-
-        # Count consecutive lower highs AND lower lows (downtrend)
-        downtrend_count = 0
-        for i in range(1, len(highs)):
-            if highs[i] < highs[i-1] and lows[i] < lows[i-1]:
-                downtrend_count += 1
-            else:
-                break
-
-        if downtrend_count >= min_trend:
-            return 'downtrend'
-
-        return 'ranging'
-
-    def _check_entry(self):
-        """Check for entry signals based on market state."""
+        min_trend = self._min_trend
+        if self.up_pairs is None:
+            # min_trend outside 1..lookback: a run of 0 always qualifies,
+            # one longer than the window never does
+            return UPTREND if min_trend <= 0 else RANGING
+
+        ago = self._trend_ago
+        if self.up_pairs[ago] >= min_trend:
+            return UPTREND
+        if self.down_pairs[ago] >= min_trend:
+            return DOWNTREND
+        return RANGING
+
+    def _update_entry_levels(self):
+        """Cache the 4H-derived entry thresholds and mode params for this 4H bar."""
+        self._candle_range = self.prev_4h_high - self.prev_4h_low
+
+        self._entry_mode = RANGE_MODE if self.market_state == RANGING else TREND_MODE
+        mode_params = self._mode_params[self._entry_mode]
+        self._min_range_pct = mode_params['min_range_pct']
+        self._cooldown_bars = mode_params['cooldown_bars']
+        approach_threshold = mode_params['approach']
+
+        # Ranging trades both edges; trends only take pullbacks with the trend
+        self._low_threshold = None
+        self._high_threshold = None
+        if self.market_state != DOWNTREND:
+            self._low_threshold = self.prev_4h_low * (1 + approach_threshold)
+        if self.market_state != UPTREND:
+            self._high_threshold = self.prev_4h_high * (1 - approach_threshold)
+
+    def _check_entry(self, n15):
+        """Check for entry signals based on market state at 15m bar count n15."""
         if self.prev_4h_high is None or self.prev_4h_low is None:
             return
 
         current_price = self.data15.close[0]
-        candle_range = self.prev_4h_high - self.prev_4h_low
-        range_pct = (candle_range / current_price) * 100
-
-        # Determine parameters based on market state
-        if self.market_state == 'ranging':
-            approach_pct = self.p.range_approach_pct
-            min_range_pct = self.p.range_min_range_pct
-            cooldown_bars = self.p.range_cooldown_bars
-            self.trade_mode = 'range'
-        else:
-            approach_pct = self.p.trend_approach_pct
-            min_range_pct = self.p.trend_min_range_pct
-            cooldown_bars = self.p.trend_cooldown_bars
-            self.trade_mode = 'trend'
+        candle_range = self._candle_range
+        self.trade_mode = self._entry_mode
 
         # Check minimum range requirement
-        if range_pct < min_range_pct:
+        if (candle_range / current_price) * 100 < self._min_range_pct:
             return
 
         # Check cooldown
-        bars_since_trade = len(self.data15) - self.last_trade_bar
-        if bars_since_trade < cooldown_bars:
+        if n15 - self.last_trade_bar < self._cooldown_bars:
             return
 
-        approach_threshold = approach_pct / 100
-
-        # Entry signals based on market state
-        if self.market_state == 'ranging':
-            low_threshold = self.prev_4h_low * (1 + approach_threshold)
-            high_threshold = self.prev_4h_high * (1 - approach_threshold)
-
-            if current_price <= low_threshold:
-                self._enter_long(current_price, candle_range)
-            elif current_price >= high_threshold:
-                self._enter_short(current_price, candle_range)
-
-        elif self.market_state == 'uptrend':
-            low_threshold = self.prev_4h_low * (1 + approach_threshold)
-            if current_price <= low_threshold:
-                self._enter_long(current_price, candle_range)
+        # Entry signals: cached thresholds already encode the market state
+        low_threshold = self._low_threshold
+        if low_threshold is not None and current_price <= low_threshold:
+            self._enter_long(current_price, candle_range)
+            return
 
-        elif self.market_state == 'downtrend':
-            high_threshold = self.prev_4h_high * (1 - approach_threshold)
-            if current_price >= high_threshold:
-                self._enter_short(current_price, candle_range)
+        high_threshold = self._high_threshold
+        if high_threshold is not None and current_price >= high_threshold:
+            self._enter_short(current_price, candle_range)
 
     def _get_params_for_mode(self):
         """Get the appropriate parameters based on trade mode."""
-        if self.trade_mode == 'range':
-            return {
-                'buffer_pct': self.p.range_buffer_pct,
-                'rr_ratio': self.p.range_rr_ratio,
-            }
-        else:
-            return {
-                'buffer_pct': self.p.trend_buffer_pct,
-                'rr_ratio': self.p.trend_rr_ratio,
-            }
+        return self._mode_params[self.trade_mode]
 
     def _calculate_position_size(self, entry_price, stop_loss):
         """
-        Calculate position size based on risking X% of equity per trade.
+        Calculate position size based on risking X% of equity per trade,
+        capped by max_position_pct of equity and 99% of available cash.
         """
-        equity = self.broker.getvalue()
-        risk_amount = equity * (self.p.risk_per_trade_pct / 100)
         risk_per_unit = abs(entry_price - stop_loss)
-
         if risk_per_unit <= 0:
             return 0
 
-        size = risk_amount / risk_per_unit
-
-        # Cap at max position percentage
-        max_size = (equity * (self.p.max_position_pct / 100)) / entry_price
-        size = min(size, max_size)
-
-        # Ensure we have enough cash
-        max_affordable = self.broker.get_cash() / entry_price
-        size = min(size, max_affordable * 0.99)
-
-        return size
+        broker = self.broker
+        equity = broker.getvalue()
+        return min(
+            (equity * self._risk_frac) / risk_per_unit,
+            (equity * self._max_position_frac) / entry_price,
+            (broker.get_cash() / entry_price) * 0.99,
+        )
 
     def _enter_long(self, price, candle_range):
         """Enter long position with calculated TP/SL levels."""
@@ -258,23 +287,26 @@ class SolStrategyV11(bt.Strategy):
         self.buy(size=size)
 
         self.entry_price = price
-        self.position_type = 'long'
+        self.position_type = LONG
+        self._side_sign = 1.0
+        self._signed_stop = self.stop_loss
+        self._signed_target = self.take_profit
         self.initial_size = size
         self.last_trade_bar = len(self.data15)
 
-        dt = self.data15.datetime.datetime(0)
-        risk_pct = (sl_distance / price) * 100
-        reward_pct = (effective_range / price) * 100
-        print(f"[{dt}] {self.market_state.upper()} LONG @ {price:.2f} | "
-              f"SL: {self.stop_loss:.2f} ({risk_pct:.1f}%) | "
-              f"TP: {self.take_profit:.2f} ({reward_pct:.1f}%) | "
-              f"R:R {params['rr_ratio']:.1f}")
+        if self._verbose:
+            risk_pct = (sl_distance / price) * 100
+            reward_pct = (effective_range / price) * 100
+            print(f"[{self._fmt_dt(self.data15.datetime[0])}] {MARKET_STATE_NAMES[self.market_state].upper()} LONG @ {price:.2f} | "
+                  f"SL: {self.stop_loss:.2f} ({risk_pct:.1f}%) | "
+                  f"TP: {self.take_profit:.2f} ({reward_pct:.1f}%) | "
+                  f"R:R {params['rr_ratio']:.1f}")
 
         # Snapshot market context for trade journal
         prev_range_pct = (candle_range / price * 100) if price > 0 else 0
         self._entry_context = {
-            "market_state": self.market_state,
-            "trade_mode": self.trade_mode,
+            "market_state": MARKET_STATE_NAMES[self.market_state],
+            "trade_mode": TRADE_MODE_NAMES[self.trade_mode],
             "prev_4h_range_pct": round(prev_range_pct, 2),
             "rr_ratio": params['rr_ratio'],
         }
@@ -303,23 +335,26 @@ class SolStrategyV11(bt.Strategy):
         self.sell(size=size)
 
         self.entry_price = price
-        self.position_type = 'short'
+        self.position_type = SHORT
+        self._side_sign = -1.0
+        self._signed_stop = -self.stop_loss
+        self._signed_target = -self.take_profit
         self.initial_size = size
         self.last_trade_bar = len(self.data15)
 
-        dt = self.data15.datetime.datetime(0)
-        risk_pct = (sl_distance / price) * 100
-        reward_pct = (effective_range / price) * 100
-        print(f"[{dt}] {self.market_state.upper()} SHORT @ {price:.2f} | "
-              f"SL: {self.stop_loss:.2f} ({risk_pct:.1f}%) | "
-              f"TP: {self.take_profit:.2f} ({reward_pct:.1f}%) | "
-              f"R:R {params['rr_ratio']:.1f}")
+        if self._verbose:
+            risk_pct = (sl_distance / price) * 100
+            reward_pct = (effective_range / price) * 100
+            print(f"[{self._fmt_dt(self.data15.datetime[0])}] {MARKET_STATE_NAMES[self.market_state].upper()} SHORT @ {price:.2f} | "
+                  f"SL: {self.stop_loss:.2f} ({risk_pct:.1f}%) | "
+                  f"TP: {self.take_profit:.2f} ({reward_pct:.1f}%) | "
+                  f"R:R {params['rr_ratio']:.1f}")
 
         # Snapshot market context for trade journal
         prev_range_pct = (candle_range / price * 100) if price > 0 else 0
         self._entry_context = {
-            "market_state": self.market_state,
-            "trade_mode": self.trade_mode,
+            "market_state": MARKET_STATE_NAMES[self.market_state],
+            "trade_mode": TRADE_MODE_NAMES[self.trade_mode],
             "prev_4h_range_pct": round(prev_range_pct, 2),
             "rr_ratio": params['rr_ratio'],
         }
@@ -330,37 +365,26 @@ class SolStrategyV11(bt.Strategy):
             return
 
         current_price = self.data15.close[0]
-        dt = self.data15.datetime.datetime(0)
-
-        if self.position_type == 'long':
-            if current_price <= self.stop_loss:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                print(f"[{dt}] LONG STOP LOSS @ {current_price:.2f} ({pnl_pct:+.1f}%)")
-                self.close()
-                self._reset_position()
-                return
-
-            if current_price >= self.take_profit:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                print(f"[{dt}] LONG TAKE PROFIT @ {current_price:.2f} ({pnl_pct:+.1f}%)")
-                self.close()
-                self._reset_position()
-                return
+        # Negating is exact, so for shorts price >= stop is -price <= -stop
+        signed_price = self._side_sign * current_price
+        if signed_price <= self._signed_stop:
+            exit_label = "STOP LOSS"
+        elif signed_price >= self._signed_target:
+            exit_label = "TAKE PROFIT"
+        else:
+            return
 
-        elif self.position_type == 'short':
-            if current_price >= self.stop_loss:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                print(f"[{dt}] SHORT STOP LOSS @ {current_price:.2f} ({pnl_pct:+.1f}%)")
-                self.close()
-                self._reset_position()
-                return
+        if self._verbose:
+            side = "LONG" if self.position_type == LONG else "SHORT"
+            pnl_pct = (self._side_sign * (current_price - self.entry_price) / self.entry_price) * 100
+            print(f"[{self._fmt_dt(self.data15.datetime[0])}] {side} {exit_label} @ {current_price:.2f} ({pnl_pct:+.1f}%)")
+        self.close()
+        self._reset_position()
 
-            if current_price <= self.take_profit:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                print(f"[{dt}] SHORT TAKE PROFIT @ {current_price:.2f} ({pnl_pct:+.1f}%)")
-                self.close()
-                self._reset_position()
-                return
+    @staticmethod
+    def _fmt_dt(dt_raw):
+        """Format a raw backtrader datetime float; only called on verbose runs."""
+        return bt.num2date(dt_raw)
 
     def _reset_position(self):
         """Reset all position tracking variables."""
@@ -370,16 +394,25 @@ class SolStrategyV11(bt.Strategy):
         self.initial_size = None
         self.stop_loss = None
         self.take_profit = None
+        self._side_sign = None
+        self._signed_stop = None
+        self._signed_target = None
 
     def notify_order(self, order):
-        if order.status in [order.Completed]:
+        if order.status in [order.Canceled, order.Margin, order.Rejected]:
+            # Entry never filled: drop the tracked levels so entries resume
+            if not self.position:
+                self._reset_position()
+            return
+        if not self._verbose:
+            return
+        if order.status == order.Completed:
             if order.isbuy():
-                action = "BUY" if self.position_type == 'long' else "COVER"
-                print(f"    {action} EXECUTED @ {order.executed.price:.2f}, Size: {order.executed.size:.4f}")
+                action = "BUY" if self.position_type == LONG else "COVER"
             else:
-                action = "SELL" if self.position_type == 'short' else "SELL"
-                print(f"    {action} EXECUTED @ {order.executed.price:.2f}, Size: {order.executed.size:.4f}")
+                action = "SELL"
+            print(f"    {action} EXECUTED @ {order.executed.price:.2f}, Size: {order.executed.size:.4f}")
 
     def notify_trade(self, trade):
-        if trade.isclosed:
+        if trade.isclosed and self._verbose:
             print(f"    TRADE CLOSED - PnL: Gross={trade.pnl:.2f}, Net={trade.pnlcomm:.2f}")
@@ -23,28 +23,80 @@ Data feeds (expected index order):
   4 -> daily (unused)
 """
 
+import math
+from collections import deque
+
 import backtrader as bt
 import backtrader.indicators as btind
 
 
+class RollingExtreme(bt.Indicator):
+    """
+    Streaming `period`-bar max (mode='max') or min (mode='min').
+
+    Keeps a monotonic deque of (bar, value) candidates, so each bar costs
+    amortized O(1) instead of rescanning the window like btind.Highest/Lowest.
+    """
+    lines = ('extreme',)
+    params = (
+        ('period', 12),
+        ('mode', 'max'),
+    )
+
+    def __init__(self):
+        self.addminperiod(self.p.period)
+        self._window = deque()
+        self._is_max = self.p.mode == 'max'
+
+    def prenext(self):
+        self._push()
+
+    def next(self):
+        self._push()
+        self.lines.extreme[0] = self._window[0][1]
+
+    def _push(self):
+        bar = len(self)
+        value = self.data[0]
+        window = self._window
+        # Drop candidates the new value dominates, then any that left the window
+        if self._is_max:
+            while window and window[-1][1] <= value:
+                window.pop()
+        else:
+            while window and window[-1][1] >= value:
+                window.pop()
+        window.append((bar, value))
+        if window[0][0] <= bar - self.p.period:
+            window.popleft()
+
+
 class OBV(bt.Indicator):
-    """On-Balance Volume indicator (custom implementation)."""
+    """
+    On-Balance Volume indicator (custom implementation).
+
+    The first bar seeds OBV with its volume. Each later bar adds its volume
+    on an up close, subtracts it on a down close, and carries it on a flat
+    one.
+    """
     lines = ('obv',)
     params = ()
 
     def __init__(self):
         self.addminperiod(2)
 
+    def prenext(self):
+        # With a minperiod of 2, next() first runs on the second bar, so the
+        # seed has to be written here or every later value builds on NaN
+        self.lines.obv[0] = self.data.volume[0]
+
     def next(self):
-        if len(self) == 1:
-            self.lines.obv[0] = self.data.volume[0]
+        if self.data.close[0] > self.data.close[-1]:
+            self.lines.obv[0] = self.lines.obv[-1] + self.data.volume[0]
+        elif self.data.close[0] < self.data.close[-1]:
+            self.lines.obv[0] = self.lines.obv[-1] - self.data.volume[0]
         else:
-            if self.data.close[0] > self.data.close[-1]:
-                self.lines.obv[0] = self.lines.obv[-1] + self.data.volume[0]
-            elif self.data.close[0] < self.data.close[-1]:
-                self.lines.obv[0] = self.lines.obv[-1] - self.data.volume[0]
-            else:
-                self.lines.obv[0] = self.lines.obv[-1]
+            self.lines.obv[0] = self.lines.obv[-1]
 
 
 class SolStrategyV13(bt.Strategy):
@@ -101,6 +153,9 @@ class SolStrategyV13(bt.Strategy):
 
         # Cooldown
         ('cooldown_bars', 8),         # 15m bars between trades
+
+        # Logging
+        ('verbose', False),           # Print entries, exits and fills
     )
 
     def __init__(self):
@@ -116,9 +171,13 @@ class SolStrategyV13(bt.Strategy):
         self.vol_sma_15m = btind.SMA(self.data15.volume, period=self.p.vol_sma_period)
         self.vol_sma_4h = btind.SMA(self.data4h.volume, period=self.p.vol_sma_period)
 
-        # OBV indicator (custom implementation)
-        self.obv_4h = OBV(self.data4h)
-        self.obv_ema = btind.EMA(self.obv_4h.obv, period=self.p.obv_ema_period)
+        # OBV indicator (custom implementation), only built when the filter
+        # that reads it is on
+        if self.p.use_obv_filter:
+            self.obv_4h = OBV(self.data4h)
+            self.obv_ema = btind.EMA(self.obv_4h.obv, period=self.p.obv_ema_period)
+        else:
+            self.obv_4h = self.obv_ema = None
 
         # ATR for dynamic stops
         self.atr_4h = btind.ATR(self.data4h, period=self.p.atr_period)
@@ -126,9 +185,30 @@ class SolStrategyV13(bt.Strategy):
         # RSI (lenient filter)
         self.rsi_15m = btind.RSI(self.data15.close, period=self.p.rsi_period)
 
-        # Track recent high/low for optional pullback detection
-        self.recent_high = btind.Highest(self.data15.high, period=12)
-        self.recent_low = btind.Lowest(self.data15.low, period=12)
+        # Track recent high/low for optional pullback detection, only built
+        # when the filter that reads them is on
+        if not self.p.use_pullback_filter:
+            self.recent_high = self.recent_low = None
+            self._recent_high_arr = self._recent_low_arr = None
+        else:
+            self.recent_high = RollingExtreme(self.data15.high, period=12, mode='max')
+            self.recent_low = RollingExtreme(self.data15.low, period=12, mode='min')
+            self._recent_high_arr = self.recent_high.lines[0].array
+            self._recent_low_arr = self.recent_low.lines[0].array
+
+        # Raw line buffers for the per-bar reads. array[len(clock) - 1] is the
+        # current value, without the LineSeries -> LineBuffer __getitem__
+        # chain behind indicator[0]
+        self._ema_fast_arr = self.ema_fast_4h.lines[0].array
+        self._ema_slow_arr = self.ema_slow_4h.lines[0].array
+        self._atr_arr = self.atr_4h.lines[0].array
+        self._close15_arr = self.data15.close.array
+        self._vol15_arr = self.data15.volume.array
+        self._vol_sma15_arr = self.vol_sma_15m.lines[0].array
+        self._rsi_arr = self.rsi_15m.lines[0].array
+        if self.obv_4h is not None:
+            self._obv_arr = self.obv_4h.obv.array
+            self._obv_ema_arr = self.obv_ema.lines[0].array
 
         # Position tracking
         self.entry_price = None
@@ -139,17 +219,27 @@ class SolStrategyV13(bt.Strategy):
         self.low_water_mark = None
         self.partial_taken = False
         self.position_size = None
+        self._profit_level = None      # Nearest fixed-TP / partial trigger (see _next_profit_level)
 
         # Bar tracking
         self.last_trade_bar = -999
         self.last_15m_len = 0
+        self._bar_dt = None            # This bar's datetime, converted on first log (see _dt)
+        self._i4 = self._i15 = 0       # Current 4H/15m array index, set by next() for the helpers
+        self._verbose = self.p.verbose
 
     def next(self):
+        self._bar_dt = None
+        n4h = len(self.data4h)
+        n15 = len(self.data15)
+
         # Need enough data for indicators
-        if len(self.data4h) < max(self.p.ema_slow, self.p.atr_period, self.p.obv_ema_period) + 1:
+        if n4h < max(self.p.ema_slow, self.p.atr_period, self.p.obv_ema_period) + 1:
             return
-        if len(self.data15) < max(self.p.rsi_period, self.p.vol_sma_period) + 12:
+        if n15 < max(self.p.rsi_period, self.p.vol_sma_period) + 12:
             return
+        self._i4 = n4h - 1
+        self._i15 = n15 - 1
 
         # If in position, check exits
         if self.position and self.position_type is not None:
@@ -157,12 +247,12 @@ class SolStrategyV13(bt.Strategy):
             return
 
         # Only check entries on new 15m bar
-        if len(self.data15) == self.last_15m_len:
+        if n15 == self.last_15m_len:
             return
-        self.last_15m_len = len(self.data15)
+        self.last_15m_len = n15
 
         # Check cooldown
-        if len(self.data15) - self.last_trade_bar < self.p.cooldown_bars:
+        if n15 - self.last_trade_bar < self.p.cooldown_bars:
             return
 
         # Determine 4H trend
@@ -178,8 +268,9 @@ class SolStrategyV13(bt.Strategy):
         Determine 4H trend based on EMA crossover and strength.
         Returns 'up', 'down', or None.
         """
-        ema_fast = self.ema_fast_4h[0]
-        ema_slow = self.ema_slow_4h[0]
+        i4 = self._i4
+        ema_fast = self._ema_fast_arr[i4]
+        ema_slow = self._ema_slow_arr[i4]
 
         if ema_slow == 0:
             return None
@@ -198,8 +289,9 @@ class SolStrategyV13(bt.Strategy):
         if not self.p.require_volume_confirm:
             return True
 
-        current_vol = self.data15.volume[0]
-        avg_vol = self.vol_sma_15m[0]
+        i15 = self._i15
+        current_vol = self._vol15_arr[i15]
+        avg_vol = self._vol_sma15_arr[i15]
 
         if avg_vol == 0:
             return True
@@ -208,10 +300,11 @@ class SolStrategyV13(bt.Strategy):
 
     def _obv_confirms_trend(self, direction):
         """Check if OBV confirms trend direction."""
-        if not self.p.use_obv_filter:
+        if self.obv_4h is None:
             return True
 
-        obv_above_ema = self.obv_4h.obv[0] > self.obv_ema[0]
+        i4 = self._i4
+        obv_above_ema = self._obv_arr[i4] > self._obv_ema_arr[i4]
 
         if direction == 'up':
             return obv_above_ema
@@ -223,17 +316,19 @@ class SolStrategyV13(bt.Strategy):
         if not self.p.use_pullback_filter:
             return True
 
+        i15 = self._i15
         if trend == 'up':
-            pullback_threshold = self.recent_high[0] * (1 - self.p.pullback_pct / 100)
+            pullback_threshold = self._recent_high_arr[i15] * (1 - self.p.pullback_pct / 100)
             return current_price <= pullback_threshold
         else:
-            rally_threshold = self.recent_low[0] * (1 + self.p.pullback_pct / 100)
+            rally_threshold = self._recent_low_arr[i15] * (1 + self.p.pullback_pct / 100)
             return current_price >= rally_threshold
 
     def _check_entry(self, trend):
         """Check for entry signals - less restrictive than V12."""
-        current_price = self.data15.close[0]
-        rsi = self.rsi_15m[0]
+        i15 = self._i15
+        current_price = self._close15_arr[i15]
+        rsi = self._rsi_arr[i15]
 
         # 1. RSI filter (lenient - just avoid extremes against trend)
         if trend == 'up' and rsi > self.p.rsi_overbought:
@@ -262,7 +357,8 @@ class SolStrategyV13(bt.Strategy):
     def _enter_long(self, price):
         """Enter long position with ATR-based stops."""
         # Get ATR for stop calculation
-        self.entry_atr = self.atr_4h[0] if self.atr_4h[0] > 0 else None
+        atr = self._atr_arr[self._i4]
+        self.entry_atr = atr if atr > 0 else None
 
         # Calculate initial stop
         if self.entry_atr:
@@ -287,23 +383,28 @@ class SolStrategyV13(bt.Strategy):
         self.high_water_mark = price
         self.partial_taken = False
         self.position_size = size
-        self.last_trade_bar = len(self.data15)
+        self._profit_level = self._next_profit_level()
+        self.last_trade_bar = self._i15 + 1
 
         # Calculate display values
-        vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
-        obv_status = "BULL" if self.obv_4h.obv[0] > self.obv_ema[0] else "BEAR"
+        if self._verbose:
+            vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
+            if self.obv_4h is None:
+                obv_status = "N/A"
+            else:
+                obv_status = "BULL" if self.obv_4h.obv[0] > self.obv_ema[0] else "BEAR"
 
-        dt = self.data15.datetime.datetime(0)
-        atr_str = f"{self.entry_atr:.2f}" if self.entry_atr else "N/A"
-        print(f"[{dt}] LONG @ {price:.2f} | "
-              f"ATR: {atr_str} | "
-              f"Init SL: {self.initial_stop:.2f} | "
-              f"Vol: {vol_ratio:.1f}x | OBV: {obv_status} | RSI: {self.rsi_15m[0]:.1f}")
+            atr_str = f"{self.entry_atr:.2f}" if self.entry_atr else "N/A"
+            print(f"[{self._dt()}] LONG @ {price:.2f} | "
+                  f"ATR: {atr_str} | "
+                  f"Init SL: {self.initial_stop:.2f} | "
+                  f"Vol: {vol_ratio:.1f}x | OBV: {obv_status} | RSI: {self._rsi_arr[self._i15]:.1f}")
 
     def _enter_short(self, price):
         """Enter short position with ATR-based stops."""
         # Get ATR for stop calculation
-        self.entry_atr = self.atr_4h[0] if self.atr_4h[0] > 0 else None
+        atr = self._atr_arr[self._i4]
+        self.entry_atr = atr if atr > 0 else None
 
         # Calculate initial stop
         if self.entry_atr:
@@ -328,32 +429,37 @@ class SolStrategyV13(bt.Strategy):
         self.low_water_mark = price
         self.partial_taken = False
         self.position_size = size
-        self.last_trade_bar = len(self.data15)
+        self._profit_level = self._next_profit_level()
+        self.last_trade_bar = self._i15 + 1
 
         # Calculate display values
-        vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
-        obv_status = "BULL" if self.obv_4h.obv[0] > self.obv_ema[0] else "BEAR"
+        if self._verbose:
+            vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
+            if self.obv_4h is None:
+                obv_status = "N/A"
+            else:
+                obv_status = "BULL" if self.obv_4h.obv[0] > self.obv_ema[0] else "BEAR"
 
-        dt = self.data15.datetime.datetime(0)
-        atr_str = f"{self.entry_atr:.2f}" if self.entry_atr else "N/A"
-        print(f"[{dt}] SHORT @ {price:.2f} | "
-              f"ATR: {atr_str} | "
-              f"Init SL: {self.initial_stop:.2f} | "
-              f"Vol: {vol_ratio:.1f}x | OBV: {obv_status} | RSI: {self.rsi_15m[0]:.1f}")
+            atr_str = f"{self.entry_atr:.2f}" if self.entry_atr else "N/A"
+            print(f"[{self._dt()}] SHORT @ {price:.2f} | "
+                  f"ATR: {atr_str} | "
+                  f"Init SL: {self.initial_stop:.2f} | "
+                  f"Vol: {vol_ratio:.1f}x | OBV: {obv_status} | RSI: {self._rsi_arr[self._i15]:.1f}")
 
     def _check_exits(self):
         """Check all exit conditions with ATR trailing stops."""
         if self.entry_price is None:
             return
 
-        current_price = self.data15.close[0]
-        dt = self.data15.datetime.datetime(0)
+        current_price = self._close15_arr[self._i15]
 
         # Update high/low water marks
         if self.position_type == 'long':
-            self.high_water_mark = max(self.high_water_mark, current_price)
+            if current_price > self.high_water_mark:
+                self.high_water_mark = current_price
         else:
-            self.low_water_mark = min(self.low_water_mark, current_price)
+            if current_price < self.low_water_mark:
+                self.low_water_mark = current_price
 
         # Calculate ATR-based trailing stop
         if self.entry_atr and self.entry_atr > 0:
@@ -364,14 +470,20 @@ class SolStrategyV13(bt.Strategy):
         # Calculate active stop level
         if self.position_type == 'long':
             trailing_stop = self.high_water_mark - trailing_distance
-            active_stop = max(trailing_stop, self.initial_stop)
+            active_stop = trailing_stop if trailing_stop >= self.initial_stop else self.initial_stop
+
+            # Between the stop and the nearest profit trigger nothing can
+            # fire: a volume climax only tightens the stop to 1% below price
+            if active_stop < current_price < self._profit_level:
+                return
 
             # Check fixed TP if enabled
             if self.p.use_fixed_tp:
                 tp_price = self.entry_price * (1 + self.p.fixed_tp_pct / 100)
                 if current_price >= tp_price:
-                    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                    print(f"[{dt}] LONG TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                    if self._verbose:
+                        pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
+                        print(f"[{self._dt()}] LONG TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                     self.close()
                     self._reset()
                     return
@@ -386,34 +498,43 @@ class SolStrategyV13(bt.Strategy):
                 if current_price >= partial_target:
                     self._take_partial_profit(current_price, 'long')
                     # Move stop to breakeven after partial
-                    self.initial_stop = max(self.initial_stop, self.entry_price)
-                    active_stop = max(active_stop, self.entry_price)
+                    if self.entry_price > self.initial_stop:
+                        self.initial_stop = self.entry_price
+                    if self.entry_price > active_stop:
+                        active_stop = self.entry_price
 
             # Check volume climax exit
             if self.p.use_volume_exit and self._volume_climax_detected():
                 # Tighten stop significantly
-                active_stop = max(active_stop, current_price * 0.99)
+                tightened = current_price * 0.99
+                if tightened > active_stop:
+                    active_stop = tightened
 
             # Check stop hit
             if current_price <= active_stop:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                exit_type = "TRAILING STOP" if active_stop > self.initial_stop else "INITIAL STOP"
-                print(f"[{dt}] LONG {exit_type} @ {current_price:.2f} ({pnl_pct:+.2f}%) | "
-                      f"HWM: {self.high_water_mark:.2f}")
+                if self._verbose:
+                    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
+                    exit_type = "TRAILING STOP" if active_stop > self.initial_stop else "INITIAL STOP"
+                    print(f"[{self._dt()}] LONG {exit_type} @ {current_price:.2f} ({pnl_pct:+.2f}%) | "
+                          f"HWM: {self.high_water_mark:.2f}")
                 self.close()
                 self._reset()
                 return
 
         elif self.position_type == 'short':
             trailing_stop = self.low_water_mark + trailing_distance
-            active_stop = min(trailing_stop, self.initial_stop)
+            active_stop = trailing_stop if trailing_stop <= self.initial_stop else self.initial_stop
+
+            if self._profit_level < current_price < active_stop:
+                return
 
             # Check fixed TP if enabled
             if self.p.use_fixed_tp:
                 tp_price = self.entry_price * (1 - self.p.fixed_tp_pct / 100)
                 if current_price <= tp_price:
-                    pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                    print(f"[{dt}] SHORT TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                    if self._verbose:
+                        pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
+                        print(f"[{self._dt()}] SHORT TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                     self.close()
                     self._reset()
                     return
@@ -428,31 +549,66 @@ class SolStrategyV13(bt.Strategy):
                 if current_price <= partial_target:
                     self._take_partial_profit(current_price, 'short')
                     # Move stop to breakeven after partial
-                    self.initial_stop = min(self.initial_stop, self.entry_price)
-                    active_stop = min(active_stop, self.entry_price)
+                    if self.entry_price < self.initial_stop:
+                        self.initial_stop = self.entry_price
+                    if self.entry_price < active_stop:
+                        active_stop = self.entry_price
 
             # Check volume climax exit
             if self.p.use_volume_exit and self._volume_climax_detected():
                 # Tighten stop significantly
-                active_stop = min(active_stop, current_price * 1.01)
+                tightened = current_price * 1.01
+                if tightened < active_stop:
+                    active_stop = tightened
 
             # Check stop hit
             if current_price >= active_stop:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                exit_type = "TRAILING STOP" if active_stop < self.initial_stop else "INITIAL STOP"
-                print(f"[{dt}] SHORT {exit_type} @ {current_price:.2f} ({pnl_pct:+.2f}%) | "
-                      f"LWM: {self.low_water_mark:.2f}")
+                if self._verbose:
+                    pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
+                    exit_type = "TRAILING STOP" if active_stop < self.initial_stop else "INITIAL STOP"
+                    print(f"[{self._dt()}] SHORT {exit_type} @ {current_price:.2f} ({pnl_pct:+.2f}%) | "
+                          f"LWM: {self.low_water_mark:.2f}")
                 self.close()
                 self._reset()
                 return
 
+    def _next_profit_level(self):
+        """
+        Price at which the next fixed TP or pending partial fires.
+
+        Uses the same expressions as _check_exits. Returns +/-inf when
+        neither can fire, so the in-corridor test never skips on it.
+        """
+        if self.position_type == 'long':
+            level = math.inf
+            if self.p.use_fixed_tp:
+                level = self.entry_price * (1 + self.p.fixed_tp_pct / 100)
+            if self.p.use_partial_profits and not self.partial_taken:
+                if self.entry_atr:
+                    partial_target = self.entry_price + (self.entry_atr * self.p.partial_target_atr_mult)
+                else:
+                    partial_target = self.entry_price * (1 + self.p.fixed_tp_pct / 200)
+                level = min(level, partial_target)
+        else:
+            level = -math.inf
+            if self.p.use_fixed_tp:
+                level = self.entry_price * (1 - self.p.fixed_tp_pct / 100)
+            if self.p.use_partial_profits and not self.partial_taken:
+                if self.entry_atr:
+                    partial_target = self.entry_price - (self.entry_atr * self.p.partial_target_atr_mult)
+                else:
+                    partial_target = self.entry_price * (1 - self.p.fixed_tp_pct / 200)
+                level = max(level, partial_target)
+        return level
+
     def _volume_climax_detected(self):
         """Detect volume climax that may signal reversal."""
         if not self.p.use_volume_exit:
             return False
 
-        current_vol = self.data15.volume[0]
-        avg_vol = self.vol_sma_15m[0]
+        i15 = self._i15
+        current_vol = self._vol15_arr[i15]
+        avg_vol = self._vol_sma15_arr[i15]
 
         if avg_vol == 0:
             return False
@@ -460,9 +616,10 @@ class SolStrategyV13(bt.Strategy):
         # Check for volume spike
         if current_vol > avg_vol * self.p.vol_climax_mult:
             # Check if price stalled despite big volume
-            if len(self.data15) > 1:
+            if i15 > 0:
+                close = self._close15_arr
                 price_change_pct = abs(
-                    (self.data15.close[0] - self.data15.close[-1]) / self.data15.close[-1] * 100
+                    (close[i15] - close[i15 - 1]) / close[i15 - 1] * 100
                 )
                 if price_change_pct < self.p.price_stall_pct:
                     return True
@@ -485,10 +642,17 @@ class SolStrategyV13(bt.Strategy):
 
         self.partial_taken = True
         self.position_size = self.position_size - partial_size
+        self._profit_level = self._next_profit_level()
+
+        if self._verbose:
+            print(f"[{self._dt()}] PARTIAL PROFIT ({self.p.partial_sell_ratio*100:.0f}%) @ {current_price:.2f} "
+                  f"({pnl_pct:+.2f}%)")
 
-        dt = self.data15.datetime.datetime(0)
-        print(f"[{dt}] PARTIAL PROFIT ({self.p.partial_sell_ratio*100:.0f}%) @ {current_price:.2f} "
-              f"({pnl_pct:+.2f}%)")
+    def _dt(self):
+        """Current 15m bar's datetime, converted at most once per bar."""
+        if self._bar_dt is None:
+            self._bar_dt = self.data15.datetime.datetime(0)
+        return self._bar_dt
 
     def _reset(self):
         """Reset position tracking."""
@@ -500,12 +664,15 @@ class SolStrategyV13(bt.Strategy):
         self.low_water_mark = None
         self.partial_taken = False
         self.position_size = None
+        self._profit_level = None
 
     def notify_order(self, order):
+        if not self._verbose:
+            return
         if order.status in [order.Completed]:
             action = "BUY" if order.isbuy() else "SELL"
             print(f"    {action} EXECUTED @ {order.executed.price:.2f}, Size: {order.executed.size:.4f}")
 
     def notify_trade(self, trade):
-        if trade.isclosed:
+        if trade.isclosed and self._verbose:
             print(f"    TRADE CLOSED - PnL: {trade.pnlcomm:.2f}")
@@ -50,6 +50,9 @@ class SolStrategyV14(bt.Strategy):
 
         # Cooldown (prevent rapid re-entry)
         ('cooldown_bars', 4),
+
+        # Logging
+        ('verbose', False),          # Print entries, exits and fills
     )
 
     def __init__(self):
@@ -65,15 +68,20 @@ class SolStrategyV14(bt.Strategy):
         self.ema_fast_15m = btind.EMA(self.data15.close, period=self.p.entry_ema_fast)
         self.ema_slow_15m = btind.EMA(self.data15.close, period=self.p.entry_ema_slow)
 
-        # 15M Crossover signals
-        self.crossover_15m = btind.CrossOver(self.ema_fast_15m, self.ema_slow_15m)
-
         # Volume
         self.vol_sma_15m = btind.SMA(self.data15.volume, period=self.p.vol_sma_period)
 
         # ATR for stops (15M timeframe)
         self.atr_15m = btind.ATR(self.data15, period=self.p.atr_period)
 
+        # Raw line buffers for the per-bar reads; array[len(clock) - 1] is
+        # the current value
+        self._ema_fast4h_arr = self.ema_fast_4h.lines[0].array
+        self._ema_slow4h_arr = self.ema_slow_4h.lines[0].array
+        self._ema_fast15_arr = self.ema_fast_15m.lines[0].array
+        self._ema_slow15_arr = self.ema_slow_15m.lines[0].array
+        self._atr_arr = self.atr_15m.lines[0].array
+
         # Position tracking
         self.entry_price = None
         self.position_type = None
@@ -83,17 +91,34 @@ class SolStrategyV14(bt.Strategy):
         # Bar tracking
         self.last_trade_bar = -999
         self.last_15m_len = 0
+        self._verbose = self.p.verbose
+
+        # 15M crossover state: last non-zero EMA spread, as btind.CrossOver tracks it
+        self._last_diff = None
+        self._diff_len = 0
+        self._crossed_up = False
+        self._crossed_dn = False
 
     def next(self):
+        n4h = len(self.data4h)
+        n15 = len(self.data15)
+
         # Need enough data
-        if len(self.data4h) < self.p.ema_slow + 1:
+        if n4h < self.p.ema_slow + 1:
             return
-        if len(self.data15) < max(self.p.entry_ema_slow, self.p.atr_period, self.p.vol_sma_period) + 1:
+        if n15 < max(self.p.entry_ema_slow, self.p.atr_period, self.p.vol_sma_period) + 1:
             return
 
+        # Track the 15M crossover on every bar, even while in a position
+        if n15 != self._diff_len:
+            self._update_crossover(n15)
+
         # Determine 4H trend
-        uptrend_4h = self.ema_fast_4h[0] > self.ema_slow_4h[0]
-        downtrend_4h = self.ema_fast_4h[0] < self.ema_slow_4h[0]
+        i4 = n4h - 1
+        ema_fast_4h = self._ema_fast4h_arr[i4]
+        ema_slow_4h = self._ema_slow4h_arr[i4]
+        uptrend_4h = ema_fast_4h > ema_slow_4h
+        downtrend_4h = ema_fast_4h < ema_slow_4h
 
         # If in position, check exits
         if self.position:
@@ -101,21 +126,52 @@ class SolStrategyV14(bt.Strategy):
             return
 
         # Only check entries on new 15m bar
-        if len(self.data15) == self.last_15m_len:
+        if n15 == self.last_15m_len:
             return
-        self.last_15m_len = len(self.data15)
+        self.last_15m_len = n15
 
         # Check cooldown
-        if len(self.data15) - self.last_trade_bar < self.p.cooldown_bars:
+        if n15 - self.last_trade_bar < self.p.cooldown_bars:
             return
 
         # Check entry conditions
-        self._check_entry(uptrend_4h, downtrend_4h)
-
-    def _check_entry(self, uptrend_4h, downtrend_4h):
+        self._check_entry(n15 - 1, uptrend_4h, downtrend_4h)
+
+    def _update_crossover(self, n15):
+        """
+        Flag 15M EMA crossovers from the sign of the spread.
+
+        Mirrors btind.CrossOver: a cross needs the last non-zero spread on the
+        other side, so touching without crossing doesn't signal. When next()
+        skipped bars (4H warm-up) the last non-zero spread is read back from
+        the EMA lines.
+        """
+        i = n15 - 1
+        fast_arr = self._ema_fast15_arr
+        slow_arr = self._ema_slow15_arr
+        prev = self._last_diff
+        if n15 != self._diff_len + 1 or prev is None:
+            # The first bar with both EMAs seeds the spread even if it is zero
+            seed = max(self.p.entry_ema_fast, self.p.entry_ema_slow) - 1
+            j = i - 1
+            while True:
+                prev = fast_arr[j] - slow_arr[j]
+                if prev or j <= seed:
+                    break
+                j -= 1
+
+        fast = fast_arr[i]
+        slow = slow_arr[i]
+        diff = fast - slow
+        self._crossed_up = prev < 0.0 and fast > slow
+        self._crossed_dn = prev > 0.0 and fast < slow
+        self._last_diff = diff if diff else prev
+        self._diff_len = n15
+
+    def _check_entry(self, i15, uptrend_4h, downtrend_4h):
         """Check for entry signals based on 15M crossover + 4H trend + volume."""
         current_price = self.data15.close[0]
-        atr = self.atr_15m[0]
+        atr = self._atr_arr[i15]
 
         # Volume confirmation
         high_volume = True
@@ -123,11 +179,11 @@ class SolStrategyV14(bt.Strategy):
             high_volume = self.data15.volume[0] > self.vol_sma_15m[0]
 
         # Long signal: 15M bullish crossover + 4H uptrend + volume
-        if self.crossover_15m[0] > 0 and uptrend_4h and high_volume:
+        if self._crossed_up and uptrend_4h and high_volume:
             self._enter_long(current_price, atr)
 
         # Short signal: 15M bearish crossunder + 4H downtrend + volume
-        elif self.crossover_15m[0] < 0 and downtrend_4h and high_volume:
+        elif self._crossed_dn and downtrend_4h and high_volume:
             self._enter_short(current_price, atr)
 
     def _enter_long(self, price, atr):
@@ -151,11 +207,11 @@ class SolStrategyV14(bt.Strategy):
         self.position_type = 'long'
         self.last_trade_bar = len(self.data15)
 
-        dt = self.data15.datetime.datetime(0)
-        vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
-        print(f"[{dt}] LONG @ {price:.2f} | "
-              f"SL: {self.stop_loss:.2f} | TP: {self.take_profit:.2f} | "
-              f"ATR: {atr:.2f} | Vol: {vol_ratio:.1f}x")
+        if self._verbose:
+            vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
+            print(f"[{self.data15.datetime.datetime(0)}] LONG @ {price:.2f} | "
+                  f"SL: {self.stop_loss:.2f} | TP: {self.take_profit:.2f} | "
+                  f"ATR: {atr:.2f} | Vol: {vol_ratio:.1f}x")
 
     def _enter_short(self, price, atr):
         """Enter short position with ATR-based TP/SL."""
@@ -178,11 +234,11 @@ class SolStrategyV14(bt.Strategy):
         self.position_type = 'short'
         self.last_trade_bar = len(self.data15)
 
-        dt = self.data15.datetime.datetime(0)
-        vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
-        print(f"[{dt}] SHORT @ {price:.2f} | "
-              f"SL: {self.stop_loss:.2f} | TP: {self.take_profit:.2f} | "
-              f"ATR: {atr:.2f} | Vol: {vol_ratio:.1f}x")
+        if self._verbose:
+            vol_ratio = self.data15.volume[0] / self.vol_sma_15m[0] if self.vol_sma_15m[0] > 0 else 0
+            print(f"[{self.data15.datetime.datetime(0)}] SHORT @ {price:.2f} | "
+                  f"SL: {self.stop_loss:.2f} | TP: {self.take_profit:.2f} | "
+                  f"ATR: {atr:.2f} | Vol: {vol_ratio:.1f}x")
 
     def _check_exits(self, uptrend_4h, downtrend_4h):
         """Check TP/SL and trend reversal exits."""
@@ -190,29 +246,31 @@ class SolStrategyV14(bt.Strategy):
             return
 
         current_price = self.data15.close[0]
-        dt = self.data15.datetime.datetime(0)
 
         if self.position_type == 'long':
             # Check TP
             if current_price >= self.take_profit:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                print(f"[{dt}] LONG TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] LONG TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
 
             # Check SL
             if current_price <= self.stop_loss:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                print(f"[{dt}] LONG SL HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] LONG SL HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
 
             # Check trend reversal exit
             if self.p.exit_on_trend_reversal and not uptrend_4h:
-                pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
-                print(f"[{dt}] LONG TREND REVERSAL EXIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] LONG TREND REVERSAL EXIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
@@ -220,24 +278,27 @@ class SolStrategyV14(bt.Strategy):
         elif self.position_type == 'short':
             # Check TP
             if current_price <= self.take_profit:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                print(f"[{dt}] SHORT TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] SHORT TP HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
 
             # Check SL
             if current_price >= self.stop_loss:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                print(f"[{dt}] SHORT SL HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] SHORT SL HIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
 
             # Check trend reversal exit
             if self.p.exit_on_trend_reversal and not downtrend_4h:
-                pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
-                print(f"[{dt}] SHORT TREND REVERSAL EXIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
+                if self._verbose:
+                    pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
+                    print(f"[{self.data15.datetime.datetime(0)}] SHORT TREND REVERSAL EXIT @ {current_price:.2f} ({pnl_pct:+.2f}%)")
                 self.close()
                 self._reset()
                 return
@@ -250,10 +311,12 @@ class SolStrategyV14(bt.Strategy):
         self.take_profit = None
 
     def notify_order(self, order):
+        if not self._verbose:
+            return
         if order.status in [order.Completed]:
             action = "BUY" if order.isbuy() else "SELL"
             print(f"    {action} EXECUTED @ {order.executed.price:.2f}, Size: {order.executed.size:.4f}")
 
     def notify_trade(self, trade):
-        if trade.isclosed:
+        if trade.isclosed and self._verbose:
             print(f"    TRADE CLOSED - PnL: {trade.pnlcomm:.2f}")
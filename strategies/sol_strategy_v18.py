@@ -161,7 +161,7 @@ class SolStrategyV18(bt.Strategy):
         self.low_water_mark = None
 
         # Calculate R-targets
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'long')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, True)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -211,7 +211,7 @@ class SolStrategyV18(bt.Strategy):
         self.high_water_mark = None
 
         # Calculate R-targets
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'short')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, False)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -270,7 +270,7 @@ class SolStrategyV18(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'long')
+                        self.entry_price, self.stop_distance, self.partials_taken, True)
                     print(f"[{dt}] LONG PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, selling {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -281,7 +281,7 @@ class SolStrategyV18(bt.Strategy):
         if current_price <= self.current_stop:
             pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'long')
+                self.entry_price, current_price, self.stop_distance, True)
             reason = "STOP (-1R)" if self.partials_taken == 0 else f"RATCHET STOP (after {self.partials_taken}R)"
             print(f"[{dt}] LONG {reason} @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R)")
             self.close()
@@ -296,7 +296,7 @@ class SolStrategyV18(bt.Strategy):
             if current_price <= effective_stop:
                 pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
                 r_mult = self.risk_mgr.calculate_r_multiple(
-                    self.entry_price, current_price, self.stop_distance, 'long')
+                    self.entry_price, current_price, self.stop_distance, True)
                 print(f"[{dt}] LONG RUNNER TRAIL @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R) | "
                       f"HWM: {self.high_water_mark:.2f}")
                 self.close()
@@ -320,7 +320,7 @@ class SolStrategyV18(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'short')
+                        self.entry_price, self.stop_distance, self.partials_taken, False)
                     print(f"[{dt}] SHORT PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, selling {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -331,7 +331,7 @@ class SolStrategyV18(bt.Strategy):
         if current_price >= self.current_stop:
             pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short')
+                self.entry_price, current_price, self.stop_distance, False)
             reason = "STOP (-1R)" if self.partials_taken == 0 else f"RATCHET STOP (after {self.partials_taken}R)"
             print(f"[{dt}] SHORT {reason} @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R)")
             self.close()
@@ -346,7 +346,7 @@ class SolStrategyV18(bt.Strategy):
             if current_price >= effective_stop:
                 pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
                 r_mult = self.risk_mgr.calculate_r_multiple(
-                    self.entry_price, current_price, self.stop_distance, 'short')
+                    self.entry_price, current_price, self.stop_distance, False)
                 print(f"[{dt}] SHORT RUNNER TRAIL @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R) | "
                       f"LWM: {self.low_water_mark:.2f}")
                 self.close()
@@ -363,12 +363,12 @@ class SolStrategyV18(bt.Strategy):
         if self.position_type == 'long':
             pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'long') if self.stop_distance else 0
+                self.entry_price, current_price, self.stop_distance, True) if self.stop_distance else 0
             print(f"[{dt}] LONG {reason} @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R)")
         elif self.position_type == 'short':
             pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short') if self.stop_distance else 0
+                self.entry_price, current_price, self.stop_distance, False) if self.stop_distance else 0
             print(f"[{dt}] SHORT {reason} @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R)")
 
         self.close()
@@ -225,7 +225,7 @@ class SolStrategyV19(bt.Strategy):
         self.low_water_mark = None
 
         # Calculate R-targets
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'long')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, True)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -272,7 +272,7 @@ class SolStrategyV19(bt.Strategy):
         self.high_water_mark = None
 
         # Calculate R-targets for short
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'short')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, False)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -343,7 +343,7 @@ class SolStrategyV19(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'long')
+                        self.entry_price, self.stop_distance, self.partials_taken, True)
                     print(f"[{dt}] LONG PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, selling {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -361,7 +361,7 @@ class SolStrategyV19(bt.Strategy):
         if current_price <= effective_stop:
             pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'long')
+                self.entry_price, current_price, self.stop_distance, True)
             if self.partials_taken == 0:
                 reason = "STOP (-1R)"
             elif self.partials_taken >= 3:
@@ -411,7 +411,7 @@ class SolStrategyV19(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'short')
+                        self.entry_price, self.stop_distance, self.partials_taken, False)
                     print(f"[{dt}] SHORT PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, covering {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -430,7 +430,7 @@ class SolStrategyV19(bt.Strategy):
         if current_price >= effective_stop:
             pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short')
+                self.entry_price, current_price, self.stop_distance, False)
             if self.partials_taken == 0:
                 reason = "STOP (-1R)"
             elif self.partials_taken >= 3:
@@ -453,7 +453,7 @@ class SolStrategyV19(bt.Strategy):
 
         pnl_pct = ((current_price - self.entry_price) / self.entry_price) * 100
         r_mult = self.risk_mgr.calculate_r_multiple(
-            self.entry_price, current_price, self.stop_distance, 'long') if self.stop_distance else 0
+            self.entry_price, current_price, self.stop_distance, True) if self.stop_distance else 0
         print(f"[{dt}] LONG {reason} @ {current_price:.2f} ({pnl_pct:+.2f}%, {r_mult:+.1f}R)")
 
         self.close()
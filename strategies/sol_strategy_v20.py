@@ -302,7 +302,7 @@ class SolStrategyV20(bt.Strategy):
         self.pattern_label = pattern_label
 
         # Calculate R-targets for short
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, stop_distance, 'short')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, stop_distance, False)
         self.current_stop = self.r_targets[-1]  # stop_price
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -348,7 +348,7 @@ class SolStrategyV20(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'short')
+                        self.entry_price, self.stop_distance, self.partials_taken, False)
                     print(f"[{dt}] SHORT PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, covering {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -369,7 +369,7 @@ class SolStrategyV20(bt.Strategy):
         if current_price >= effective_stop:
             pnl_pct = ((self.entry_price - current_price) / self.entry_price) * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short')
+                self.entry_price, current_price, self.stop_distance, False)
             if self.partials_taken == 0:
                 reason = "STOP (-1R)"
             elif self.partials_taken >= 3:
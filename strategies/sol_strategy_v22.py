@@ -228,7 +228,7 @@ class SolStrategyV22(bt.Strategy):
         self.partials_taken = 0
         self.high_water_mark = price
 
-        self.r_targets    = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'long')
+        self.r_targets    = self.risk_mgr.calculate_r_targets(price, self.stop_distance, True)
         self.current_stop = self.r_targets[-1]
 
         dt = self.data15.datetime.datetime(0)
@@ -269,7 +269,7 @@ class SolStrategyV22(bt.Strategy):
         self.partials_taken = 0
         self.low_water_mark = price
 
-        self.r_targets    = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'short')
+        self.r_targets    = self.risk_mgr.calculate_r_targets(price, self.stop_distance, False)
         self.current_stop = self.r_targets[-1]
 
         dt = self.data15.datetime.datetime(0)
@@ -322,7 +322,7 @@ class SolStrategyV22(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'long')
+                        self.entry_price, self.stop_distance, self.partials_taken, True)
                     print(f"[{dt}] LONG PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, selling {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -338,7 +338,7 @@ class SolStrategyV22(bt.Strategy):
 
         if current_price <= effective_stop:
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'long')
+                self.entry_price, current_price, self.stop_distance, True)
             if self.partials_taken == 0:
                 reason = "STOP (-1R)"
             elif self.partials_taken >= 3:
@@ -366,7 +366,7 @@ class SolStrategyV22(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'short')
+                        self.entry_price, self.stop_distance, self.partials_taken, False)
                     print(f"[{dt}] SHORT PARTIAL {self.partials_taken}/3 @ {current_price:.2f} "
                           f"(+{r_mult:.0f}R, covering {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.2f}")
@@ -382,7 +382,7 @@ class SolStrategyV22(bt.Strategy):
 
         if current_price >= effective_stop:
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short')
+                self.entry_price, current_price, self.stop_distance, False)
             if self.partials_taken == 0:
                 reason = "STOP (-1R)"
             elif self.partials_taken >= 3:
@@ -304,7 +304,7 @@ class SolStrategyV8Fast(bt.Strategy):
         self.initial_size = size
         self.partials_taken = 0
 
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'long')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, True)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -360,7 +360,7 @@ class SolStrategyV8Fast(bt.Strategy):
         self.initial_size = size
         self.partials_taken = 0
 
-        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, 'short')
+        self.r_targets = self.risk_mgr.calculate_r_targets(price, self.stop_distance, False)
         self.current_stop = self.r_targets[-1]
 
         risk_amt = equity * self.risk_mgr.risk_pct
@@ -419,7 +419,7 @@ class SolStrategyV8Fast(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'long')
+                        self.entry_price, self.stop_distance, self.partials_taken, True)
                     print(f"[{dt}] LONG PARTIAL {self.partials_taken}/3 @ {current_price:.4f} "
                           f"(+{r_mult:.0f}R, selling {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.4f}")
@@ -430,7 +430,7 @@ class SolStrategyV8Fast(bt.Strategy):
         if current_price <= self.current_stop:
             pnl_pct = (current_price - self.entry_price) / self.entry_price * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'long')
+                self.entry_price, current_price, self.stop_distance, True)
             reason = "LONG STOP" if self.partials_taken == 0 else f"LONG RATCHET STOP (after {self.partials_taken}R)"
             print(f"[{dt}] {reason} @ {current_price:.4f} ({pnl_pct:+.1f}%, {r_mult:+.1f}R)")
             self.sell(size=self.position.size)
@@ -448,7 +448,7 @@ class SolStrategyV8Fast(bt.Strategy):
             if current_price <= effective_stop:
                 pnl_pct = (current_price - self.entry_price) / self.entry_price * 100
                 r_mult = self.risk_mgr.calculate_r_multiple(
-                    self.entry_price, current_price, self.stop_distance, 'long')
+                    self.entry_price, current_price, self.stop_distance, True)
                 print(f"[{dt}] LONG RUNNER TRAIL @ {current_price:.4f} "
                       f"({pnl_pct:+.1f}%, {r_mult:+.1f}R) | HWM: {self.high_water_mark:.4f}")
                 self.sell(size=self.position.size)
@@ -473,7 +473,7 @@ class SolStrategyV8Fast(bt.Strategy):
                 if partial_size > 0:
                     self.partials_taken = i + 1
                     self.current_stop = self.risk_mgr.get_stop_for_level(
-                        self.entry_price, self.stop_distance, self.partials_taken, 'short')
+                        self.entry_price, self.stop_distance, self.partials_taken, False)
                     print(f"[{dt}] SHORT PARTIAL {self.partials_taken}/3 @ {current_price:.4f} "
                           f"(+{r_mult:.0f}R, buying {fraction:.0%}) | "
                           f"New stop: {self.current_stop:.4f}")
@@ -484,7 +484,7 @@ class SolStrategyV8Fast(bt.Strategy):
         if current_price >= self.current_stop:
             pnl_pct = (self.entry_price - current_price) / self.entry_price * 100
             r_mult = self.risk_mgr.calculate_r_multiple(
-                self.entry_price, current_price, self.stop_distance, 'short')
+                self.entry_price, current_price, self.stop_distance, False)
             reason = "SHORT STOP" if self.partials_taken == 0 else f"SHORT RATCHET STOP (after {self.partials_taken}R)"
             print(f"[{dt}] {reason} @ {current_price:.4f} ({pnl_pct:+.1f}%, {r_mult:+.1f}R)")
             self.buy(size=abs(self.position.size))
@@ -503,7 +503,7 @@ class SolStrategyV8Fast(bt.Strategy):
             if current_price >= effective_stop:
                 pnl_pct = (self.entry_price - current_price) / self.entry_price * 100
                 r_mult = self.risk_mgr.calculate_r_multiple(
-                    self.entry_price, current_price, self.stop_distance, 'short')
+                    self.entry_price, current_price, self.stop_distance, False)
                 print(f"[{dt}] SHORT RUNNER TRAIL @ {current_price:.4f} "
                       f"({pnl_pct:+.1f}%, {r_mult:+.1f}R) | LWM: {self.low_water_mark:.4f}")
                 self.buy(size=abs(self.position.size))
@@ -22,7 +22,42 @@ Data feeds (expected index order):
   4 → daily (range detection, prev day high/low)
 """
 
+from dataclasses import dataclass
+from typing import Optional
+
 import backtrader as bt
+import numpy as np
+
+# One row per closed trade: fill prices plus the levels planned at entry
+TRADE_LEVELS_DTYPE = np.dtype([
+    ('entry', 'f8'),
+    ('sl', 'f8'),
+    ('tp1', 'f8'),
+    ('tp2', 'f8'),
+    ('tp3', 'f8'),
+    ('exit', 'f8'),
+    ('is_long', '?'),
+])
+
+
+@dataclass(slots=True)
+class V9Position:
+    """Open-position state, slotted because _check_exits reads it every 15m bar."""
+    entry_price: Optional[float] = None
+    position_type: Optional[str] = None    # 'long' or 'short'
+    initial_size: Optional[float] = None   # Original position size
+    remaining_size: Optional[float] = None  # Current position size after partials
+
+    # TP/SL levels
+    stop_loss: Optional[float] = None
+    tp1_price: Optional[float] = None
+    tp2_price: Optional[float] = None
+    tp3_price: Optional[float] = None
+    next_tp: Optional[float] = None        # Nearest target not yet hit
+
+    # TP hit tracking
+    tp1_hit: bool = False
+    tp2_hit: bool = False
 
 
 class SolStrategyV9(bt.Strategy):
@@ -47,6 +82,9 @@ class SolStrategyV9(bt.Strategy):
 
         # Position sizing
         ('position_pct', 0.98),          # % of cash to use per trade
+
+        # Logging
+        ('verbose', False),              # Print entries, exits and fills
     )
 
     def __init__(self):
@@ -59,21 +97,22 @@ class SolStrategyV9(bt.Strategy):
         self.prev_day_high = None
         self.prev_day_low = None
 
-        # Position state
-        self.entry_price = None
-        self.position_type = None      # 'long' or 'short'
-        self.initial_size = None       # Original position size
-        self.remaining_size = None     # Current position size after partials
+        # Entry levels derived from the previous day (refreshed once per day)
+        self.day_range = None
+        self.day_buffer = None
+        self.low_threshold = None
+        self.high_threshold = None
+
+        # Range classification only changes on a new daily bar
+        self.ranging = False
 
-        # TP/SL levels
-        self.stop_loss = None
-        self.tp1_price = None
-        self.tp2_price = None
-        self.tp3_price = None
+        # Param-derived fractions (params are fixed for the whole run)
+        self._approach = self.p.approach_pct / 100
+        self._target_buffer = self.p.target_buffer_pct / 100
+        self._position_pct = self.p.position_pct
 
-        # TP hit tracking
-        self.tp1_hit = False
-        self.tp2_hit = False
+        # Position state (slotted, see V9Position)
+        self.pos_state = V9Position()
 
         # Track bar counts for new bar detection
         self.last_daily_len = 0
@@ -82,6 +121,10 @@ class SolStrategyV9(bt.Strategy):
         # Trade cooldown tracking
         self.last_trade_bar = -999  # Hourly bar count of last trade
 
+        # Levels of the open trade, moved to the closed list by notify_trade
+        self._open_levels = None
+        self._closed_levels = []
+
     def next(self):
         # Need enough daily data for trend detection
         if len(self.daily) < self.p.trend_lookback + 2:
@@ -93,10 +136,15 @@ class SolStrategyV9(bt.Strategy):
             # Previous day's high/low (index -1 is the prior completed bar)
             self.prev_day_high = self.daily.high[-1]
             self.prev_day_low = self.daily.low[-1]
+            self.day_range = self.prev_day_high - self.prev_day_low
+            self.day_buffer = self.day_range * self._target_buffer
+            self.low_threshold = self.prev_day_low * (1 + self._approach)
+            self.high_threshold = self.prev_day_high * (1 - self._approach)
+            self.ranging = self._is_ranging()
 
         # If in position, check exits on every 15m bar
         # Also verify we have valid position tracking (not just pending close)
-        if self.position and self.position_type is not None:
+        if self.position and self.pos_state.position_type is not None:
             self._check_exits()
             return
 
@@ -106,7 +154,7 @@ class SolStrategyV9(bt.Strategy):
         self.last_hourly_len = len(self.data1h)
 
         # Check if market is ranging (not trending)
-        if not self._is_ranging():
+        if not self.ranging:
             return
 
         # Check for entry signals
@@ -117,51 +165,38 @@ class SolStrategyV9(bt.Strategy):
         Returns True if market is ranging (not in a clear trend).
         Ranging = NOT (3 consecutive HH/HL) AND NOT (3 consecutive LH/LL)
         """
-        n = self.p.trend_lookback
-
-        # Get daily highs and lows for trend detection
-        highs = [self.daily.high[-i] for i in range(n + 1)]  # [today, -1, -2, -3]
-        lows = [self.daily.low[-i] for i in range(n + 1)]
+        high = self.daily.high
+        low = self.daily.low
 
-        # Reverse so index 0 is oldest
-        highs = highs[::-1]  # [oldest, ..., newest]
-        lows = lows[::-1]
-
-        # Check for uptrend: 3 consecutive higher highs AND higher lows
+        # Compare each day with the one before it, newest first; stop as
+        # soon as both an uptrend and a downtrend have been ruled out
         uptrend = True
-        for i in range(1, len(highs)):
-            if highs[i] <= highs[i-1] or lows[i] <= lows[i-1]:
-                uptrend = False
-                break
-
-        # Check for downtrend: 3 consecutive lower highs AND lower lows
         downtrend = True
-        for i in range(1, len(highs)):
-            if highs[i] >= highs[i-1] or lows[i] >= lows[i-1]:
+        for i in range(self.p.trend_lookback):
+            h, prev_h = high[-i], high[-i - 1]
+            l, prev_l = low[-i], low[-i - 1]
+            if h <= prev_h or l <= prev_l:
+                uptrend = False
+            if h >= prev_h or l >= prev_l:
                 downtrend = False
-                break
+            if not uptrend and not downtrend:
+                return True
 
         # Ranging if neither uptrend nor downtrend
-        is_range = not uptrend and not downtrend
-
-        return is_range
+        return not uptrend and not downtrend
 
     def _check_entry(self):
         """Check for long/short entry signals near previous day's high/low."""
-        if self.prev_day_high is None or self.prev_day_low is None:
+        day_range = self.day_range
+        if day_range is None:
             return
 
         # Check cooldown
-        bars_since_trade = len(self.data1h) - self.last_trade_bar
-        if bars_since_trade < self.p.cooldown_bars:
+        data1h = self.data1h
+        if len(data1h) - self.last_trade_bar < self.p.cooldown_bars:
             return
 
-        current_price = self.data1h.close[0]
-        approach_threshold = self.p.approach_pct / 100
-
-        # Calculate range and effective target with buffer
-        day_range = self.prev_day_high - self.prev_day_low
-        buffer = day_range * (self.p.target_buffer_pct / 100)
+        current_price = data1h.close[0]
 
         # Check minimum range requirement
         range_pct = (day_range / current_price) * 100
@@ -169,15 +204,13 @@ class SolStrategyV9(bt.Strategy):
             return
 
         # Check for LONG entry: price near previous day low
-        low_threshold = self.prev_day_low * (1 + approach_threshold)
-        if current_price <= low_threshold:
-            self._enter_long(current_price, day_range, buffer)
+        if current_price <= self.low_threshold:
+            self._enter_long(current_price, day_range, self.day_buffer)
             return
 
         # Check for SHORT entry: price near previous day high
-        high_threshold = self.prev_day_high * (1 - approach_threshold)
-        if current_price >= high_threshold:
-            self._enter_short(current_price, day_range, buffer)
+        if current_price >= self.high_threshold:
+            self._enter_short(current_price, day_range, self.day_buffer)
             return
 
     def _enter_long(self, price, day_range, buffer):
@@ -191,29 +224,32 @@ class SolStrategyV9(bt.Strategy):
 
         # Calculate levels using R:R ratio
         sl_distance = effective_range / self.p.rr_ratio
-        self.stop_loss = price - sl_distance
-        self.tp1_price = price + (effective_range / 3)
-        self.tp2_price = price + (effective_range * 2 / 3)
-        self.tp3_price = effective_target
+        st = self.pos_state
+        st.stop_loss = price - sl_distance
+        st.tp1_price = price + (effective_range / 3)
+        st.tp2_price = price + (effective_range * 2 / 3)
+        st.tp3_price = effective_target
+        st.next_tp = st.tp1_price
 
         # Position sizing
-        cash = self.broker.get_cash()
-        size = (cash * self.p.position_pct) / price
+        size = (self.broker.get_cash() * self._position_pct) / price
 
         self.buy(size=size)
 
-        self.entry_price = price
-        self.position_type = 'long'
-        self.initial_size = size
-        self.remaining_size = size
-        self.tp1_hit = False
-        self.tp2_hit = False
+        st.entry_price = price
+        st.position_type = 'long'
+        st.initial_size = size
+        st.remaining_size = size
+        st.tp1_hit = False
+        st.tp2_hit = False
         self.last_trade_bar = len(self.data1h)
+        self._open_levels = (st.stop_loss, st.tp1_price, st.tp2_price,
+                             st.tp3_price, True, size)
 
-        dt = self.data1h.datetime.datetime(0)
-        print(f"[{dt}] LONG ENTRY @ {price:.4f} | "
-              f"SL: {self.stop_loss:.4f} | TP1: {self.tp1_price:.4f} | "
-              f"TP2: {self.tp2_price:.4f} | TP3: {self.tp3_price:.4f}")
+        if self.p.verbose:
+            print(f"[{self._fmt_dt(self.data1h.datetime[0])}] LONG ENTRY @ {price:.4f} | "
+                  f"SL: {st.stop_loss:.4f} | TP1: {st.tp1_price:.4f} | "
+                  f"TP2: {st.tp2_price:.4f} | TP3: {st.tp3_price:.4f}")
 
     def _enter_short(self, price, day_range, buffer):
         """Enter short position with calculated TP/SL levels."""
@@ -226,129 +262,174 @@ class SolStrategyV9(bt.Strategy):
 
         # Calculate levels using R:R ratio
         sl_distance = effective_range / self.p.rr_ratio
-        self.stop_loss = price + sl_distance
-        self.tp1_price = price - (effective_range / 3)
-        self.tp2_price = price - (effective_range * 2 / 3)
-        self.tp3_price = effective_target
+        st = self.pos_state
+        st.stop_loss = price + sl_distance
+        st.tp1_price = price - (effective_range / 3)
+        st.tp2_price = price - (effective_range * 2 / 3)
+        st.tp3_price = effective_target
+        st.next_tp = st.tp1_price
 
         # Position sizing
-        cash = self.broker.get_cash()
-        size = (cash * self.p.position_pct) / price
+        size = (self.broker.get_cash() * self._position_pct) / price
 
         self.sell(size=size)
 
-        self.entry_price = price
-        self.position_type = 'short'
-        self.initial_size = size
-        self.remaining_size = size
-        self.tp1_hit = False
-        self.tp2_hit = False
+        st.entry_price = price
+        st.position_type = 'short'
+        st.initial_size = size
+        st.remaining_size = size
+        st.tp1_hit = False
+        st.tp2_hit = False
         self.last_trade_bar = len(self.data1h)
+        self._open_levels = (st.stop_loss, st.tp1_price, st.tp2_price,
+                             st.tp3_price, False, size)
 
-        dt = self.data1h.datetime.datetime(0)
-        print(f"[{dt}] SHORT ENTRY @ {price:.4f} | "
-              f"SL: {self.stop_loss:.4f} | TP1: {self.tp1_price:.4f} | "
-              f"TP2: {self.tp2_price:.4f} | TP3: {self.tp3_price:.4f}")
+        if self.p.verbose:
+            print(f"[{self._fmt_dt(self.data1h.datetime[0])}] SHORT ENTRY @ {price:.4f} | "
+                  f"SL: {st.stop_loss:.4f} | TP1: {st.tp1_price:.4f} | "
+                  f"TP2: {st.tp2_price:.4f} | TP3: {st.tp3_price:.4f}")
 
     def _check_exits(self):
         """Check for stop loss and take profit exits."""
         # Safety check - ensure we have valid position data
-        if self.initial_size is None or self.position_type is None:
+        st = self.pos_state
+        if st.initial_size is None or st.position_type is None:
             return
 
         current_price = self.data15.close[0]
-        dt = self.data15.datetime.datetime(0)
+        stop_loss = st.stop_loss
+
+        # Fast path: price strictly between the stop and the nearest target
+        # means no level can fire on this bar
+        if st.position_type == 'long':
+            if stop_loss < current_price < st.next_tp:
+                return
+        elif st.next_tp < current_price < stop_loss:
+            return
+
+        verbose = self.p.verbose
+        dt_raw = self.data15.datetime[0]
 
-        partial_size = self.initial_size / 3
+        partial_size = st.initial_size / 3
 
-        if self.position_type == 'long':
+        if st.position_type == 'long':
             # Check stop loss
-            if current_price <= self.stop_loss:
-                print(f"[{dt}] LONG STOP LOSS @ {current_price:.4f}")
+            if current_price <= stop_loss:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] LONG STOP LOSS @ {current_price:.4f}")
                 self.close()
                 self._reset_position()
                 return
 
             # Check TP3 (full exit)
-            if current_price >= self.tp3_price:
-                print(f"[{dt}] LONG TP3 HIT @ {current_price:.4f} - Closing remaining")
+            if current_price >= st.tp3_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] LONG TP3 HIT @ {current_price:.4f} - Closing remaining")
                 self.close()
                 self._reset_position()
                 return
 
             # Check TP2
-            if not self.tp2_hit and current_price >= self.tp2_price:
-                print(f"[{dt}] LONG TP2 HIT @ {current_price:.4f} - Selling 33.3%, SL → TP1")
+            if not st.tp2_hit and current_price >= st.tp2_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] LONG TP2 HIT @ {current_price:.4f} - Selling 33.3%, SL → TP1")
                 self.sell(size=partial_size)
-                self.remaining_size -= partial_size
-                self.stop_loss = self.tp1_price  # Move SL to TP1
-                self.tp2_hit = True
+                st.remaining_size -= partial_size
+                st.stop_loss = st.tp1_price  # Move SL to TP1
+                st.tp2_hit = True
+                st.next_tp = st.tp3_price if st.tp1_hit else st.tp1_price
                 return
 
             # Check TP1
-            if not self.tp1_hit and current_price >= self.tp1_price:
-                print(f"[{dt}] LONG TP1 HIT @ {current_price:.4f} - Selling 33.3%, SL → Entry")
+            if not st.tp1_hit and current_price >= st.tp1_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] LONG TP1 HIT @ {current_price:.4f} - Selling 33.3%, SL → Entry")
                 self.sell(size=partial_size)
-                self.remaining_size -= partial_size
-                self.stop_loss = self.entry_price  # Move SL to breakeven
-                self.tp1_hit = True
+                st.remaining_size -= partial_size
+                st.stop_loss = st.entry_price  # Move SL to breakeven
+                st.tp1_hit = True
+                st.next_tp = st.tp3_price if st.tp2_hit else st.tp2_price
                 return
 
-        elif self.position_type == 'short':
+        elif st.position_type == 'short':
             # Check stop loss
-            if current_price >= self.stop_loss:
-                print(f"[{dt}] SHORT STOP LOSS @ {current_price:.4f}")
+            if current_price >= stop_loss:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] SHORT STOP LOSS @ {current_price:.4f}")
                 self.close()
                 self._reset_position()
                 return
 
             # Check TP3 (full exit)
-            if current_price <= self.tp3_price:
-                print(f"[{dt}] SHORT TP3 HIT @ {current_price:.4f} - Closing remaining")
+            if current_price <= st.tp3_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] SHORT TP3 HIT @ {current_price:.4f} - Closing remaining")
                 self.close()
                 self._reset_position()
                 return
 
             # Check TP2
-            if not self.tp2_hit and current_price <= self.tp2_price:
-                print(f"[{dt}] SHORT TP2 HIT @ {current_price:.4f} - Buying 33.3%, SL → TP1")
+            if not st.tp2_hit and current_price <= st.tp2_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] SHORT TP2 HIT @ {current_price:.4f} - Buying 33.3%, SL → TP1")
                 self.buy(size=partial_size)
-                self.remaining_size -= partial_size
-                self.stop_loss = self.tp1_price  # Move SL to TP1
-                self.tp2_hit = True
+                st.remaining_size -= partial_size
+                st.stop_loss = st.tp1_price  # Move SL to TP1
+                st.tp2_hit = True
+                st.next_tp = st.tp3_price if st.tp1_hit else st.tp1_price
                 return
 
             # Check TP1
-            if not self.tp1_hit and current_price <= self.tp1_price:
-                print(f"[{dt}] SHORT TP1 HIT @ {current_price:.4f} - Buying 33.3%, SL → Entry")
+            if not st.tp1_hit and current_price <= st.tp1_price:
+                if verbose:
+                    print(f"[{self._fmt_dt(dt_raw)}] SHORT TP1 HIT @ {current_price:.4f} - Buying 33.3%, SL → Entry")
                 self.buy(size=partial_size)
-                self.remaining_size -= partial_size
-                self.stop_loss = self.entry_price  # Move SL to breakeven
-                self.tp1_hit = True
+                st.remaining_size -= partial_size
+                st.stop_loss = st.entry_price  # Move SL to breakeven
+                st.tp1_hit = True
+                st.next_tp = st.tp3_price if st.tp2_hit else st.tp2_price
                 return
 
+    @staticmethod
+    def _fmt_dt(dt_raw):
+        """Format a raw backtrader datetime float; only called on verbose runs."""
+        return bt.num2date(dt_raw)
+
     def _reset_position(self):
         """Reset all position tracking variables."""
-        self.entry_price = None
-        self.position_type = None
-        self.initial_size = None
-        self.remaining_size = None
-        self.stop_loss = None
-        self.tp1_price = None
-        self.tp2_price = None
-        self.tp3_price = None
-        self.tp1_hit = False
-        self.tp2_hit = False
+        self.pos_state = V9Position()
 
     def notify_order(self, order):
+        if not self.p.verbose:
+            return
         if order.status in [order.Completed]:
             if order.isbuy():
-                action = "BUY" if self.position_type == 'long' else "COVER"
+                action = "BUY" if self.pos_state.position_type == 'long' else "COVER"
                 print(f"    {action} EXECUTED @ {order.executed.price:.4f}, Size: {order.executed.size:.4f}")
             else:
-                action = "SELL" if self.position_type == 'short' else "SELL"
+                action = "SELL" if self.pos_state.position_type == 'short' else "SELL"
                 print(f"    {action} EXECUTED @ {order.executed.price:.4f}, Size: {order.executed.size:.4f}")
 
     def notify_trade(self, trade):
-        if trade.isclosed:
+        if not trade.isclosed:
+            return
+        if self._open_levels is not None:
+            sl, tp1, tp2, tp3, is_long, size = self._open_levels
+            # Size-weighted average exit across partials
+            move = trade.pnl / size
+            exit_price = trade.price + move if is_long else trade.price - move
+            self._closed_levels.append(
+                (trade.price, sl, tp1, tp2, tp3, exit_price, is_long))
+            self._open_levels = None
+        if self.p.verbose:
             print(f"    TRADE CLOSED - PnL: Gross={trade.pnl:.2f}, Net={trade.pnlcomm:.2f}")
+
+    def trade_levels(self):
+        """Closed trades as a record array (TRADE_LEVELS_DTYPE)."""
+        return np.array(self._closed_levels, dtype=TRADE_LEVELS_DTYPE).view(np.recarray)
+
+    def r_multiples(self):
+        """R-multiple of every closed trade, measured against the initial stop."""
+        log = self.trade_levels()
+        move = np.where(log.is_long, log.exit - log.entry, log.entry - log.exit)
+        return move / np.abs(log.entry - log.sl)
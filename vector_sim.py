@@ -0,0 +1,1282 @@
+# vector_sim.py
+"""
+Vectorized Strategy Simulation
+------------------------------
+Array-based re-implementations of strategy logic for fast parameter sweeps.
+
+Backtrader calls next() once per 15m bar, and for simple price-level
+strategies the per-bar attribute lookups cost far more than the handful of
+comparisons the strategy actually makes. The functions here preload the OHLC
+data into NumPy arrays, compute the entry signals for the whole history in a
+few vectorized passes, and only walk the position lifecycle sequentially.
+
+The simulation mirrors the strategy's signal logic and run_backtest()'s
+broker setup: orders fill at the next 15m bar's open, commission is charged
+on notional per fill, and the hourly/4h/daily bars reproduce the resampled
+feeds cerebro hands the strategy (see prepare_bars).
+`python backtest.py -s v9 --parity` checks that the trades still match a
+cerebro run.
+Use it to rank parameter sets quickly; confirm the winners with a normal
+backtest.
+
+Usage:
+    from backtest import load_data
+    from vector_sim import prepare_bars, simulate_v9, simulate_v11, simulate_v14
+
+    bars = prepare_bars(load_data())
+    result = simulate_v9(bars, approach_pct=1.0, rr_ratio=3.0)
+    rows = sweep_v9(bars, [{'rr_ratio': 2.0}, {'rr_ratio': 3.0}])
+    result = simulate_v11(bars, range_rr_ratio=3.5)
+    result = simulate_v14(bars, stop_multiplier=2.0)
+    rows = sweep_v14(bars, [{'atr_period': 10}, {'atr_period': 20}])
+"""
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:  # numba is optional; exits fall back to chunked NumPy searches
+    HAS_NUMBA = False
+
+from config import BROKER, V9_PARAMS, V14_PARAMS
+from data_bundle import cerebro_buckets
+
+
+# Column order of the parameter grid passed to the sweep kernel
+V9_SWEEP_PARAMS = ('trend_lookback', 'approach_pct', 'target_buffer_pct', 'rr_ratio',
+                   'min_range_pct', 'cooldown_bars', 'position_pct')
+
+# Scalar columns of the V14 sweep grid, after the four indicator-table rows
+V14_SWEEP_SCALARS = ('stop_multiplier', 'tp_multiplier', 'exit_on_trend_reversal',
+                     'position_pct', 'cooldown_bars')
+
+# Bars MarketRegime (daily EMA(21), 4H ATR(14)) needs before cerebro calls next()
+REGIME_WARMUP_DAYS = 21
+REGIME_WARMUP_H4 = 15
+
+# V11 market states (SolStrategyV11._classify_market)
+RANGING, UPTREND, DOWNTREND = 0, 1, 2
+
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', 'i8'),
+    ('exit_bar', 'i8'),
+    ('is_long', '?'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('size', 'f8'),
+    ('pnl', 'f8'),
+])
+
+
+def _delivered_counts(index, rule):
+    """First 15m bar of each `rule` bar and how many have been delivered at every 15m bar."""
+    starts, shown = cerebro_buckets(index, rule)
+    return starts, np.searchsorted(shown, np.arange(len(index)), side='right')
+
+
+def _cerebro_days(index):
+    """
+    Daily bars as setup_cerebro_multi_tf delivers them to the strategy.
+
+    With the 15m feed taken for daily data (see data_bundle.cerebro_buckets),
+    a day is delivered on the first 15m bar of the next date, and its OHLC is
+    the single 15m bar that follows the previous delivery (bar 0 for the
+    first day), not the whole day.
+
+    Returns:
+        (rows, count): the 15m bar each daily bar holds, and the number of
+        daily bars delivered at every 15m bar
+    """
+    days = index.normalize().asi8
+    shown = np.flatnonzero(days[1:] != days[:-1]) + 1
+    rows = np.concatenate(([0], shown[:-1] + 1))
+    return rows, np.searchsorted(shown, np.arange(len(index)), side='right')
+
+
+def prepare_bars(df):
+    """
+    Convert a 15m OHLC DataFrame into the arrays the simulators consume.
+
+    Hourly, 4h and daily bars follow what run_backtest()'s cerebro feeds the
+    strategy (see data_bundle.cerebro_buckets and _cerebro_days), including
+    when each bar becomes visible. `first_bar` is the first 15m bar cerebro calls
+    next() on: run_backtest() attaches a MarketRegime to every strategy, and
+    its indicators hold next() back until they have warmed up.
+
+    Args:
+        df: DataFrame indexed by timestamp with open/high/low/close/volume
+            columns
+
+    Returns:
+        dict of NumPy arrays (15m OHLCV, hourly closes, 4h closes, 4h and
+        daily highs/lows and the number of delivered hourly/4h/daily bars at
+        every 15m bar) plus the `first_bar` index
+    """
+    index = df.index
+    n = len(df)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+
+    hour_starts, hour_count = _delivered_counts(index, 'h')
+    h4_starts, h4_count = _delivered_counts(index, '4h')
+    day_rows, day_count = _cerebro_days(index)
+
+    first_bar = max(np.searchsorted(day_count, REGIME_WARMUP_DAYS),
+                    np.searchsorted(h4_count, REGIME_WARMUP_H4))
+    return {
+        'open': df['open'].to_numpy(dtype=np.float64),
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': df['volume'].to_numpy(dtype=np.float64),
+        'hour_close': close[np.append(hour_starts[1:], n) - 1],
+        'hour_count': hour_count,
+        'h4_close': close[np.append(h4_starts[1:], n) - 1],
+        'h4_high': np.maximum.reduceat(high, h4_starts),
+        'h4_low': np.minimum.reduceat(low, h4_starts),
+        'h4_count': h4_count,
+        'day_high': high[day_rows],
+        'day_low': low[day_rows],
+        'day_count': day_count,
+        'first_bar': int(first_bar),
+    }
+
+
+def _first_cross(close, start, stop_at, stop, target, is_long, chunk=256, forced=None):
+    """
+    First bar in [start, stop_at) whose close is through the stop or the
+    target (or that is flagged in `forced`), or -1. Scans in growing chunks
+    so short trades stay cheap.
+    """
+    while start < stop_at:
+        end = min(start + chunk, stop_at)
+        seg = close[start:end]
+        if is_long:
+            hit = (seg <= stop) | (seg >= target)
+        else:
+            hit = (seg >= stop) | (seg <= target)
+        if forced is not None:
+            hit |= forced[start:end]
+        hit = np.flatnonzero(hit)
+        if len(hit):
+            return start + int(hit[0])
+        start = end
+        chunk *= 2
+    return -1
+
+
+def _v9_exits(open_, close, start, is_long, entry, stop, tp1, tp2, tp3,
+              fill, size, commission):
+    """
+    Walk one V9 position from its entry fill through SolStrategyV9._check_exits:
+    SL -> TP3 -> TP2 -> TP1, one check per 15m bar, orders filled next open.
+
+    Returns:
+        (exit_bar, net_pnl, last_fill_price); exit_bar is -1 if the position
+        is still open when the data runs out
+    """
+    sign = 1.0 if is_long else -1.0
+    third = size / 3
+    remaining = size
+    pnl = -commission * fill * size
+    exit_price = fill
+    tp1_hit = False
+    tp2_hit = False
+    for b in range(start, close.shape[0] - 1):
+        c = close[b] * sign
+        if c <= stop * sign or c >= tp3 * sign:
+            partial = remaining
+        elif not tp2_hit and c >= tp2 * sign:
+            partial = third
+            stop = tp1
+            tp2_hit = True
+        elif not tp1_hit and c >= tp1 * sign:
+            partial = third
+            stop = entry
+            tp1_hit = True
+        else:
+            continue
+        px = open_[b + 1]
+        pnl += sign * (px - fill) * partial - commission * px * partial
+        remaining -= partial
+        exit_price = px
+        if remaining <= 1e-12 * size:
+            return b + 1, pnl, exit_price
+    return -1, pnl, exit_price
+
+
+if HAS_NUMBA:
+    _v9_exits = njit(cache=True)(_v9_exits)
+else:
+    def _v9_exits(open_, close, start, is_long, entry, stop, tp1, tp2, tp3,
+                  fill, size, commission):
+        """
+        Walk one V9 position from its entry fill (see the loop version above).
+
+        Between events the state is fixed, so each event is a vectorized
+        first-hit search for close through the stop or the nearest target
+        not yet hit.
+        """
+        sign = 1.0 if is_long else -1.0
+        third = size / 3
+        remaining = size
+        pnl = -commission * fill * size
+        exit_price = fill
+        tp1_hit = tp2_hit = False
+        n_bars = len(close)
+        b = start
+        while True:
+            nearest = tp1 if not tp1_hit else (tp3 if tp2_hit else tp2)
+            b = _first_cross(close, b, n_bars - 1, stop, nearest, is_long)
+            if b < 0:
+                return -1, pnl, exit_price
+            c = close[b] * sign
+            if c <= stop * sign or c >= tp3 * sign:
+                partial = remaining
+            elif not tp2_hit and c >= tp2 * sign:
+                partial = third
+                stop = tp1
+                tp2_hit = True
+            else:
+                partial = third
+                stop = entry
+                tp1_hit = True
+            px = open_[b + 1]
+            pnl += sign * (px - fill) * partial - commission * px * partial
+            remaining -= partial
+            exit_price = px
+            b += 1
+            if remaining <= 1e-12 * size:
+                return b, pnl, exit_price
+
+
+def _run_lengths(cond):
+    """Length of the run of True values ending at each index (0 where False)."""
+    runs = np.empty(cond.shape[0], dtype=np.int64)
+    run = 0
+    for i in range(cond.shape[0]):
+        run = run + 1 if cond[i] else 0
+        runs[i] = run
+    return runs
+
+
+if HAS_NUMBA:
+    _run_lengths = njit(cache=True)(_run_lengths)
+else:
+    def _run_lengths(cond):
+        """Length of the run of True values ending at each index (0 where False)."""
+        pos = np.arange(len(cond))
+        last_false = np.maximum.accumulate(np.where(cond, -1, pos))
+        return pos - last_false
+
+
+def _v11_market_states(high, low, trend_lookback, min_trend):
+    """
+    Market state per 4H bar (RANGING/UPTREND/DOWNTREND), as
+    SolStrategyV11._classify_market() sees it with that bar as the newest
+    completed one.
+
+    The strategy counts HH/HL (LH/LL) pairs from the oldest candle of the
+    lookback window, so a trend needs the window's first min_trend pairs to
+    agree: a run of at least min_trend pairs ending (lookback - min_trend)
+    bars back.
+    """
+    n_bars = len(high)
+    states = np.full(n_bars, RANGING, dtype=np.int8)
+    if n_bars <= trend_lookback:
+        return states
+    if min_trend <= 0:
+        states[trend_lookback:] = UPTREND
+        return states
+    if min_trend > trend_lookback:
+        return states
+
+    up = np.zeros(n_bars, dtype=bool)
+    down = np.zeros(n_bars, dtype=bool)
+    up[1:] = (high[1:] > high[:-1]) & (low[1:] > low[:-1])
+    down[1:] = (high[1:] < high[:-1]) & (low[1:] < low[:-1])
+
+    lag = trend_lookback - min_trend
+    up_run = _run_lengths(up)[trend_lookback - lag:n_bars - lag]
+    down_run = _run_lengths(down)[trend_lookback - lag:n_bars - lag]
+    tail = states[trend_lookback:]
+    tail[down_run >= min_trend] = DOWNTREND
+    tail[up_run >= min_trend] = UPTREND
+    return states
+
+
+def _v9_ranging(day_high, day_low, n):
+    """
+    Per-daily-bar ranging flag, as SolStrategyV9._is_ranging() would see it
+    with that daily bar as the newest completed one.
+    """
+    ranging = np.zeros(len(day_high), dtype=bool)
+    if len(day_high) <= n:
+        return ranging
+    dh = np.diff(sliding_window_view(day_high, n + 1), axis=1)
+    dl = np.diff(sliding_window_view(day_low, n + 1), axis=1)
+    uptrend = np.all((dh > 0) & (dl > 0), axis=1)
+    downtrend = np.all((dh < 0) & (dl < 0), axis=1)
+    ranging[n:] = ~uptrend & ~downtrend
+    return ranging
+
+
+def _v9_signals(bars, trend_lookback, approach_pct, min_range_pct):
+    """
+    Entry candidates for every 15m bar.
+
+    Returns:
+        (price, long_sig, short_sig, ready) where price is the latest hourly
+        close and ready marks the bars SolStrategyV9.next() gets past its
+        warm-up checks on
+    """
+    day_count = bars['day_count']
+    hour_count = bars['hour_count']
+    day_high = bars['day_high']
+    day_low = bars['day_low']
+
+    # Daily index 0 = newest completed day, -1 = the one before it
+    cur = day_count - 1
+    prev = np.maximum(day_count - 2, 0)
+    ready = (day_count >= trend_lookback + 2) & (np.arange(len(day_count)) >= bars['first_bar'])
+
+    ranging = _v9_ranging(day_high, day_low, trend_lookback)[np.maximum(cur, 0)]
+
+    price = bars['hour_close'][np.maximum(hour_count - 1, 0)]
+    pdh = day_high[prev]
+    pdl = day_low[prev]
+    day_range = pdh - pdl
+
+    approach = approach_pct / 100
+    ok = ready & (hour_count > 0) & ranging & (day_range / price * 100 >= min_range_pct)
+    long_sig = ok & (price <= pdl * (1 + approach))
+    short_sig = ok & ~long_sig & (price >= pdh * (1 - approach))
+    return price, long_sig, short_sig, ready
+
+
+def simulate_v9(
+    bars,
+    trend_lookback=3,
+    approach_pct=0.5,
+    target_buffer_pct=1.0,
+    rr_ratio=3.0,
+    min_range_pct=1.0,
+    cooldown_bars=4,
+    position_pct=0.98,
+    cash=None,
+    commission=None,
+):
+    """
+    Simulate SolStrategyV9 (range trading off the previous day's high/low).
+
+    Parameters mirror SolStrategyV9.params.
+
+    Args:
+        bars: Output of prepare_bars()
+        cash: Starting cash (defaults to BROKER.cash)
+        commission: Commission rate on notional (defaults to BROKER.commission)
+
+    Returns:
+        dict with final_value, total_return_pct, total_trades, win_rate_pct
+        and a structured trade log (TRADE_DTYPE)
+    """
+    cash = cash or BROKER.cash
+    commission = commission or BROKER.commission
+
+    price, long_sig, short_sig, ready = _v9_signals(
+        bars, trend_lookback, approach_pct, min_range_pct)
+    entry_sig = long_sig | short_sig
+
+    open_ = bars['open']
+    close = bars['close']
+    hour_count = bars['hour_count']
+    day_high = bars['day_high']
+    day_low = bars['day_low']
+    prev_day = np.maximum(bars['day_count'] - 2, 0)
+    n_bars = len(close)
+
+    # Flat bars are only evaluated when a new hourly bar has appeared; the
+    # first ready bar counts as one (last_hourly_len starts at 0)
+    hour_bar = np.empty(n_bars, dtype=bool)
+    hour_bar[0] = True
+    hour_bar[1:] = hour_count[1:] != hour_count[:-1]
+    if ready.any():
+        hour_bar[np.argmax(ready)] = True
+    candidates = np.flatnonzero(entry_sig & hour_bar)
+
+    equity = cash
+    trades = []
+    last_hour = -1
+    last_trade_hour = -999
+    i = 0
+
+    while i < n_bars - 1:
+        # First bar after a close re-checks entries if the hour has moved on
+        if entry_sig[i] and hour_count[i] != last_hour:
+            j = i
+        else:
+            k = np.searchsorted(candidates, i, side='right')
+            if k == len(candidates):
+                break
+            j = candidates[k]
+        if j >= n_bars - 1:
+            break
+        last_hour = hour_count[j]
+        if hour_count[j] - last_trade_hour < cooldown_bars:
+            # Skip every candidate inside the cooldown in one jump
+            i = np.searchsorted(hour_count, last_trade_hour + cooldown_bars)
+            continue
+
+        # Trade levels (same arithmetic as _enter_long/_enter_short)
+        p = price[j]
+        is_long = bool(long_sig[j])
+        day_range = day_high[prev_day[j]] - day_low[prev_day[j]]
+        buffer = day_range * (target_buffer_pct / 100)
+        if is_long:
+            target = day_high[prev_day[j]] - buffer
+            eff = target - p
+        else:
+            target = day_low[prev_day[j]] + buffer
+            eff = p - target
+        if eff <= 0:
+            i = j + 1
+            continue
+
+        sign = 1.0 if is_long else -1.0
+        stop = p - sign * eff / rr_ratio
+        tp1 = p + sign * eff / 3
+        tp2 = p + sign * eff * 2 / 3
+        tp3 = target
+        size = (equity * position_pct) / p
+        last_trade_hour = hour_count[j]
+
+        entry_bar = j + 1
+        fill = open_[entry_bar]
+        exit_bar, pnl, exit_price = _v9_exits(
+            open_, close, entry_bar, is_long, p, stop, tp1, tp2, tp3,
+            fill, size, commission)
+
+        if exit_bar < 0:
+            break
+
+        equity += pnl
+        trades.append((entry_bar, exit_bar, is_long, fill, exit_price, size, pnl))
+        if equity <= 0:
+            break
+        i = exit_bar
+
+    log = np.array(trades, dtype=TRADE_DTYPE)
+    n_trades = len(log)
+    wins = int(np.count_nonzero(log['pnl'] > 0))
+    equity = float(equity)
+    return {
+        'final_value': equity,
+        'total_return_pct': (equity - cash) / cash * 100,
+        'total_trades': n_trades,
+        'win_rate_pct': wins / n_trades * 100 if n_trades else None,
+        'trades': log,
+    }
+
+
+def _v11_walk(open_, close, candidates, long_sig, long_target, short_target,
+              rr_ratio, cooldown, risk_per_trade_pct, max_position_pct, cash, commission):
+    """
+    Walk simulate_v11's entry candidates trade by trade: cooldown, risk-based
+    sizing, then hold until a close goes through the stop or target
+    (_check_exits), with both fills at the next 15m open.
+
+    Each trade consumes a candidate, so the trade columns are preallocated to
+    len(candidates) and only the first n_trades rows are valid.
+
+    Returns:
+        (n_trades, final_equity, entry_bar, exit_bar, is_long, entry_price,
+        exit_price, size, pnl), the trade columns in TRADE_DTYPE order
+    """
+    n_cand = candidates.shape[0]
+    entry_bars = np.empty(n_cand, dtype=np.int64)
+    exit_bars = np.empty(n_cand, dtype=np.int64)
+    sides = np.empty(n_cand, dtype=np.bool_)
+    entries = np.empty(n_cand)
+    exits = np.empty(n_cand)
+    sizes = np.empty(n_cand)
+    pnls = np.empty(n_cand)
+
+    equity = cash
+    n_trades = 0
+    last_trade = -999
+    k = 0
+    while k < n_cand:
+        j = candidates[k]
+        if j - last_trade < cooldown[j]:
+            k += 1
+            continue
+
+        p = close[j]
+        is_long = long_sig[j]
+        if is_long:
+            target = long_target[j]
+            stop = p - (target - p) / rr_ratio[j]
+        else:
+            target = short_target[j]
+            stop = p + (p - target) / rr_ratio[j]
+
+        # Risk-based sizing (_calculate_position_size); flat, so cash == equity
+        size = (equity * (risk_per_trade_pct / 100)) / abs(p - stop)
+        size = min(size, (equity * (max_position_pct / 100)) / p)
+        size = min(size, equity / p * 0.99)
+        last_trade = j
+
+        entry_bar = j + 1
+        b = _exit_signal_bar(close, entry_bar, stop, target, is_long)
+        if b < 0:
+            break
+
+        fill = open_[entry_bar]
+        exit_bar = b + 1
+        exit_price = open_[exit_bar]
+        sign = 1.0 if is_long else -1.0
+        pnl = (sign * (exit_price - fill) * size
+               - commission * fill * size - commission * exit_price * size)
+
+        equity += pnl
+        entry_bars[n_trades] = entry_bar
+        exit_bars[n_trades] = exit_bar
+        sides[n_trades] = is_long
+        entries[n_trades] = fill
+        exits[n_trades] = exit_price
+        sizes[n_trades] = size
+        pnls[n_trades] = pnl
+        n_trades += 1
+        if equity <= 0:
+            break
+        # Entries resume on the bar the closing order fills
+        k = np.searchsorted(candidates, exit_bar)
+
+    return (n_trades, equity, entry_bars, exit_bars, sides, entries, exits,
+            sizes, pnls)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _exit_signal_bar(close, start, stop, target, is_long):
+        """First bar from start (before the last bar) whose close hits stop or target, or -1."""
+        for b in range(start, close.shape[0] - 1):
+            c = close[b]
+            if is_long:
+                if c <= stop or c >= target:
+                    return b
+            elif c >= stop or c <= target:
+                return b
+        return -1
+
+    _v11_walk = njit(cache=True)(_v11_walk)
+else:
+    def _exit_signal_bar(close, start, stop, target, is_long):
+        """First bar from start (before the last bar) whose close hits stop or target, or -1."""
+        return _first_cross(close, start, close.shape[0] - 1, stop, target, is_long)
+
+
+def simulate_v11(
+    bars,
+    trend_lookback=6,
+    min_trend_candles=4,
+    range_approach_pct=0.5,
+    range_min_range_pct=5.0,
+    range_buffer_pct=3.0,
+    range_rr_ratio=3.0,
+    range_cooldown_bars=96,
+    trend_approach_pct=0.3,
+    trend_min_range_pct=4.0,
+    trend_buffer_pct=3.0,
+    trend_rr_ratio=3.5,
+    trend_cooldown_bars=192,
+    risk_per_trade_pct=2.0,
+    max_position_pct=30.0,
+    cash=None,
+    commission=None,
+):
+    """
+    Simulate SolStrategyV11 (4H range/trend entries, single SL/TP exit).
+
+    Parameters mirror SolStrategyV11.params. Every entry rule is evaluated
+    for all 15m bars at once; only the cooldown and the open position are
+    walked trade by trade.
+
+    Args:
+        bars: Output of prepare_bars()
+        cash: Starting cash (defaults to BROKER.cash)
+        commission: Commission rate on notional (defaults to BROKER.commission)
+
+    Returns:
+        dict with final_value, total_return_pct, total_trades, win_rate_pct
+        and a structured trade log (TRADE_DTYPE)
+    """
+    cash = cash or BROKER.cash
+    commission = commission or BROKER.commission
+
+    open_ = bars['open']
+    close = bars['close']
+    h4_count = bars['h4_count']
+    n_bars = len(close)
+
+    # 4H index 0 = newest completed candle, -1 = the one before it
+    ready = (h4_count >= trend_lookback + 2) & (np.arange(n_bars) >= bars['first_bar'])
+    state = _v11_market_states(bars['h4_high'], bars['h4_low'],
+                               trend_lookback, min_trend_candles)[np.maximum(h4_count - 1, 0)]
+    prev_high = bars['h4_high'][np.maximum(h4_count - 2, 0)]
+    prev_low = bars['h4_low'][np.maximum(h4_count - 2, 0)]
+    candle_range = prev_high - prev_low
+
+    # Mode parameters per bar (same arithmetic as _check_entry/_enter_*)
+    ranging = state == RANGING
+    approach = np.where(ranging, range_approach_pct, trend_approach_pct) / 100
+    min_range = np.where(ranging, range_min_range_pct, trend_min_range_pct)
+    buffer = candle_range * (np.where(ranging, range_buffer_pct, trend_buffer_pct) / 100)
+    rr_ratio = np.where(ranging, range_rr_ratio, trend_rr_ratio)
+    cooldown = np.where(ranging, range_cooldown_bars, trend_cooldown_bars)
+
+    long_target = prev_high - buffer
+    short_target = prev_low + buffer
+    long_cond = close <= prev_low * (1 + approach)
+    short_cond = close >= prev_high * (1 - approach)
+    ok = ready & ~((candle_range / close) * 100 < min_range)
+    # Ranging tries long first; a trend only trades its own direction
+    long_sig = ok & (state != DOWNTREND) & long_cond & (long_target - close > 0)
+    short_sig = (ok & (state != UPTREND) & short_cond & ~(ranging & long_cond)
+                 & (close - short_target > 0))
+    candidates = np.flatnonzero((long_sig | short_sig)[:n_bars - 1])
+
+    n_trades, equity, *cols = _v11_walk(
+        open_, close, candidates, long_sig, long_target, short_target, rr_ratio,
+        cooldown, float(risk_per_trade_pct), float(max_position_pct),
+        float(cash), float(commission))
+
+    log = np.empty(n_trades, dtype=TRADE_DTYPE)
+    for name, col in zip(TRADE_DTYPE.names, cols):
+        log[name] = col[:n_trades]
+    wins = int(np.count_nonzero(log['pnl'] > 0))
+    equity = float(equity)
+    return {
+        'final_value': equity,
+        'total_return_pct': (equity - cash) / cash * 100,
+        'total_trades': n_trades,
+        'win_rate_pct': wins / n_trades * 100 if n_trades else None,
+        'trades': log,
+    }
+
+
+def _smooth_from(values, start, alpha, out):
+    """Continue out (seeded at out[start]) with prev * (1 - alpha) + value * alpha."""
+    alpha1 = 1.0 - alpha
+    prev = out[start]
+    for i in range(start + 1, values.shape[0]):
+        prev = prev * alpha1 + values[i] * alpha
+        out[i] = prev
+
+
+if HAS_NUMBA:
+    _smooth_from = njit(cache=True)(_smooth_from)
+
+
+def _smoothed(values, period, alpha):
+    """
+    Exponential smoothing seeded with the SMA of the first `period` values,
+    NaN before that: btind.EMA for alpha = 2 / (period + 1), Wilder's
+    smoothing (ATR) for alpha = 1 / period.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= period:
+        out[period - 1] = math.fsum(values[:period].tolist()) / period
+        _smooth_from(values, period - 1, alpha, out)
+    return out
+
+
+def _v14_trend(bars, ema_fast, ema_slow):
+    """
+    4H trend per 15m bar from the newest completed 4H bar: 1 when the fast
+    EMA is above the slow one, -1 below, 0 when level or before
+    SolStrategyV14.next() has ema_slow + 1 4H bars.
+    """
+    h4_close = bars['h4_close']
+    h4_count = bars['h4_count']
+    diff = (_smoothed(h4_close, ema_fast, 2.0 / (1.0 + ema_fast))
+            - _smoothed(h4_close, ema_slow, 2.0 / (1.0 + ema_slow)))
+    trend = np.sign(np.nan_to_num(diff)).astype(np.int8)[np.maximum(h4_count - 1, 0)]
+    trend[h4_count < ema_slow + 1] = 0
+    return trend
+
+
+def _v14_crossover(close, entry_ema_fast, entry_ema_slow):
+    """
+    15m EMA crossover per bar as btind.CrossOver reports it: 1 up, -1 down,
+    else 0. The current spread is compared with the last non-zero one, seeded
+    on the first bar both EMAs exist.
+    """
+    bar = np.arange(len(close))
+    fast = _smoothed(close, entry_ema_fast, 2.0 / (1.0 + entry_ema_fast))
+    slow = _smoothed(close, entry_ema_slow, 2.0 / (1.0 + entry_ema_slow))
+    diff = fast - slow
+    seed = max(entry_ema_fast, entry_ema_slow) - 1
+    last_nz = np.maximum.accumulate(np.where((bar >= seed) & ((diff != 0) | (bar == seed)), bar, -1))
+    nzd = np.where(last_nz >= 0, diff[np.maximum(last_nz, 0)], np.nan)
+    prev_nzd = np.concatenate(([np.nan], nzd[:-1]))
+    cross = np.zeros(len(close), dtype=np.int8)
+    cross[(prev_nzd < 0.0) & (fast > slow)] = 1
+    cross[(prev_nzd > 0.0) & (fast < slow)] = -1
+    return cross
+
+
+def _v14_atr(bars, atr_period):
+    """ATR per 15m bar: true high - true low against the prior close, Wilder-smoothed."""
+    high = bars['high']
+    low = bars['low']
+    close = bars['close']
+    atr = np.full(len(close), np.nan)
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr = np.maximum(high[1:], prev_close) - np.minimum(low[1:], prev_close)
+        atr[1:] = _smoothed(tr, atr_period, 1.0 / atr_period)
+    return atr
+
+
+def _v14_high_volume(volume, vol_sma_period, require_volume):
+    """Volume above its vol_sma_period SMA per 15m bar (all True when not required)."""
+    if not require_volume:
+        return np.ones(len(volume), dtype=bool)
+    vol_sma = np.full(len(volume), np.nan)
+    if len(volume) >= vol_sma_period:
+        vol_sma[vol_sma_period - 1:] = (
+            sliding_window_view(volume, vol_sma_period).sum(axis=1) / vol_sma_period)
+    return volume > vol_sma
+
+
+def _v14_walk(open_, close, candidates, long_sig, atr, stop_multiplier, tp_multiplier,
+              long_exit, short_exit, cooldown_bars, position_pct, cash, commission):
+    """
+    Walk simulate_v14's entry candidates trade by trade: cooldown, ATR stop and
+    target, equity-percent sizing, then hold until a close hits either level
+    or the bar is flagged in long_exit/short_exit (4H trend reversal), with
+    both fills at the next 15m open.
+
+    Returns:
+        (n_trades, final_equity, entry_bar, exit_bar, is_long, entry_price,
+        exit_price, size, pnl), the trade columns in TRADE_DTYPE order
+    """
+    n_cand = candidates.shape[0]
+    entry_bars = np.empty(n_cand, dtype=np.int64)
+    exit_bars = np.empty(n_cand, dtype=np.int64)
+    sides = np.empty(n_cand, dtype=np.bool_)
+    entries = np.empty(n_cand)
+    exits = np.empty(n_cand)
+    sizes = np.empty(n_cand)
+    pnls = np.empty(n_cand)
+
+    equity = cash
+    n_trades = 0
+    last_trade = -999
+    k = 0
+    while k < n_cand:
+        j = candidates[k]
+        if j - last_trade < cooldown_bars:
+            k += 1
+            continue
+
+        p = close[j]
+        is_long = long_sig[j]
+        if is_long:
+            stop = p - (atr[j] * stop_multiplier)
+            target = p + (atr[j] * tp_multiplier)
+        else:
+            stop = p + (atr[j] * stop_multiplier)
+            target = p - (atr[j] * tp_multiplier)
+
+        # _enter_long/_enter_short sizing; flat, so cash == equity
+        size = min((equity * position_pct / 100) / p, equity * 0.99 / p)
+        last_trade = j
+
+        entry_bar = j + 1
+        b = _v14_exit_bar(close, entry_bar, stop, target, is_long,
+                          long_exit if is_long else short_exit)
+        if b < 0:
+            break
+
+        fill = open_[entry_bar]
+        exit_bar = b + 1
+        exit_price = open_[exit_bar]
+        sign = 1.0 if is_long else -1.0
+        pnl = (sign * (exit_price - fill) * size
+               - commission * fill * size - commission * exit_price * size)
+
+        equity += pnl
+        entry_bars[n_trades] = entry_bar
+        exit_bars[n_trades] = exit_bar
+        sides[n_trades] = is_long
+        entries[n_trades] = fill
+        exits[n_trades] = exit_price
+        sizes[n_trades] = size
+        pnls[n_trades] = pnl
+        n_trades += 1
+        if equity <= 0:
+            break
+        # Entries resume on the bar the closing order fills
+        k = np.searchsorted(candidates, exit_bar)
+
+    return (n_trades, equity, entry_bars, exit_bars, sides, entries, exits,
+            sizes, pnls)
+
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _v14_exit_bar(close, start, stop, target, is_long, forced):
+        """First bar from start (before the last bar) that closes through stop/target or is forced, or -1."""
+        for b in range(start, close.shape[0] - 1):
+            if forced[b]:
+                return b
+            c = close[b]
+            if is_long:
+                if c <= stop or c >= target:
+                    return b
+            elif c >= stop or c <= target:
+                return b
+        return -1
+
+    _v14_walk = njit(cache=True)(_v14_walk)
+else:
+    def _v14_exit_bar(close, start, stop, target, is_long, forced):
+        """First bar from start (before the last bar) that closes through stop/target or is forced, or -1."""
+        return _first_cross(close, start, close.shape[0] - 1, stop, target, is_long,
+                            forced=forced)
+
+
+def simulate_v14(
+    bars,
+    ema_fast=9,
+    ema_slow=25,
+    entry_ema_fast=9,
+    entry_ema_slow=25,
+    vol_sma_period=20,
+    require_volume=True,
+    atr_period=14,
+    stop_multiplier=1.5,
+    tp_multiplier=3.0,
+    exit_on_trend_reversal=True,
+    position_pct=95.0,
+    cooldown_bars=4,
+    cash=None,
+    commission=None,
+):
+    """
+    Simulate SolStrategyV14 (4H EMA trend, 15m EMA crossover entries, ATR
+    SL/TP and trend-reversal exits).
+
+    Parameters mirror SolStrategyV14.params. Indicators and entry signals are
+    computed for all 15m bars at once; only the cooldown and the open
+    position are walked trade by trade.
+
+    Args:
+        bars: Output of prepare_bars()
+        cash: Starting cash (defaults to BROKER.cash)
+        commission: Commission rate on notional (defaults to BROKER.commission)
+
+    Returns:
+        dict with final_value, total_return_pct, total_trades, win_rate_pct
+        and a structured trade log (TRADE_DTYPE)
+    """
+    cash = cash or BROKER.cash
+    commission = commission or BROKER.commission
+
+    open_ = bars['open']
+    close = bars['close']
+    n_bars = len(close)
+
+    trend = _v14_trend(bars, ema_fast, ema_slow)
+    cross = _v14_crossover(close, entry_ema_fast, entry_ema_slow)
+    atr = _v14_atr(bars, atr_period)
+    high_volume = _v14_high_volume(bars['volume'], vol_sma_period, require_volume)
+
+    ready = np.arange(n_bars) >= max(entry_ema_slow, atr_period, vol_sma_period,
+                                     bars['first_bar'])
+    long_sig = ready & (cross == 1) & (trend == 1) & high_volume
+    short_sig = ready & (cross == -1) & (trend == -1) & high_volume
+    candidates = np.flatnonzero((long_sig | short_sig)[:n_bars - 1])
+
+    long_exit = np.zeros(n_bars, dtype=bool)
+    short_exit = np.zeros(n_bars, dtype=bool)
+    if exit_on_trend_reversal:
+        long_exit = trend != 1
+        short_exit = trend != -1
+
+    n_trades, equity, *cols = _v14_walk(
+        open_, close, candidates, long_sig, atr, float(stop_multiplier),
+        float(tp_multiplier), long_exit, short_exit, int(cooldown_bars),
+        float(position_pct), float(cash), float(commission))
+
+    log = np.empty(n_trades, dtype=TRADE_DTYPE)
+    for name, col in zip(TRADE_DTYPE.names, cols):
+        log[name] = col[:n_trades]
+    wins = int(np.count_nonzero(log['pnl'] > 0))
+    equity = float(equity)
+    return {
+        'final_value': equity,
+        'total_return_pct': (equity - cash) / cash * 100,
+        'total_trades': n_trades,
+        'win_rate_pct': wins / n_trades * 100 if n_trades else None,
+        'trades': log,
+    }
+
+
+def _v9_run(open_, close, hour_count, hour_close, day_count, day_high, day_low,
+            first_bar, trend_lookback, approach_pct, target_buffer_pct, rr_ratio,
+            min_range_pct, cooldown_bars, position_pct, cash, commission):
+    """
+    Scalar bar-by-bar version of simulate_v9 for one parameter set.
+
+    Returns:
+        (final_value, total_trades, winning_trades)
+    """
+    n_bars = close.shape[0]
+    approach = approach_pct / 100
+    equity = cash
+    n_trades = 0
+    wins = 0
+    last_hour = -1
+    last_trade_hour = -999
+    i = first_bar
+    while i < n_bars - 1:
+        hc = hour_count[i]
+        dc = day_count[i]
+        if hc == last_hour or hc == 0 or dc < trend_lookback + 2:
+            i += 1
+            continue
+        last_hour = hc
+        if hc - last_trade_hour < cooldown_bars:
+            i = np.searchsorted(hour_count, last_trade_hour + cooldown_bars)
+            continue
+
+        # Ranging: the newest trend_lookback daily steps are neither all HH/HL nor all LH/LL
+        d = dc - 1
+        uptrend = True
+        downtrend = True
+        for k in range(trend_lookback):
+            h, prev_h = day_high[d - k], day_high[d - k - 1]
+            l, prev_l = day_low[d - k], day_low[d - k - 1]
+            if h <= prev_h or l <= prev_l:
+                uptrend = False
+            if h >= prev_h or l >= prev_l:
+                downtrend = False
+        if uptrend or downtrend:
+            i += 1
+            continue
+
+        p = hour_close[hc - 1]
+        pdh = day_high[dc - 2]
+        pdl = day_low[dc - 2]
+        day_range = pdh - pdl
+        if day_range / p * 100 < min_range_pct:
+            i += 1
+            continue
+        buffer = day_range * (target_buffer_pct / 100)
+        if p <= pdl * (1 + approach):
+            is_long = True
+            sign = 1.0
+            target = pdh - buffer
+            eff = target - p
+        elif p >= pdh * (1 - approach):
+            is_long = False
+            sign = -1.0
+            target = pdl + buffer
+            eff = p - target
+        else:
+            i += 1
+            continue
+        if eff <= 0:
+            i += 1
+            continue
+
+        size = (equity * position_pct) / p
+        last_trade_hour = hc
+        exit_bar, pnl, _ = _v9_exits(
+            open_, close, i + 1, is_long, p, p - sign * eff / rr_ratio,
+            p + sign * eff / 3, p + sign * eff * 2 / 3, target,
+            open_[i + 1], size, commission)
+        if exit_bar < 0:
+            break
+        equity += pnl
+        n_trades += 1
+        if pnl > 0:
+            wins += 1
+        if equity <= 0:
+            break
+        i = exit_bar
+    return equity, n_trades, wins
+
+
+if HAS_NUMBA:
+    _v9_run = njit(cache=True)(_v9_run)
+
+    @njit(parallel=True, cache=True)
+    def _v9_sweep(open_, close, hour_count, hour_close, day_count, day_high, day_low,
+                  first_bar, grid, cash, commission):
+        """Run _v9_run for every row of the parameter grid across all cores."""
+        n_sets = grid.shape[0]
+        final = np.empty(n_sets)
+        trades = np.zeros(n_sets, dtype=np.int64)
+        wins = np.zeros(n_sets, dtype=np.int64)
+        for k in prange(n_sets):
+            row = grid[k]
+            final[k], trades[k], wins[k] = _v9_run(
+                open_, close, hour_count, hour_close, day_count, day_high, day_low,
+                first_bar, int(row[0]), row[1], row[2], row[3], row[4], int(row[5]), row[6],
+                cash, commission)
+        return final, trades, wins
+
+
+def sweep_v9(bars, param_sets, cash=None, commission=None):
+    """
+    Simulate SolStrategyV9 for many parameter sets.
+
+    With numba the whole state machine runs in one parallel kernel (one
+    parameter set per core at a time); without it each set goes through
+    simulate_v9.
+
+    Args:
+        bars: Output of prepare_bars()
+        param_sets: Iterable of param dicts; missing keys use V9_PARAMS
+        cash: Starting cash (defaults to BROKER.cash)
+        commission: Commission rate on notional (defaults to BROKER.commission)
+
+    Returns:
+        List of dicts (the full parameter set plus final_value,
+        total_return_pct, total_trades, win_rate_pct), in input order
+    """
+    cash = cash or BROKER.cash
+    commission = commission or BROKER.commission
+    params = [{**V9_PARAMS, **ps} for ps in param_sets]
+
+    if HAS_NUMBA:
+        grid = np.array([[p[k] for k in V9_SWEEP_PARAMS] for p in params],
+                        dtype=np.float64).reshape(len(params), len(V9_SWEEP_PARAMS))
+        final, trades, wins = _v9_sweep(
+            bars['open'], bars['close'], bars['hour_count'], bars['hour_close'],
+            bars['day_count'], bars['day_high'], bars['day_low'], bars['first_bar'],
+            grid, float(cash), float(commission))
+    else:
+        runs = [simulate_v9(bars, cash=cash, commission=commission, **p) for p in params]
+        final = [r['final_value'] for r in runs]
+        trades = [r['total_trades'] for r in runs]
+        wins = [np.count_nonzero(r['trades']['pnl'] > 0) for r in runs]
+
+    rows = []
+    for p, value, n, w in zip(params, final, trades, wins):
+        value = float(value)
+        n = int(n)
+        rows.append({
+            **p,
+            'final_value': value,
+            'total_return_pct': (value - cash) / cash * 100,
+            'total_trades': n,
+            'win_rate_pct': int(w) / n * 100 if n else None,
+        })
+    return rows
+
+
+def _v14_run(open_, close, cross, trend, high_volume, atr, first_bar, stop_multiplier,
+             tp_multiplier, exit_on_trend_reversal, position_pct, cooldown_bars, cash,
+             commission):
+    """
+    Scalar bar-by-bar version of simulate_v14 for one parameter set, on the
+    indicator rows that set selects.
+
+    Returns:
+        (final_value, total_trades, winning_trades)
+    """
+    n_bars = close.shape[0]
+    equity = cash
+    n_trades = 0
+    wins = 0
+    last_trade = -999
+    i = first_bar
+    while i < n_bars - 1:
+        side = cross[i]
+        if side == 0 or trend[i] != side or not high_volume[i] or i - last_trade < cooldown_bars:
+            i += 1
+            continue
+
+        p = close[i]
+        is_long = side == 1
+        if is_long:
+            stop = p - (atr[i] * stop_multiplier)
+            target = p + (atr[i] * tp_multiplier)
+        else:
+            stop = p + (atr[i] * stop_multiplier)
+            target = p - (atr[i] * tp_multiplier)
+        size = min((equity * position_pct / 100) / p, equity * 0.99 / p)
+        last_trade = i
+
+        exit_bar = -1
+        for b in range(i + 1, n_bars - 1):
+            c = close[b]
+            if exit_on_trend_reversal and trend[b] != side:
+                exit_bar = b + 1
+            elif is_long:
+                if c <= stop or c >= target:
+                    exit_bar = b + 1
+            elif c >= stop or c <= target:
+                exit_bar = b + 1
+            if exit_bar >= 0:
+                break
+        if exit_bar < 0:
+            break
+
+        fill = open_[i + 1]
+        exit_price = open_[exit_bar]
+        sign = 1.0 if is_long else -1.0
+        pnl = (sign * (exit_price - fill) * size
+               - commission * fill * size - commission * exit_price * size)
+        equity += pnl
+        n_trades += 1
+        if pnl > 0:
+            wins += 1
+        if equity <= 0:
+            break
+        # Entries resume on the bar the closing order fills
+        i = exit_bar
+    return equity, n_trades, wins
+
+
+if HAS_NUMBA:
+    _v14_run = njit(cache=True)(_v14_run)
+
+    @njit(parallel=True, cache=True)
+    def _v14_sweep(open_, close, cross, trend, high_volume, atr, refs, grid, cash, commission):
+        """Run _v14_run for every parameter set across all cores."""
+        n_sets = grid.shape[0]
+        final = np.empty(n_sets)
+        trades = np.zeros(n_sets, dtype=np.int64)
+        wins = np.zeros(n_sets, dtype=np.int64)
+        for k in prange(n_sets):
+            r = refs[k]
+            g = grid[k]
+            final[k], trades[k], wins[k] = _v14_run(
+                open_, close, cross[r[0]], trend[r[1]], high_volume[r[2]], atr[r[3]],
+                r[4], g[0], g[1], g[2] != 0.0, g[3], int(g[4]), cash, commission)
+        return final, trades, wins
+
+
+def sweep_v14(bars, param_sets, cash=None, commission=None):
+    """
+    Simulate SolStrategyV14 for many parameter sets.
+
+    Each distinct indicator setting (entry EMA pair, 4H EMA pair, volume SMA,
+    ATR period) is computed once and shared. With numba the parameter sets
+    then run in one parallel kernel; without it each set goes through
+    simulate_v14.
+
+    Args:
+        bars: Output of prepare_bars()
+        param_sets: Iterable of param dicts; missing keys use V14_PARAMS
+        cash: Starting cash (defaults to BROKER.cash)
+        commission: Commission rate on notional (defaults to BROKER.commission)
+
+    Returns:
+        List of dicts (the full parameter set plus final_value,
+        total_return_pct, total_trades, win_rate_pct), in input order
+    """
+    cash = cash or BROKER.cash
+    commission = commission or BROKER.commission
+    params = [{**V14_PARAMS, **ps} for ps in param_sets]
+
+    if HAS_NUMBA:
+        # One row per distinct indicator setting, referenced by index from each set
+        tables = ({}, {}, {}, {})
+        builders = (
+            lambda key: _v14_crossover(bars['close'], *key),
+            lambda key: _v14_trend(bars, *key),
+            lambda key: _v14_high_volume(bars['volume'], *key),
+            lambda key: _v14_atr(bars, *key),
+        )
+        refs = np.empty((len(params), 5), dtype=np.int64)
+        for k, p in enumerate(params):
+            keys = (
+                (p['entry_ema_fast'], p['entry_ema_slow']),
+                (p['ema_fast'], p['ema_slow']),
+                (p['vol_sma_period'], bool(p['require_volume'])),
+                (p['atr_period'],),
+            )
+            for t, key in enumerate(keys):
+                refs[k, t] = tables[t].setdefault(key, len(tables[t]))
+            refs[k, 4] = max(p['entry_ema_slow'], p['atr_period'], p['vol_sma_period'],
+                             bars['first_bar'])
+        cross, trend, high_volume, atr = (
+            np.stack([build(key) for key in table]) for build, table in zip(builders, tables))
+        grid = np.array([[p[k] for k in V14_SWEEP_SCALARS] for p in params],
+                        dtype=np.float64).reshape(len(params), len(V14_SWEEP_SCALARS))
+        final, trades, wins = _v14_sweep(
+            bars['open'], bars['close'], cross, trend, high_volume, atr, refs, grid,
+            float(cash), float(commission))
+    else:
+        runs = [simulate_v14(bars, cash=cash, commission=commission, **p) for p in params]
+        final = [r['final_value'] for r in runs]
+        trades = [r['total_trades'] for r in runs]
+        wins = [np.count_nonzero(r['trades']['pnl'] > 0) for r in runs]
+
+    rows = []
+    for p, value, n, w in zip(params, final, trades, wins):
+        value = float(value)
+        n = int(n)
+        rows.append({
+            **p,
+            'final_value': value,
+            'total_return_pct': (value - cash) / cash * 100,
+            'total_trades': n,
+            'win_rate_pct': int(w) / n * 100 if n else None,
+        })
+    return rows
+
+
+def warm_up():
+    """
+    Compile the numba kernels on a few days of synthetic bars.
+
+    The kernels use cache=True, so this writes their machine code to
+    __pycache__ and later processes (optimizer workers, fresh sweeps) load it
+    instead of paying the JIT compile on their first call. Run
+    `python vector_sim.py` once after installing or changing this module.
+
+    Returns:
+        True if the kernels were compiled, False when numba isn't installed
+    """
+    if not HAS_NUMBA:
+        return False
+
+    import pandas as pd
+
+    n = 4 * 24 * 10
+    price = 100 + 5 * np.sin(np.arange(n) * (2 * np.pi / 96))
+    df = pd.DataFrame(
+        {'open': price, 'high': price + 1, 'low': price - 1, 'close': price,
+         'volume': 1 + (np.arange(n) % 7)},
+        index=pd.date_range('2025-01-01', periods=n, freq='15min'),
+    )
+    bars = prepare_bars(df)
+
+    _v9_exits(bars['open'], bars['close'], 1, True, price[0], price[0] - 2,
+              price[0] + 1, price[0] + 2, price[0] + 3, bars['open'][1], 1.0, 0.001)
+    _run_lengths(np.zeros(2, dtype=np.bool_))
+    sweep_v9(bars, [{}])
+    simulate_v11(bars)
+    simulate_v14(bars)
+    sweep_v14(bars, [{}])
+    return True
+
+
+if __name__ == '__main__':
+    if warm_up():
+        print("numba kernels compiled and cached")
+    else:
+        print("numba not installed; nothing to compile")